@@ -0,0 +1,82 @@
+"""Benchmark: adjust() in a loop vs adjust_many() over a month of 1-minute samples.
+
+Run from the repository root: python -m benchmarks.bench_adjust_many
+"""
+
+from __future__ import annotations
+
+import math
+import random
+import time
+
+import numpy as np
+
+from custom_components.home_rules.rules import (
+    AirconMode,
+    CachedState,
+    HomeColumns,
+    HomeInput,
+    RuleParameters,
+    adjust,
+    adjust_many,
+)
+
+PARAMS = RuleParameters(5500.0, 3500.0, 500.0, 24.0, 65.0, True, 2, 2, 22.0)
+SAMPLES = 31 * 24 * 60
+
+
+def synthetic_month(seed: int = 1) -> list[HomeInput]:
+    """Daily solar curve with cloud dips; the aircon follows solar and draws grid under clouds."""
+    rng = random.Random(seed)  # noqa: S311
+    homes: list[HomeInput] = []
+    for minute in range(SAMPLES):
+        sun = max(0.0, math.sin(((minute % 1440) / 1440 - 0.25) * 2 * math.pi))
+        cloud = 0.3 if rng.random() < 0.05 else 1.0
+        generation = max(0.0, 7000 * sun * cloud + rng.gauss(0, 300))
+        mode = AirconMode.COOL if sun > 0.6 else AirconMode.DRY if sun > 0.45 else AirconMode.OFF
+        load = {AirconMode.COOL: 2500.0, AirconMode.DRY: 1500.0}.get(mode, 0.0) + 400
+        homes.append(
+            HomeInput(
+                aircon_mode=mode,
+                have_solar=sun > 0,
+                generation=generation,
+                grid_usage=max(0.0, load - generation),
+                timer=False,
+                temperature=20 + 10 * sun,
+                humidity=55 + rng.uniform(-15, 15),
+                auto=mode is not AirconMode.OFF,
+                aggressive_cooling=False,
+                enabled=True,
+                cooling_enabled=True,
+            )
+        )
+    return homes
+
+
+def best_of(fn, repeat: int = 5) -> float:
+    best = math.inf
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main() -> None:
+    homes = synthetic_month()
+    columns = HomeColumns(*(np.asarray(col) for col in HomeColumns.from_inputs(homes)))
+
+    def scalar() -> None:
+        state = CachedState()
+        for h in homes:
+            adjust(PARAMS, h, state)
+
+    scalar_s = best_of(scalar)
+    batch_s = best_of(lambda: adjust_many(PARAMS, columns, CachedState()))
+    print(f"samples:        {len(homes)}")
+    print(f"adjust loop:    {scalar_s * 1000:8.1f} ms")
+    print(f"adjust_many:    {batch_s * 1000:8.1f} ms  ({scalar_s / batch_s:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
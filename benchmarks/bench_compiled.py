@@ -0,0 +1,41 @@
+"""Benchmark: branchy adjust() vs a CompiledRules table over a month of 1-minute samples.
+
+Run from the repository root: python -m benchmarks.bench_compiled
+"""
+
+from __future__ import annotations
+
+import time
+
+from benchmarks.bench_adjust_many import PARAMS, best_of, synthetic_month
+from custom_components.home_rules.compiled import compile_rules
+from custom_components.home_rules.rules import CachedState, adjust
+
+
+def main() -> None:
+    homes = synthetic_month()
+
+    def branchy() -> None:
+        state = CachedState()
+        for h in homes:
+            adjust(PARAMS, h, state)
+
+    compiled = compile_rules(PARAMS)
+
+    def table() -> None:
+        state = CachedState()
+        for h in homes:
+            compiled.adjust(h, state)
+
+    start = time.perf_counter()
+    compile_rules(PARAMS).adjust(homes[0], CachedState())
+    compile_s = time.perf_counter() - start
+    branchy_s, table_s = best_of(branchy), best_of(table)
+    print(f"samples:          {len(homes)}  (table cells used: {len(compiled)})")
+    print(f"compile + 1 fill: {compile_s * 1e6:8.1f} us")
+    print(f"adjust:           {branchy_s * 1000:8.1f} ms  ({branchy_s / len(homes) * 1e9:.0f} ns/sample)")
+    print(f"CompiledRules:    {table_s * 1000:8.1f} ms  ({table_s / len(homes) * 1e9:.0f} ns/sample)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,42 @@
+"""Benchmark: OscillationDetector.observe() over synthetic decision streams.
+
+Run from the repository root: python -m benchmarks.bench_oscillation
+"""
+
+from __future__ import annotations
+
+import random
+
+from benchmarks.bench_adjust_many import best_of
+from custom_components.home_rules.oscillation import OscillationDetector
+from custom_components.home_rules.rules import HomeOutput
+
+SAMPLES = 1_000_000
+COOL, DRY, OFF = HomeOutput.COOL.code, HomeOutput.DRY.code, HomeOutput.OFF.code
+
+
+def streams() -> dict[str, list[int]]:
+    rng = random.Random(1)  # noqa: S311
+    return {
+        "steady": [COOL] * SAMPLES,
+        "flapping (every sample)": [COOL if i % 2 else OFF for i in range(SAMPLES)],
+        "cool/dry/off cycle": [(COOL, DRY, OFF)[(i // 3) % 3] for i in range(SAMPLES)],
+        "random (10% changes)": [rng.choice((COOL, DRY, OFF)) if rng.random() < 0.1 else COOL for _ in range(SAMPLES)],
+    }
+
+
+def main() -> None:
+    for name, modes in streams().items():
+        detector = OscillationDetector(window=1800)
+
+        def run(detector: OscillationDetector = detector, modes: list[int] = modes) -> None:
+            observe = detector.observe
+            for i, mode in enumerate(modes):
+                observe(i * 60.0, mode)
+
+        elapsed = best_of(run, repeat=3)
+        print(f"{name:26s} {elapsed / SAMPLES * 1e9:6.0f} ns/observation  (episodes: {detector.episodes})")
+
+
+if __name__ == "__main__":
+    main()
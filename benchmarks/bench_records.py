@@ -0,0 +1,78 @@
+"""Benchmark: memory per retained evaluation, dict records vs EvaluationRecord.
+
+Run from the repository root: python -m benchmarks.bench_records
+"""
+
+from __future__ import annotations
+
+import random
+import tracemalloc
+from collections import deque
+from collections.abc import Callable
+from typing import Any
+
+from custom_components.home_rules.records import EvaluationRecord
+
+RETENTIONS = (50, 10_000)
+
+
+def synthetic_fields(rng: random.Random, i: int) -> dict[str, Any]:
+    """One evaluation as _evaluate builds it, with readings that vary and controls that rarely do."""
+    generation, grid = rng.uniform(0, 8000), rng.choice((0.0, rng.uniform(0, 2000)))
+    return {
+        "time": f"2026-01-01T{i // 3600 % 24:02d}:{i // 60 % 60:02d}:{i % 60:02d}+00:00",
+        "trigger": "poll",
+        "current": 3,
+        "adjustment": 0,
+        "mode": 3,
+        "reason": 12,
+        "dry_run": True,
+        "control_mode": "monitor",
+        "target_adjustment": None,
+        "target_reason": 4,
+        "target_actionable": False,
+        "blocked_reasons": [],
+        "fallback_inputs": {},
+        "controls_snapshot": {"control_mode": "monitor", "cooling_enabled": True, "dry_mode_enabled": i % 500 != 0},
+        "policy_snapshot": {"dry_mode_humidity_cutoff": 65.0},
+        "generation": generation,
+        "grid_usage": grid,
+        "temperature": rng.uniform(20, 30),
+        "humidity": rng.uniform(30, 80),
+        "have_solar": True,
+        "auto": False,
+        "tolerated": 0,
+        "reactivate_delay": 0,
+        "raw_generation": generation,
+        "raw_grid_usage": grid,
+        "smoothed_generation": round(generation, 1),
+        "smoothed_grid_usage": round(grid, 1),
+        "smoothed_adjustment": 0,
+        "smoothed_reason": 12,
+        "decision_differs": False,
+    }
+
+
+def retained_bytes(make: Callable[[dict[str, Any]], object], count: int) -> int:
+    """Bytes still allocated once `count` records built by `make` sit in the history deque."""
+    rng = random.Random(1)  # noqa: S311
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    recent: deque[object] = deque(maxlen=count)
+    for i in range(count):
+        recent.appendleft(make(synthetic_fields(rng, i)))
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    return sum(stat.size_diff for stat in after.compare_to(before, "filename"))
+
+
+def main() -> None:
+    print(f"{'records':>8s} {'dict B/record':>14s} {'slotted B/record':>17s} {'saved':>6s}")
+    for count in RETENTIONS:
+        as_dict = retained_bytes(dict, count) / count
+        slotted = retained_bytes(EvaluationRecord, count) / count
+        print(f"{count:8d} {as_dict:14.0f} {slotted:17.0f} {1 - slotted / as_dict:6.0%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,42 @@
+"""Benchmark: parameter sweep throughput over 90 days of 1-minute samples.
+
+Run from the repository root: python -m benchmarks.bench_sweep [combinations]
+"""
+
+from __future__ import annotations
+
+import os
+import sys
+import time
+from dataclasses import asdict
+
+from benchmarks.bench_adjust_many import synthetic_month
+from custom_components.home_rules.sweep import parameter_grid, sweep
+
+
+def main() -> None:
+    month = [asdict(h) | {"time": i * 60} for i, h in enumerate(synthetic_month())]
+    rows = [row | {"time": row["time"] + 31 * 1440 * 60 * k} for k in range(3) for row in month][: 90 * 1440]
+    for row in rows:
+        row["aircon_mode"] = row["aircon_mode"].value
+        del row["auto"]
+    combos = int(sys.argv[1]) if len(sys.argv) > 1 else 64
+    grid = parameter_grid(
+        {
+            "generation_cool_threshold": [4500.0 + 250 * i for i in range(max(1, combos // 16))],
+            "generation_dry_threshold": [3000.0, 3500.0],
+            "grid_usage_delay": [1, 2],
+            "reactivate_delay": [1, 2, 3, 4],
+        }
+    )
+    workers = os.cpu_count() or 1
+    start = time.perf_counter()
+    results = list(sweep(rows, grid, workers=workers))
+    elapsed = time.perf_counter() - start
+    print(f"samples:      {len(rows)}  combinations: {len(results)}  workers: {workers}")
+    print(f"sweep:        {elapsed:8.1f} s  ({elapsed / len(results) * 1000:.0f} ms/combination wall)")
+    print(f"1000 combos:  {elapsed / len(results) * 1000 / 60:8.1f} min (extrapolated)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,48 @@
+"""Benchmark: _evaluate_target_mode per point vs evaluate_target_many over a 1000x1000 grid.
+
+Run from the repository root: python -m benchmarks.bench_target_grid
+"""
+
+from __future__ import annotations
+
+import time
+
+import numpy as np
+
+from custom_components.home_rules.rules import (
+    AIRCON_MODE_CODES,
+    AirconMode,
+    HomeInput,
+    RuleParameters,
+    _evaluate_target_mode,
+    evaluate_target_many,
+)
+
+PARAMS = RuleParameters(5500.0, 3500.0, 500.0, 24.0, 65.0, True, 2, 2, 22.0)
+SIDE = 1000
+
+
+def main() -> None:
+    gens = np.linspace(0.0, 10000.0, SIDE)
+    hums = np.linspace(0.0, 100.0, SIDE)
+    off = AIRCON_MODE_CODES.index(AirconMode.OFF)
+
+    start = time.perf_counter()
+    for g in gens.tolist():
+        for h in hums.tolist():
+            _evaluate_target_mode(
+                PARAMS, HomeInput(AirconMode.OFF, True, g, 0.0, False, 24.0, h, True, False, True, True)
+            )
+    scalar_s = time.perf_counter() - start
+
+    start = time.perf_counter()
+    result = evaluate_target_many(PARAMS, gens[:, None], hums[None, :], off)
+    batch_s = time.perf_counter() - start
+
+    print(f"points:                {result.outputs.size}")
+    print(f"_evaluate_target_mode: {scalar_s * 1000:8.1f} ms")
+    print(f"evaluate_target_many:  {batch_s * 1000:8.1f} ms  ({scalar_s / batch_s:.0f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,15 +1,48 @@
+import voluptuous as vol
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, ServiceCall, ServiceResponse, SupportsResponse
+from homeassistant.exceptions import ServiceValidationError
+from homeassistant.helpers import config_validation as cv
 from homeassistant.helpers import entity_registry as er
+from homeassistant.helpers.typing import ConfigType
 
 from . import const as c
-from .coordinator import HomeRulesCoordinator
+from .coordinator import HomeRulesCoordinator, journal_directory
+from .journal import Journal
 
 _LEGACY_SUFFIXES = (
     "enabled aggressive_cooling dry_run notifications_enabled "
     "generation_cool_threshold generation_dry_threshold timer_countdown current humidity_threshold"
 ).split()
-_TARGET_MINOR_VERSION = 2
+_TARGET_MINOR_VERSION = 3
+_DELAY_MINUTES_MINOR_VERSION = 3
+_MAX_DELAY_MINUTES = 60
+
+CONFIG_SCHEMA = cv.config_entry_only_config_schema(c.DOMAIN)
+ATTR_CONFIG_ENTRY_ID = "config_entry_id"
+_ENGINE_STATS_SCHEMA = vol.Schema({vol.Optional(ATTR_CONFIG_ENTRY_ID): cv.string})
+
+
+async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
+    async def _get_engine_stats(call: ServiceCall) -> ServiceResponse:
+        entries = hass.config_entries.async_loaded_entries(c.DOMAIN)
+        if (entry_id := call.data.get(ATTR_CONFIG_ENTRY_ID)) is not None:
+            entries = [e for e in entries if e.entry_id == entry_id]
+        if not entries:
+            raise ServiceValidationError(translation_domain=c.DOMAIN, translation_key="not_loaded")
+        if len(entries) > 1:
+            raise ServiceValidationError(translation_domain=c.DOMAIN, translation_key="config_entry_required")
+        stats = entries[0].runtime_data.engine_stats
+        return {"enabled": stats is not None, **(stats or {})}
+
+    hass.services.async_register(
+        c.DOMAIN,
+        c.SERVICE_GET_ENGINE_STATS,
+        _get_engine_stats,
+        schema=_ENGINE_STATS_SCHEMA,
+        supports_response=SupportsResponse.ONLY,
+    )
+    return True
 
 
 async def async_migrate_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
@@ -20,6 +53,14 @@ async def async_migrate_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
         changed = True
     if options.pop(c.LEGACY_CONF_TIMER_ENTITY_ID, None) is not None:
         changed = True
+    if entry.minor_version < _DELAY_MINUTES_MINOR_VERSION:
+        # Delays were counted in evaluations: N tolerated grid readings shut the aircon off N - 1 intervals
+        # after the first, and N reactivation ticks allowed a restart N + 1 intervals after shutting off.
+        # Keep those durations at the configured interval, within the options form's range; 0 stays off.
+        interval = float(options.get(c.CONF_EVAL_INTERVAL, c.DEFAULT_EVAL_INTERVAL))
+        for key, shift in ((c.CONF_GRID_USAGE_DELAY, -1), (c.CONF_REACTIVATE_DELAY, 1)):
+            if (count := int(options.get(key, 0))) > 0:
+                options[key] = min(_MAX_DELAY_MINUTES, max(0, round((count + shift) * interval / 60)))
     if entry.minor_version < _TARGET_MINOR_VERSION or changed:
         hass.config_entries.async_update_entry(
             entry,
@@ -44,6 +85,7 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
 
     await hass.config_entries.async_forward_entry_setups(entry, c.PLATFORMS)
     entry.async_on_unload(entry.add_update_listener(_async_update_listener))
+    entry.async_on_unload(coordinator.async_track_inputs())
     return True
 
 
@@ -53,5 +95,9 @@ async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     return await hass.config_entries.async_unload_platforms(entry, c.PLATFORMS)
 
 
+async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    await hass.async_add_executor_job(Journal(journal_directory(hass, entry.entry_id), c.MAX_RECENT_EVALUATIONS).remove)
+
+
 async def _async_update_listener(hass: HomeAssistant, entry: ConfigEntry) -> None:
     await hass.config_entries.async_reload(entry.entry_id)
@@ -0,0 +1,263 @@
+"""Actuation queue for climate commands.
+
+No Home Assistant dependencies. The coordinator decides under its lock and
+hands the commands for a decision to ActuationQueue.submit(), which returns
+at once; the commands run in a task of their own. A plan is a sequence of
+stages: stages run in order and the calls of one stage run concurrently.
+Every call gets a timeout and is retried with exponential backoff, except
+for errors listed as `permanent` (a missing service, invalid data), which
+no retry can fix. A plan can also be given as a function that builds it
+when it starts. plan_climate() uses this to diff the desired state against
+what the device reports at that moment, after any earlier plan has
+finished, and to skip the calls that would change nothing.
+
+Only one plan runs at a time, so a later decision never overtakes an
+earlier one. A plan submitted while another runs waits for it. A newer plan
+replaces one that is still waiting, because only the newest decision
+matters. The queue reports every plan, including replaced ones, to
+`on_done` as an Outcome carrying the number submit() returned for it.
+
+A call that returns is not proof that the device changed. LatencyHistogram
+counts how long commands took to show up in the device's reported state,
+for the confirmations the coordinator tracks.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from bisect import bisect_left
+from collections.abc import Awaitable, Callable, Coroutine, Mapping, Sequence
+from dataclasses import dataclass
+from time import monotonic
+from typing import Any
+
+DEFAULT_TIMEOUT, DEFAULT_RETRIES, DEFAULT_BACKOFF = 10.0, 2, 2.0
+LATENCY_BUCKETS = (1.0, 2.0, 5.0, 10.0, 30.0, 60.0)  # upper bounds (s); slower ones go in a last, open bucket
+
+
+@dataclass(frozen=True, slots=True)
+class Call:
+    domain: str
+    service: str
+    data: Mapping[str, Any]
+
+
+type Plan = Sequence[Sequence[Call]]
+DEFAULT_SETPOINT_STEP = 0.5
+
+
+def setpoint_step(attributes: Mapping[str, Any]) -> float:
+    """The climate entity's ``target_temp_step``, or DEFAULT_SETPOINT_STEP if it reports none."""
+    step = attributes.get("target_temp_step")
+    return float(step) if isinstance(step, int | float) and step > 0 else DEFAULT_SETPOINT_STEP
+
+
+def setpoint_matches(current: object, setpoint: float, step: float = DEFAULT_SETPOINT_STEP) -> bool:
+    """Whether a reported `current` setpoint is `setpoint` to within one `step`, as devices round to their own."""
+    return isinstance(current, int | float) and abs(current - setpoint) <= step
+
+
+def plan_climate(
+    entity_id: str,
+    hvac_mode: str,
+    setpoint: float | None,
+    state: str | None,
+    attributes: Mapping[str, Any],
+    modes: frozenset[str] | None = None,
+) -> tuple[list[list[Call]], int]:
+    """(plan, calls skipped) taking `entity_id` from its reported `state` and `attributes` to `hvac_mode`/`setpoint`.
+
+    The setpoint is sent after the mode. Raises ValueError for a mode other
+    than off that the entity does not advertise in `modes`; turning off is
+    always attempted.
+    """
+    if hvac_mode == "off":
+        return ([], 1) if state == "off" else ([[Call("climate", "turn_off", {"entity_id": entity_id})]], 0)
+    if modes is not None and hvac_mode not in modes:
+        raise ValueError(f"{entity_id} does not support hvac_mode {hvac_mode} (supports {', '.join(sorted(modes))})")
+    plan, skipped = [], 0
+    if state != hvac_mode:
+        plan.append([Call("climate", "set_hvac_mode", {"entity_id": entity_id, "hvac_mode": hvac_mode})])
+    else:
+        skipped += 1
+    if setpoint is not None:
+        if setpoint_matches(attributes.get("temperature"), setpoint, setpoint_step(attributes)):
+            skipped += 1
+        else:
+            plan.append([Call("climate", "set_temperature", {"entity_id": entity_id, "temperature": setpoint})])
+    return plan, skipped
+
+
+@dataclass(frozen=True, slots=True)
+class Outcome:
+    """How plan number `plan` ended; `attempts` counts service calls, retries included."""
+
+    label: str
+    ok: bool
+    attempts: int = 0
+    seconds: float = 0.0
+    error: str | None = None
+    superseded: bool = False
+    plan: int = 0
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "plan": self.plan,
+            "label": self.label,
+            "ok": self.ok,
+            "attempts": self.attempts,
+            "seconds": round(self.seconds, 3),
+            "error": self.error,
+            "superseded": self.superseded,
+        }
+
+
+class ActuationQueue:
+    """Runs one plan at a time off the caller's path, with per-call timeouts and retries.
+
+    Counters: `calls` (attempts made, retries included), `timeouts`, `failed`
+    (plans that gave up) and `superseded` (plans replaced before they started).
+    """
+
+    __slots__ = (
+        "backoff",
+        "calls",
+        "failed",
+        "permanent",
+        "retries",
+        "submitted",
+        "superseded",
+        "timeout",
+        "timeouts",
+        "_active",
+        "_call",
+        "_on_done",
+        "_pending",
+        "_runner",
+        "_spawn",
+    )
+
+    def __init__(
+        self,
+        call: Callable[[Call], Awaitable[None]],
+        on_done: Callable[[Outcome], None],
+        spawn: Callable[[Coroutine[Any, Any, None]], asyncio.Future[None]],
+        *,
+        timeout: float = DEFAULT_TIMEOUT,
+        retries: int = DEFAULT_RETRIES,
+        backoff: float = DEFAULT_BACKOFF,
+        permanent: tuple[type[BaseException], ...] = (),
+    ) -> None:
+        self._call, self._on_done, self._spawn = call, on_done, spawn
+        self.timeout, self.retries, self.backoff, self.permanent = timeout, max(0, retries), backoff, permanent
+        self.calls = self.timeouts = self.failed = self.superseded = self.submitted = 0
+        self._pending: tuple[int, str, Plan | Callable[[], Plan]] | None = None
+        self._active: str | None = None
+        self._runner: asyncio.Future[None] | None = None
+
+    @property
+    def busy(self) -> bool:
+        return self._runner is not None and not self._runner.done()
+
+    def submit(self, label: str, plan: Plan | Callable[[], Plan]) -> int:
+        """Queue `plan` (or a function building it as it starts) behind the running one, replacing any waiting plan.
+
+        Returns the plan's number, which its Outcome carries.
+        """
+        if (pending := self._pending) is not None:
+            self.superseded += 1
+            self._on_done(Outcome(pending[1], False, superseded=True, plan=pending[0]))
+        self.submitted += 1
+        self._pending = (self.submitted, label, plan)
+        if not self.busy:
+            self._runner = self._spawn(self._run())
+        return self.submitted
+
+    async def wait(self) -> None:
+        """Until every submitted plan has finished."""
+        while (runner := self._runner) is not None and not runner.done():
+            await asyncio.shield(runner)
+
+    def cancel(self) -> None:
+        """Drop the waiting plan and cancel the running one."""
+        self._pending = None
+        if self._runner is not None:
+            self._runner.cancel()
+
+    async def _run(self) -> None:
+        while (pending := self._pending) is not None:
+            self._pending, (number, label, planned) = None, pending
+            self._active, started, attempts, error = label, monotonic(), [0], None
+            try:
+                for stage in planned() if callable(planned) else planned:
+                    results = await asyncio.gather(
+                        *(self._attempt(call, attempts) for call in stage), return_exceptions=True
+                    )
+                    if failures := [r for r in results if isinstance(r, BaseException)]:
+                        raise failures[0]
+            except Exception as err:  # noqa: BLE001
+                error, self.failed = str(err) or type(err).__name__, self.failed + 1
+            finally:
+                self._active = None
+            self._on_done(Outcome(label, error is None, attempts[0], monotonic() - started, error, plan=number))
+
+    async def _attempt(self, call: Call, attempts: list[int]) -> None:
+        for attempt in range(self.retries + 1):
+            attempts[0] += 1
+            self.calls += 1
+            try:
+                async with asyncio.timeout(self.timeout):
+                    await self._call(call)
+                return
+            except self.permanent:
+                raise
+            except TimeoutError:
+                self.timeouts += 1
+                if attempt == self.retries:
+                    raise TimeoutError(f"{call.domain}.{call.service} timed out after {self.timeout:g} s") from None
+            except Exception:
+                if attempt == self.retries:
+                    raise
+            await asyncio.sleep(self.backoff * 2**attempt)
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "timeout_seconds": self.timeout,
+            "retries": self.retries,
+            "active": self._active,
+            "pending": self._pending[1] if self._pending is not None else None,
+            "calls": self.calls,
+            "timeouts": self.timeouts,
+            "failed": self.failed,
+            "superseded": self.superseded,
+        }
+
+
+class LatencyHistogram:
+    """Counts of latencies per LATENCY_BUCKETS bucket, with their total and maximum."""
+
+    __slots__ = ("bounds", "counts", "max", "total")
+
+    def __init__(self, bounds: Sequence[float] = LATENCY_BUCKETS) -> None:
+        self.bounds = tuple(bounds)
+        self.counts = [0] * (len(self.bounds) + 1)
+        self.total = self.max = 0.0
+
+    def add(self, seconds: float) -> None:
+        self.counts[bisect_left(self.bounds, seconds)] += 1
+        self.total += seconds
+        self.max = max(self.max, seconds)
+
+    @property
+    def count(self) -> int:
+        return sum(self.counts)
+
+    def as_dict(self) -> dict[str, Any]:
+        labels = [f"<={bound:g}s" for bound in self.bounds] + [f">{self.bounds[-1]:g}s"]
+        count = self.count
+        return {
+            "count": count,
+            "mean_seconds": round(self.total / count, 3) if count else None,
+            "max_seconds": round(self.max, 3) if count else None,
+            "buckets": dict(zip(labels, self.counts, strict=True)),
+        }
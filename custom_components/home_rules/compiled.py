@@ -0,0 +1,189 @@
+"""Decision tables compiled from a fixed RuleParameters.
+
+No Home Assistant dependencies. With parameters fixed, adjust() only depends on
+which side of each threshold an input falls, the discrete mode/flags, whether
+the last output was TIMER or DISABLED, and the two counters. CompiledRules
+bins the continuous inputs (one bisect over the generation thresholds plus
+single comparisons for temperature, humidity and grid) and looks the bin up in
+a table of (output, reason, counter action) entries. Counters are applied
+after the lookup exactly as adjust() does. The bin is public as input_class():
+while it and the counters stay the same, so does the decision, which is what
+edge-triggered evaluation relies on.
+
+Table entries are filled on first use by running the branchy engine on the
+sample that hit the empty cell, so compiling is O(1) and every cell is by
+construction what adjust() returns for that bin.
+
+EngineStats is an opt-in hook: while CompiledRules.stats is None, adjust()
+pays a single None check; when set, every call is counted per reason and per
+branch and timed.
+"""
+
+from __future__ import annotations
+
+from bisect import bisect_right
+from collections import Counter
+from dataclasses import replace
+from time import perf_counter_ns
+from typing import Any, NamedTuple
+
+from .rules import (
+    AdjustResult,
+    AirconMode,
+    CachedState,
+    HomeInput,
+    HomeOutput,
+    Reason,
+    RuleParameters,
+    SessionState,
+    TargetResult,
+    Transition,
+    adjust,
+    branch,
+    transition,
+)
+
+# Counter handling recorded per table cell.
+_KEEP, _RESET, _TOLERATE = 0, 1, 2
+# Probe tolerance that can never reach grid_usage_delay, so a tolerate branch is observable.
+_PROBE = -(2**62)
+_MODE_CLASS = {AirconMode.OFF: 1, AirconMode.UNKNOWN: 2, AirconMode.COOL: 3, AirconMode.DRY: 4}
+_LAST_CLASS: dict[HomeOutput | None, int] = {HomeOutput.TIMER: 1, HomeOutput.DISABLED: 2}
+_WAIT = AdjustResult(HomeOutput.NO_CHANGE, Reason.REACTIVATE_WAIT)
+_TOLERATED = AdjustResult(HomeOutput.NO_CHANGE, Reason.GRID_TOLERATED)
+_TOO_HIGH = AdjustResult(HomeOutput.OFF, Reason.GRID_TOO_HIGH)
+
+
+class _Cell(NamedTuple):
+    result: AdjustResult
+    counter: int
+
+
+class EngineStats:
+    """Branch counters and cumulative timing for CompiledRules.adjust()."""
+
+    __slots__ = ("adjust_ns", "branches", "evaluate_ns", "evaluations", "reasons", "targets")
+
+    def __init__(self) -> None:
+        self.evaluations = self.adjust_ns = self.evaluate_ns = 0
+        self.reasons: Counter[Reason] = Counter()
+        self.branches: Counter[str] = Counter()
+        self.targets: Counter[Reason] = Counter()
+
+    def count_target(self, target: TargetResult) -> None:
+        """Count which _evaluate_target_mode() branch produced `target`."""
+        self.targets[target.reason] += 1
+
+    def as_dict(self) -> dict[str, Any]:
+        n = self.evaluations
+        return {
+            "evaluations": n,
+            "adjust_seconds": self.adjust_ns / 1e9,
+            "adjust_mean_us": self.adjust_ns / n / 1e3 if n else None,
+            "evaluate_seconds": self.evaluate_ns / 1e9,
+            "evaluate_mean_ms": self.evaluate_ns / n / 1e6 if n else None,
+            "branches": dict(self.branches.most_common()),
+            "reasons": {r.value: count for r, count in self.reasons.most_common()},
+            "target_reasons": {r.value: count for r, count in self.targets.most_common()},
+        }
+
+
+class CompiledRules:
+    """adjust() specialised to one RuleParameters. Build with compile_rules()."""
+
+    __slots__ = ("config", "stats", "_generation_edges", "_table")
+
+    def __init__(self, config: RuleParameters, stats: EngineStats | None = None) -> None:
+        self.config = config
+        self.stats = stats
+        self._generation_edges = sorted(
+            {config.generation_boost_threshold, config.generation_cool_threshold, config.generation_dry_threshold}
+        )
+        self._table: dict[int, _Cell] = {}
+
+    def __len__(self) -> int:
+        """Number of filled table cells."""
+        return len(self._table)
+
+    def input_class(self, home: HomeInput, last: HomeOutput | None) -> int:
+        """Which side of every threshold `home` falls, plus its discrete inputs and the TIMER/DISABLED last output."""
+        return self._index(home, last)
+
+    def _index(self, home: HomeInput, last: HomeOutput | None) -> int:
+        h, cfg = home, self.config
+        return (
+            bisect_right(self._generation_edges, h.generation)
+            | _MODE_CLASS.get(h.aircon_mode, 0) << 2
+            | _LAST_CLASS.get(last, 0) << 5
+            | (h.temperature > cfg.temperature_cool) << 7
+            | (h.temperature >= cfg.temperature_threshold) << 8
+            | (h.humidity < cfg.dry_mode_humidity_cutoff) << 9
+            | (h.grid_usage > 0) << 10
+            | h.have_solar << 11
+            | h.timer << 12
+            | h.auto << 13
+            | h.aggressive_cooling << 14
+            | h.enabled << 15
+            | h.cooling_enabled << 16
+        )
+
+    def _fill(self, index: int, home: HomeInput, last: HomeOutput | None) -> _Cell:
+        result, probe = transition(self.config, home, SessionState(tolerated=_PROBE, last=last))
+        counter = _RESET if probe.tolerated == 0 else _TOLERATE if probe.tolerated != _PROBE else _KEEP
+        cell = self._table[index] = _Cell(result, counter)
+        return cell
+
+    def adjust(self, home: HomeInput, state: CachedState) -> AdjustResult:
+        """Drop-in replacement for rules.adjust(self.config, home, state); mutates `state` the same way."""
+        if self.stats is None:
+            return self._adjust(home, state)
+        stats = self.stats
+        stats.branches[branch(home, state)] += 1
+        start = perf_counter_ns()
+        result = self._adjust(home, state)
+        stats.adjust_ns += perf_counter_ns() - start
+        stats.evaluations += 1
+        stats.reasons[result.reason] += 1
+        return result
+
+    def _adjust(self, home: HomeInput, state: CachedState) -> AdjustResult:
+        h = home
+        if h.generation != h.generation or h.temperature != h.temperature:
+            return adjust(self.config, h, state)  # NaN falls on neither side of a threshold
+        if state.reactivate_delay and h.enabled and h.aircon_mode is not AirconMode.UNKNOWN:
+            state.reactivate_delay -= 1
+            return _WAIT
+        index = self._index(h, state.last)
+        cell = self._table.get(index) or self._fill(index, h, state.last)
+        if cell.counter == _RESET:
+            state.tolerated = 0
+        elif cell.counter == _TOLERATE:
+            state.tolerated += 1
+            if state.tolerated < self.config.grid_usage_delay:
+                return _TOLERATED
+            state.tolerated, state.reactivate_delay = 0, self.config.reactivate_delay
+            return _TOO_HIGH
+        return cell.result
+
+    def transition(self, home: HomeInput, state: SessionState) -> Transition:
+        """Drop-in replacement for rules.transition(self.config, home, state)."""
+        h = home
+        if h.generation != h.generation or h.temperature != h.temperature:
+            return transition(self.config, h, state)
+        if state.reactivate_delay and h.enabled and h.aircon_mode is not AirconMode.UNKNOWN:
+            return Transition(_WAIT, replace(state, reactivate_delay=state.reactivate_delay - 1))
+        index = self._index(h, state.last)
+        cell = self._table.get(index) or self._fill(index, h, state.last)
+        if cell.counter == _RESET:
+            return Transition(cell.result, state if state.tolerated == 0 else replace(state, tolerated=0))
+        if cell.counter == _TOLERATE:
+            tolerated = state.tolerated + 1
+            if tolerated < self.config.grid_usage_delay:
+                return Transition(_TOLERATED, replace(state, tolerated=tolerated))
+            return Transition(_TOO_HIGH, replace(state, tolerated=0, reactivate_delay=self.config.reactivate_delay))
+        return Transition(cell.result, state)
+
+
+def compile_rules(config: RuleParameters, stats: EngineStats | None = None) -> CompiledRules:
+    """Compile `config` into a CompiledRules decision table, optionally instrumented with `stats`."""
+    return CompiledRules(config, stats)
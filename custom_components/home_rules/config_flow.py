@@ -12,6 +12,8 @@ from homeassistant.helpers import selector
 from homeassistant.helpers.selector import SelectOptionDict
 
 from . import const as c
+from .coordinator import rule_parameters
+from .explorer import explore
 
 _PLATFORMS = ("switch", "select", "sensor", "binary_sensor", "button", "number")
 _HOME_RULES_PREFIXES = tuple(f"{platform}.{c.DOMAIN}_" for platform in _PLATFORMS)
@@ -24,7 +26,7 @@ def _number_selector(min_val: float, max_val: float, step: float, unit: str | No
 
 
 _ENTITY_SELECTORS = {c.CONF_CLIMATE_ENTITY_ID: _entity_selector("climate"), c.CONF_INVERTER_ENTITY_ID: _entity_selector(["sensor", "binary_sensor"]), c.CONF_GENERATION_ENTITY_ID: _entity_selector("sensor", "power"), c.CONF_GRID_ENTITY_ID: _entity_selector("sensor", "power"), c.CONF_TEMPERATURE_ENTITY_ID: _entity_selector("sensor", "temperature"), c.CONF_HUMIDITY_ENTITY_ID: _entity_selector("sensor", "humidity")}
-_NUMBER_FIELDS = ((c.CONF_AIRCON_TIMER_DURATION, c.DEFAULT_AIRCON_TIMER_DURATION, _number_selector(1, 180, 1, "min")), (c.CONF_EVAL_INTERVAL, c.DEFAULT_EVAL_INTERVAL, _number_selector(60, 3600, 60, "s")), (c.CONF_SMOOTHING_WINDOW, c.DEFAULT_SMOOTHING_WINDOW, _number_selector(1, 10, 1)), (c.CONF_GENERATION_COOL_THRESHOLD, c.DEFAULT_GENERATION_COOL_THRESHOLD, _number_selector(0, 20000, 100, "W")), (c.CONF_GENERATION_DRY_THRESHOLD, c.DEFAULT_GENERATION_DRY_THRESHOLD, _number_selector(0, 20000, 100, "W")), (c.CONF_GENERATION_BOOST_THRESHOLD, c.DEFAULT_GENERATION_BOOST_THRESHOLD, _number_selector(0, 5000, 50, "W")), (c.CONF_GRID_USAGE_DELAY, c.DEFAULT_GRID_USAGE_DELAY, _number_selector(0, 5, 1)), (c.CONF_REACTIVATE_DELAY, c.DEFAULT_REACTIVATE_DELAY, _number_selector(0, 5, 1)))
+_NUMBER_FIELDS = ((c.CONF_AIRCON_TIMER_DURATION, c.DEFAULT_AIRCON_TIMER_DURATION, _number_selector(1, 180, 1, "min")), (c.CONF_EVAL_INTERVAL, c.DEFAULT_EVAL_INTERVAL, _number_selector(60, 3600, 60, "s")), (c.CONF_EVENT_DEBOUNCE, c.DEFAULT_EVENT_DEBOUNCE, _number_selector(0, 300, 5, "s")), (c.CONF_MIN_EVAL_INTERVAL, c.DEFAULT_MIN_EVAL_INTERVAL, _number_selector(30, 3600, 30, "s")), (c.CONF_MAX_EVAL_INTERVAL, c.DEFAULT_MAX_EVAL_INTERVAL, _number_selector(60, 7200, 60, "s")), (c.CONF_SMOOTHING_WINDOW, c.DEFAULT_SMOOTHING_WINDOW, _number_selector(1, 10, 1)), (c.CONF_SAVE_DELAY, c.DEFAULT_SAVE_DELAY, _number_selector(0, 600, 10, "s")), (c.CONF_OSCILLATION_WINDOW, c.DEFAULT_OSCILLATION_WINDOW, _number_selector(5, 240, 5, "min")), (c.CONF_GENERATION_COOL_THRESHOLD, c.DEFAULT_GENERATION_COOL_THRESHOLD, _number_selector(0, 20000, 100, "W")), (c.CONF_GENERATION_DRY_THRESHOLD, c.DEFAULT_GENERATION_DRY_THRESHOLD, _number_selector(0, 20000, 100, "W")), (c.CONF_GENERATION_BOOST_THRESHOLD, c.DEFAULT_GENERATION_BOOST_THRESHOLD, _number_selector(0, 5000, 50, "W")), (c.CONF_GRID_USAGE_DELAY, c.DEFAULT_GRID_USAGE_DELAY, _number_selector(0, 60, 1, "min")), (c.CONF_REACTIVATE_DELAY, c.DEFAULT_REACTIVATE_DELAY, _number_selector(0, 60, 1, "min")))
 _OPTIONS_ENTITY_FIELDS: tuple[tuple[type, str], ...] = ((vol.Required, c.CONF_CLIMATE_ENTITY_ID), (vol.Optional, c.CONF_INVERTER_ENTITY_ID), (vol.Required, c.CONF_GENERATION_ENTITY_ID), (vol.Required, c.CONF_GRID_ENTITY_ID), (vol.Required, c.CONF_TEMPERATURE_ENTITY_ID), (vol.Required, c.CONF_HUMIDITY_ENTITY_ID))
 _OPTIONS_REQUIRED = [key for marker, key in _OPTIONS_ENTITY_FIELDS if marker is vol.Required]
 
@@ -33,6 +35,12 @@ def _without_legacy_timer_entity_id(data: Mapping[str, Any]) -> dict[str, Any]:
     cleaned = dict(data); cleaned.pop(c.LEGACY_CONF_TIMER_ENTITY_ID, None); return cleaned
 
 
+def _shortest_interval(options: Mapping[str, Any]) -> float:
+    """Seconds between evaluations at the quickest: the adaptive minimum, or the event debounce when events drive evaluations."""
+    low, debounce = min(float(options.get(c.CONF_MIN_EVAL_INTERVAL, c.DEFAULT_MIN_EVAL_INTERVAL)), float(options.get(c.CONF_MAX_EVAL_INTERVAL, c.DEFAULT_MAX_EVAL_INTERVAL))), float(options.get(c.CONF_EVENT_DEBOUNCE, c.DEFAULT_EVENT_DEBOUNCE))
+    return min(low, debounce) if debounce > 0 else low
+
+
 def _schema(required: tuple[str, ...], optional: tuple[str, ...] = ()) -> vol.Schema:
     fields: dict[Any, Any] = {vol.Optional(key): _ENTITY_SELECTORS[key] for key in optional}; fields.update({vol.Required(key): _ENTITY_SELECTORS[key] for key in required}); return vol.Schema(fields)
 
@@ -63,7 +71,7 @@ def _validate_entities(
 
 class HomeRulesConfigFlow(ConfigFlow, domain=c.DOMAIN):
     VERSION = 1
-    MINOR_VERSION = 2
+    MINOR_VERSION = 3
 
     def __init__(self) -> None: self._data: dict[str, Any] = {}
     @staticmethod
@@ -97,10 +105,15 @@ class HomeRulesConfigFlow(ConfigFlow, domain=c.DOMAIN):
 class HomeRulesOptionsFlow(OptionsFlow):
     async def async_step_init(self, user_input: dict[str, Any] | None = None) -> ConfigFlowResult:
         errors = _validate_entities(self.hass, user_input, _OPTIONS_REQUIRED, allow_inverter=True) if user_input else {}
+        options = {**self.config_entry.options, **(user_input or {})}
+        if user_input and not errors and (await self.hass.async_add_executor_job(explore, rule_parameters(options), _shortest_interval(options))).short_cycles: errors = {"base": "short_cycling"}
         if user_input and not errors: return self.async_create_entry(data=_without_legacy_timer_entity_id({**self.config_entry.options, **user_input}))
         cur = _without_legacy_timer_entity_id(self.config_entry.options)
         notify_options = cast(list[SelectOptionDict], [{"label": "Disabled", "value": ""}] + [{"label": f"notify.{name}", "value": f"notify.{name}"} for name in sorted(self.hass.services.async_services_for_domain("notify"))])
         schema: dict[Any, Any] = {marker(key, default=cur.get(key, self.config_entry.data.get(key, ""))): _ENTITY_SELECTORS[key] for marker, key in _OPTIONS_ENTITY_FIELDS}
         schema.update({vol.Required(key, default=cur.get(key, default)): sel for key, default, sel in _NUMBER_FIELDS})
         schema[vol.Optional(c.CONF_NOTIFICATION_SERVICE, default=cur.get(c.CONF_NOTIFICATION_SERVICE, ""))] = selector.SelectSelector(selector.SelectSelectorConfig(options=notify_options))
+        schema[vol.Optional(c.CONF_EDGE_TRIGGERED, default=bool(cur.get(c.CONF_EDGE_TRIGGERED, False)))] = selector.BooleanSelector()
+        schema[vol.Optional(c.CONF_TIME_WEIGHTED, default=bool(cur.get(c.CONF_TIME_WEIGHTED, False)))] = selector.BooleanSelector()
+        schema[vol.Optional(c.CONF_ENGINE_STATS, default=bool(cur.get(c.CONF_ENGINE_STATS, False)))] = selector.BooleanSelector()
         return self.async_show_form(step_id="init", data_schema=vol.Schema(schema), errors=errors)
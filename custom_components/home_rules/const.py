@@ -30,13 +30,25 @@ CONF_GRID_USAGE_DELAY = "grid_usage_delay"
 CONF_REACTIVATE_DELAY, CONF_TEMPERATURE_COOL = "reactivate_delay", "temperature_cool"
 CONF_EVAL_INTERVAL, CONF_AIRCON_TIMER_DURATION = "eval_interval", "aircon_timer_duration"
 CONF_NOTIFICATION_SERVICE, CONF_SMOOTHING_WINDOW = "notification_service", "smoothing_window"
+CONF_ENGINE_STATS, CONF_OSCILLATION_WINDOW = "engine_stats", "oscillation_window"
+CONF_EVENT_DEBOUNCE, CONF_EDGE_TRIGGERED = "event_debounce", "edge_triggered"
+CONF_MIN_EVAL_INTERVAL, CONF_MAX_EVAL_INTERVAL = "min_eval_interval", "max_eval_interval"
+CONF_TIME_WEIGHTED, CONF_SAVE_DELAY = "time_weighted", "save_delay"
 
 DEFAULT_GENERATION_COOL_THRESHOLD, DEFAULT_GENERATION_DRY_THRESHOLD = 5500.0, 3500.0
 DEFAULT_GENERATION_BOOST_THRESHOLD = 500.0
 DEFAULT_TEMPERATURE_THRESHOLD, DRY_MODE_HUMIDITY_CUTOFF = 24.0, 65.0
-DEFAULT_GRID_USAGE_DELAY, DEFAULT_REACTIVATE_DELAY = 2, 2
+DEFAULT_GRID_USAGE_DELAY, DEFAULT_REACTIVATE_DELAY = 6, 6  # minutes
 DEFAULT_TEMPERATURE_COOL, DEFAULT_EVAL_INTERVAL, DEFAULT_AIRCON_TIMER_DURATION = 22.0, 180, 60
-DEFAULT_SMOOTHING_WINDOW = 5
+DEFAULT_SMOOTHING_WINDOW, DEFAULT_OSCILLATION_WINDOW = 5, 30
+# Seconds; 0 (the default) keeps event-driven evaluation off. While on, polling only runs as a safety net.
+DEFAULT_EVENT_DEBOUNCE, SAFETY_NET_INTERVAL = 0, 900
+# Adaptive poll bounds (seconds); generation within NEAR_THRESHOLD_FRACTION of a threshold counts as near it.
+DEFAULT_MIN_EVAL_INTERVAL, DEFAULT_MAX_EVAL_INTERVAL, NEAR_THRESHOLD_FRACTION = 60, 1800, 0.1
+# Seconds routine saves are coalesced for (0 = write every change); PERSISTENCE_DAYS days of write counts are kept.
+DEFAULT_SAVE_DELAY, PERSISTENCE_DAYS = 60, 7
+# Seconds after a climate command returns for the entity to report the commanded mode and setpoint.
+CONFIRMATION_TIMEOUT = 30
 _POWER_UNITS = {"w": "W", "kw": "kW", "mw": "MW", "gw": "GW"}
 
 
@@ -54,9 +66,15 @@ DEFAULT_OPTIONS: dict[str, int | float] = {
     CONF_GRID_USAGE_DELAY: DEFAULT_GRID_USAGE_DELAY,
     CONF_REACTIVATE_DELAY: DEFAULT_REACTIVATE_DELAY,
     CONF_SMOOTHING_WINDOW: DEFAULT_SMOOTHING_WINDOW,
+    CONF_OSCILLATION_WINDOW: DEFAULT_OSCILLATION_WINDOW,
+    CONF_EVENT_DEBOUNCE: DEFAULT_EVENT_DEBOUNCE,
+    CONF_MIN_EVAL_INTERVAL: DEFAULT_MIN_EVAL_INTERVAL,
+    CONF_MAX_EVAL_INTERVAL: DEFAULT_MAX_EVAL_INTERVAL,
+    CONF_SAVE_DELAY: DEFAULT_SAVE_DELAY,
 }
 
 MAX_RECENT_EVALUATIONS, STORAGE_VERSION = 50, 1
 EVENT_EVALUATION = "home_rules_evaluation"
+SERVICE_GET_ENGINE_STATS = "get_engine_stats"
 ISSUE_RUNTIME, ISSUE_ENTITY_MISSING, ISSUE_ENTITY_UNAVAILABLE = "runtime_error", "entity_missing", "entity_unavailable"
 ISSUE_INVALID_UNIT, ISSUE_NOTIFICATION_SERVICE = "invalid_unit", "notification_service"
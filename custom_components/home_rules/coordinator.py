@@ -3,69 +3,194 @@
 
 import asyncio
 from collections import deque
+from collections.abc import Mapping
 from contextlib import suppress
 from dataclasses import asdict, dataclass, replace
 from datetime import datetime, timedelta
+from functools import partial
+from itertools import islice
+from pathlib import Path
+from time import monotonic, perf_counter_ns
 from typing import Any
 
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import ATTR_UNIT_OF_MEASUREMENT, UnitOfPower, UnitOfTemperature
-from homeassistant.core import HomeAssistant, State
+from homeassistant.core import CALLBACK_TYPE, Event, EventStateChangedData, HomeAssistant, State, callback
 from homeassistant.exceptions import ConfigEntryNotReady, HomeAssistantError, ServiceValidationError
 from homeassistant.helpers import issue_registry as ir
+from homeassistant.helpers.debounce import Debouncer
+from homeassistant.helpers.event import async_track_state_change_event
+from homeassistant.helpers.json import prepare_save_json
 from homeassistant.helpers.storage import Store
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
 from homeassistant.util import dt as dt_util
 from homeassistant.util.unit_conversion import PowerConverter, TemperatureConverter
 
 from . import const as c
+from .actuation import (
+    ActuationQueue,
+    Call,
+    LatencyHistogram,
+    Outcome,
+    Plan,
+    plan_climate,
+    setpoint_matches,
+    setpoint_step,
+)
+from .compiled import CompiledRules, EngineStats, compile_rules
+from .journal import Journal
+from .oscillation import OscillationDetector
+from .records import EvaluationRecord
+from .rolling import RollingWindow, TimeWeightedAverage
 from .rules import (
+    ALLOWED_FAILURES,
+    OUTPUT_CODES,
+    REASON_CODES,
     AirconMode,
     CachedState,
+    Deadlines,
     HomeInput,
     HomeOutput,
+    Reason,
     RuleParameters,
     _evaluate_target_mode,
-    adjust,
     apply_adjustment,
+    clean_power,
     current_state,
+    deadline_parameters,
+    normalized_input,
 )
 
 _HOME_RECORD_FIELDS = ("generation", "grid_usage", "temperature", "humidity", "have_solar", "auto")
 _SESSION_RECORD_FIELDS = ("tolerated", "reactivate_delay")
+_INPUT_ENTITY_KEYS = (c.CONF_CLIMATE_ENTITY_ID, c.CONF_INVERTER_ENTITY_ID, c.CONF_GENERATION_ENTITY_ID, c.CONF_GRID_ENTITY_ID, c.CONF_TEMPERATURE_ENTITY_ID, c.CONF_HUMIDITY_ENTITY_ID)
+_RUNNING = frozenset((HomeOutput.COOL, HomeOutput.DRY, HomeOutput.TIMER))
 _CLEAR_ISSUES = (c.ISSUE_RUNTIME, c.ISSUE_ENTITY_MISSING, c.ISSUE_INVALID_UNIT, c.ISSUE_ENTITY_UNAVAILABLE)
+# History records store OUTPUT_CODES / REASON_CODES; strings are only built for display.
+_OUTPUT_RECORD_FIELDS = ("current", "adjustment", "mode", "target_adjustment", "smoothed_adjustment")
+_REASON_RECORD_FIELDS = ("reason", "target_reason", "smoothed_reason")
+
+
+def _decode(table: tuple[HomeOutput, ...] | tuple[Reason, ...], value: Any) -> Any: return table[value].value if isinstance(value, int) and not isinstance(value, bool) else value
+def _encode(enum: type[HomeOutput] | type[Reason], value: Any) -> Any:
+    if not isinstance(value, str): return value
+    with suppress(ValueError): return enum(HomeOutput.NO_CHANGE.value if value == "NoChange" else value).code
+    return value
+
+
+def display_record(record: Mapping[str, Any]) -> dict[str, Any]:
+    """Materialize a history record with human-readable outputs and reasons."""
+    out = dict(record) | {k: _decode(OUTPUT_CODES, record[k]) for k in _OUTPUT_RECORD_FIELDS if k in record} | {k: _decode(REASON_CODES, record[k]) for k in _REASON_RECORD_FIELDS if k in record}
+    if "blocked_reasons" in record: out["blocked_reasons"] = [_decode(REASON_CODES, v) for v in record["blocked_reasons"]]
+    return out
+
+
+def coded_record(record: Mapping[str, Any]) -> dict[str, Any]:
+    """Convert a stored history record (including legacy string records) to code form."""
+    out = dict(record) | {k: _encode(HomeOutput, record[k]) for k in _OUTPUT_RECORD_FIELDS if k in record} | {k: _encode(Reason, record[k]) for k in _REASON_RECORD_FIELDS if k in record}
+    if "blocked_reasons" in record: out["blocked_reasons"] = [_encode(Reason, v) for v in record["blocked_reasons"]]
+    return out
+
+
+def journal_directory(hass: HomeAssistant, entry_id: str) -> Path: return Path(hass.config.path(".storage", f"{c.DOMAIN}_{entry_id}.journal"))
+
+
+def rule_parameters(options: Mapping[str, Any], overrides: Mapping[str, float] | None = None, *, dry_mode_enabled: bool = True) -> RuleParameters:
+    """RuleParameters from config entry options; `overrides` (number entity values) take precedence.
+
+    The delays stay in minutes, as the offline tools take them; the engine compiles deadline_parameters() of them.
+    """
+    def g(key: str, default: float) -> float: return float((overrides or {}).get(key, options.get(key, default)))
+    return RuleParameters(g(c.CONF_GENERATION_COOL_THRESHOLD, c.DEFAULT_GENERATION_COOL_THRESHOLD), g(c.CONF_GENERATION_DRY_THRESHOLD, c.DEFAULT_GENERATION_DRY_THRESHOLD), g(c.CONF_GENERATION_BOOST_THRESHOLD, c.DEFAULT_GENERATION_BOOST_THRESHOLD), g(c.CONF_TEMPERATURE_THRESHOLD, c.DEFAULT_TEMPERATURE_THRESHOLD), c.DRY_MODE_HUMIDITY_CUTOFF, dry_mode_enabled, int(options.get(c.CONF_GRID_USAGE_DELAY, c.DEFAULT_GRID_USAGE_DELAY)), int(options.get(c.CONF_REACTIVATE_DELAY, c.DEFAULT_REACTIVATE_DELAY)), g(c.CONF_TEMPERATURE_COOL, c.DEFAULT_TEMPERATURE_COOL))
+
+
+def delay_seconds(options: Mapping[str, Any]) -> tuple[float, float]:
+    """(grid usage delay, reactivation delay) in seconds; the options hold minutes."""
+    return 60 * float(options.get(c.CONF_GRID_USAGE_DELAY, c.DEFAULT_GRID_USAGE_DELAY)), 60 * float(options.get(c.CONF_REACTIVATE_DELAY, c.DEFAULT_REACTIVATE_DELAY))
+
+
+def deadlines_from_storage(session: Mapping[str, Any], options: Mapping[str, Any], now: float) -> Deadlines:
+    """Stored deadlines, or the counters of a pre-deadline session converted at the evaluation interval.
+
+    The grid tolerance started tolerated - 1 intervals ago, and ticks reactivation ticks allowed a restart after ticks + 1 intervals.
+    """
+    if (stored := session.get("deadlines")) is not None: return Deadlines(*(float(stored[k]) if stored.get(k) is not None else None for k in ("tolerate_until", "reactivate_at")))
+    interval = float(options.get(c.CONF_EVAL_INTERVAL, c.DEFAULT_EVAL_INTERVAL)); grid_delay, _ = delay_seconds(options); ticks, tolerated = int(session.get("reactivate_delay", 0)), int(session.get("tolerated", 0))
+    return Deadlines(now + max(0.0, grid_delay - (tolerated - 1) * interval) if tolerated else None, now + (ticks + 1) * interval if ticks else None)
 
 
 @dataclass
 class CoordinatorData:
-    mode: HomeOutput = HomeOutput.OFF; current: HomeOutput = HomeOutput.OFF; adjustment: HomeOutput = HomeOutput.NO_CHANGE; decision: str = ""; reason: str = ""; solar_available: bool = False; auto_mode: bool = False; dry_run: bool = False; timer_finishes_at: datetime | None = None; last_evaluated: str | None = None; last_changed: str | None = None; smoothing_disagrees: int = 0
+    mode: HomeOutput = HomeOutput.OFF; current: HomeOutput = HomeOutput.OFF; adjustment: HomeOutput = HomeOutput.NO_CHANGE; reason: Reason | None = None; solar_available: bool = False; auto_mode: bool = False; dry_run: bool = False; timer_finishes_at: datetime | None = None; last_evaluated: str | None = None; last_changed: str | None = None; smoothing_disagrees: int = 0; oscillating: bool = False; effective_interval: int | None = None
+
+    @property
+    def decision(self) -> str: return f"{self.mode.value} - {self.reason}" if self.reason is not None else ""
 
 
 class HomeRulesCoordinator(DataUpdateCoordinator[CoordinatorData]):
     config_entry: ConfigEntry
     _LEGACY_MODES: dict[str, str] = {"Disabled": "disabled", "Dry Run": "monitor", "Live": "solar_cooling", "Aggressive": "boost_cooling"}
     _FALLBACK_DEFAULTS = {"generation": "0", "grid": "0", "inverter": "offline"}
-    _recent: deque[dict[str, Any]]
-    _last_record: dict[str, Any]
+    _recent: deque[EvaluationRecord]
+    _last_record: Mapping[str, Any]
     _last_changed: str | None
     _fallback_inputs: dict[str, str]
 
     def __init__(self, hass: HomeAssistant, config_entry: ConfigEntry) -> None:
         self.hass, self.config_entry = hass, config_entry; self._lock, self._session = asyncio.Lock(), CachedState(); self.control_mode, self.cooling_enabled, self.dry_mode_enabled = c.ControlMode.MONITOR, True, True
-        self._parameters: dict[str, float] = {}; self._auto_mode = self._initialized = self._first_refresh_done = False; self._recent, self._last_changed, self._last_record, self._fallback_inputs = deque(maxlen=c.MAX_RECENT_EVALUATIONS), None, {}, {}; self._aircon_timer_finishes_at: datetime | None = None; self._timer_expiry_handle: asyncio.TimerHandle | None = None
+        self._parameters: dict[str, float] = {}; self._auto_mode = self._initialized = self._first_refresh_done = False; self._recent, self._last_changed, self._last_record, self._fallback_inputs = deque(maxlen=c.MAX_RECENT_EVALUATIONS), None, {}, {}; self._aircon_timer_finishes_at: datetime | None = None; self._timer_expiry_handle: asyncio.TimerHandle | None = None; self._deadlines = Deadlines(); self._deadline_handle: asyncio.TimerHandle | None = None; self._compiled: CompiledRules | None = None; self._compiled_version = 0
+        # Parameters snapshot, rebuilt only after _invalidate_parameters(); parameters_version counts the rebuilds so caches can key on it.
+        self._parameter_snapshot: RuleParameters | None = None; self.parameters_version = 0
+        # Repeats: an evaluation with the previous fingerprint (inputs, session, parameters) and result only bumps the last record's repeat count.
+        self._fingerprint: tuple[Any, ...] | None = None; self._repeat_total = 0; self._repeats_unsaved = False
+        # Single flight: the waiting evaluation (its future and triggers) that later callers join; `coalesced` counts the joins.
+        self._queued: tuple[asyncio.Future[CoordinatorData], list[str]] | None = None; self.coalesced = 0
+        window = self._smoothing_window; self._generation_window, self._grid_window = RollingWindow(window), RollingWindow(window)
+        # Time-weighted: generation and grid state changes are integrated between evaluations, which see the interval means.
+        self._interval_power = (TimeWeightedAverage(), TimeWeightedAverage()) if config_entry.options.get(c.CONF_TIME_WEIGHTED, False) else None; self._power_entities: dict[str, tuple[str, TimeWeightedAverage]] = {}; self._solar_entities: frozenset[str] = frozenset(); self._solar_watch = False
+        self._engine_stats = EngineStats() if config_entry.options.get(c.CONF_ENGINE_STATS, False) else None
+        self.oscillation = OscillationDetector(60 * float(config_entry.options.get(c.CONF_OSCILLATION_WINDOW, c.DEFAULT_OSCILLATION_WINDOW)))
         self._store = Store[dict[str, Any]](hass, c.STORAGE_VERSION, f"{c.DOMAIN}_{config_entry.entry_id}")
-        interval = timedelta(seconds=int(config_entry.options.get(c.CONF_EVAL_INTERVAL, c.DEFAULT_EVAL_INTERVAL))); name = f"{c.DOMAIN} ({config_entry.entry_id})"
-        super().__init__(hass, c.LOGGER, name=name, update_interval=interval, always_update=True, config_entry=config_entry); self.data = CoordinatorData()
+        # Routine saves are coalesced into one write per `save_delay` seconds; _writes holds [day, Store writes, Store bytes, journal writes, journal bytes] per local day.
+        # Store payloads are not serialized twice per write: the last one is sized when diagnostics ask or the day ends, and stands in for the _unsized writes before it.
+        self._save_delay = float(config_entry.options.get(c.CONF_SAVE_DELAY, c.DEFAULT_SAVE_DELAY)); self._save_pending = False; self._writes: deque[list[Any]] = deque(maxlen=c.PERSISTENCE_DAYS); self._stored: dict[str, Any] | None = None; self._unsized = 0
+        # Evaluation history lives in an append-only journal beside the Store document (see journal.py).
+        self._journal = Journal(journal_directory(hass, config_entry.entry_id), c.MAX_RECENT_EVALUATIONS); self._compaction: asyncio.Task[None] | None = None
+        # Climate commands run in the actuation queue, off the lock; outcomes come back through _actuation_done (newest first in `actuations`).
+        self._actuation = ActuationQueue(self._call_service, self._actuation_done, partial(config_entry.async_create_task, hass), permanent=(ServiceValidationError,)); self.actuations: deque[dict[str, Any]] = deque(maxlen=10)
+        # Confirmation: after a command the climate entity is watched until it reports the commanded (label, hvac_mode, setpoint, sent at); this, not a repeated decision, drives failed_to_change.
+        self._expected: tuple[int, HomeOutput, str, float | None, HomeOutput | None, float] | None = None; self._confirm_unsub: CALLBACK_TYPE | None = None; self._confirm_handle: asyncio.TimerHandle | None = None; self.confirmed = self.unconfirmed = 0; self.apply_latency = LatencyHistogram()
+        # Commands are planned against the live climate state: _commands holds [day, calls sent, calls skipped, plans refused] per local day; _hvac_modes caches each entity's advertised modes.
+        self._commands: deque[list[Any]] = deque(maxlen=c.PERSISTENCE_DAYS); self._hvac_modes: dict[str, frozenset[str]] = {}
+        # Event-driven: input state changes are coalesced into one evaluation per `debounce` seconds, and the poll backs off to the safety net.
+        debounce = float(config_entry.options.get(c.CONF_EVENT_DEBOUNCE, c.DEFAULT_EVENT_DEBOUNCE)); self.input_changes = self.edge_skips = 0
+        # Edge-triggered: input changes that leave CompiledRules.input_class() unchanged (and no counter pending) are skipped.
+        self._edge_triggered = debounce > 0 and bool(config_entry.options.get(c.CONF_EDGE_TRIGGERED, False)); self._edge_class: tuple[int, int] | None = None
+        self._input_debouncer = Debouncer(hass, c.LOGGER, cooldown=debounce, immediate=False, function=partial(self._async_try_evaluation, "input_change")) if debounce > 0 else None
+        seconds = int(config_entry.options.get(c.CONF_EVAL_INTERVAL, c.DEFAULT_EVAL_INTERVAL)); self._base_interval = max(seconds, c.SAFETY_NET_INTERVAL) if debounce > 0 else seconds; name = f"{c.DOMAIN} ({config_entry.entry_id})"
+        super().__init__(hass, c.LOGGER, name=name, update_interval=timedelta(seconds=self._base_interval), always_update=True, config_entry=config_entry); self.data = CoordinatorData()
 
     def get_parameter(self, key: str, default: float) -> float: return float(self._parameters.get(key, self.config_entry.options.get(key, default)))
-    async def async_set_parameter(self, key: str, value: float) -> None: self._parameters[key] = value; await self._save_state(); await self.async_run_evaluation("parameter")
+    async def async_set_parameter(self, key: str, value: float) -> None: self._parameters[key] = value; self._invalidate_parameters(); await self._save_state(flush=True); await self.async_run_evaluation("parameter")
 
     @property
     def parameters(self) -> RuleParameters:
-        g, o = self.get_parameter, self.config_entry.options
-        return RuleParameters(g(c.CONF_GENERATION_COOL_THRESHOLD, c.DEFAULT_GENERATION_COOL_THRESHOLD), g(c.CONF_GENERATION_DRY_THRESHOLD, c.DEFAULT_GENERATION_DRY_THRESHOLD), g(c.CONF_GENERATION_BOOST_THRESHOLD, c.DEFAULT_GENERATION_BOOST_THRESHOLD), g(c.CONF_TEMPERATURE_THRESHOLD, c.DEFAULT_TEMPERATURE_THRESHOLD), c.DRY_MODE_HUMIDITY_CUTOFF, self.dry_mode_enabled, int(o.get(c.CONF_GRID_USAGE_DELAY, c.DEFAULT_GRID_USAGE_DELAY)), int(o.get(c.CONF_REACTIVATE_DELAY, c.DEFAULT_REACTIVATE_DELAY)), g(c.CONF_TEMPERATURE_COOL, c.DEFAULT_TEMPERATURE_COOL))
+        if (params := self._parameter_snapshot) is None: params = self._parameter_snapshot = rule_parameters(self.config_entry.options, self._parameters, dry_mode_enabled=self.dry_mode_enabled); self.parameters_version += 1
+        return params
+
+    def _invalidate_parameters(self) -> None: self._parameter_snapshot = None
 
-    async def async_set_mode(self, mode: c.ControlMode) -> None: self.control_mode = mode; await self._save_state(); await self.async_run_evaluation("control_mode")
+    def _rules(self) -> CompiledRules:
+        params = self.parameters
+        if self._compiled is None or self._compiled_version != self.parameters_version: self._compiled, self._compiled_version = compile_rules(deadline_parameters(params), self._engine_stats), self.parameters_version
+        return self._compiled
+
+    @property
+    def engine_stats(self) -> dict[str, Any] | None:
+        """Engine branch/reason counters and timing, or None unless the engine_stats option is on."""
+        return self._engine_stats.as_dict() if self._engine_stats is not None else None
+
+    async def async_set_mode(self, mode: c.ControlMode) -> None: self.control_mode = mode; await self._save_state(flush=True); await self.async_run_evaluation("control_mode")
 
     def _control_mode_from_storage(self, controls: dict[str, Any]) -> c.ControlMode:
         if (mode_raw := controls.get("mode")) is not None:
@@ -76,24 +201,84 @@ class HomeRulesCoordinator(DataUpdateCoordinator[CoordinatorData]):
         return c.ControlMode.BOOST_COOLING if controls.get("aggressive_cooling", False) else c.ControlMode.SOLAR_COOLING
 
     async def async_initialize(self) -> None:
-        stored = await self._store.async_load()
+        stored = await self._store.async_load() or {}; journaled = await self.hass.async_add_executor_job(self._journal.tail)
+        if not journaled and (legacy := stored.get("recent_evaluations")):  # history from before the journal: move it there
+            journaled = [coded_record(r) for r in reversed(legacy)]; self._count_write(await self.hass.async_add_executor_job(self._journal.replace, journaled), journal=True)
+        self._recent = deque((EvaluationRecord(coded_record(r)) for r in reversed(journaled)), maxlen=c.MAX_RECENT_EVALUATIONS)
         if not stored: return
         controls, session = stored.get("controls", {}), stored.get("session", {})
         self.control_mode, self.cooling_enabled, self.dry_mode_enabled = self._control_mode_from_storage(controls), bool(controls.get("cooling_enabled", True)), bool(controls.get(c.CONF_DRY_MODE_ENABLED, True))
-        last = session.get("last"); last = HomeOutput.NO_CHANGE.value if last == "NoChange" else last
-        self._session = CachedState(reactivate_delay=int(session.get("reactivate_delay", 0)), tolerated=int(session.get("tolerated", 0)), last=HomeOutput(last) if last else None, failed_to_change=int(session.get("failed_to_change", 0)))
-        self._auto_mode, self._last_changed = bool(stored.get("auto_mode", False)), stored.get("last_changed")
-        self._recent = deque(stored.get("recent_evaluations", []), maxlen=c.MAX_RECENT_EVALUATIONS)
+        last = _encode(HomeOutput, session.get("last"))
+        self._session = CachedState(last=OUTPUT_CODES[last] if isinstance(last, int) else None, failed_to_change=int(session.get("failed_to_change", 0))); self._deadlines = deadlines_from_storage(session, self.config_entry.options, dt_util.utcnow().timestamp())
+        self._auto_mode, self._last_changed = bool(stored.get("auto_mode", False)), stored.get("last_changed"); repeats = stored.get("repeats", {})
+        for record in self._recent:  # the journal holds each record as first evaluated; the Store keeps how often it repeated
+            if (repeated := repeats.get(record.get("time"))) is not None: record.count_repeat(repeated[1], int(repeated[0]))
+        if (smoothing := stored.get("smoothing")) is None:  # before the rolling windows: warm them from the history
+            recent = list(islice(self._recent, self._smoothing_window))[::-1]; smoothing = {"generation": [r.get("raw_generation", r.get("generation", 0.0)) for r in recent], "grid_usage": [r.get("raw_grid_usage", r.get("grid_usage", 0.0)) for r in recent]}
+        self._generation_window, self._grid_window = (RollingWindow(self._smoothing_window, map(float, smoothing.get(k, []))) for k in ("generation", "grid_usage"))
         self._aircon_timer_finishes_at = dt_util.parse_datetime(str(v)) if (v := stored.get("aircon_timer_finishes_at")) else None
         self._parameters = {}
         for k, v in stored.get("parameters", {}).items():
             if str(k) == "humidity_threshold": continue
             with suppress(TypeError, ValueError): self._parameters[str(k)] = float(v)
-        self._schedule_timer_expiry()
+        self._invalidate_parameters(); self._schedule_timer_expiry()
+
+    async def async_set_control(self, key: str, value: bool) -> None: setattr(self, key, value); self._invalidate_parameters(); await self._save_state(flush=True); await self.async_run_evaluation("control")
+    async def async_shutdown(self) -> None:
+        self._cancel_timer_expiry(); self._cancel_deadline()
+        if self._input_debouncer is not None: self._input_debouncer.async_shutdown()
+        self._actuation.cancel(); self._stop_confirming()
+        if self._save_pending or self._repeats_unsaved: await self._save_state(flush=True)
 
-    async def async_set_control(self, key: str, value: bool) -> None: setattr(self, key, value); await self._save_state(); await self.async_run_evaluation("control")
-    async def async_shutdown(self) -> None: self._cancel_timer_expiry()
-    async def async_run_evaluation(self, trigger: str = "manual") -> None: self.async_set_updated_data(await self._evaluate(trigger))
+    @property
+    def event_driven(self) -> dict[str, Any] | None:
+        """Debounce and input change count, or None when evaluation is poll-only."""
+        if (debouncer := self._input_debouncer) is None: return None
+        return {"debounce_seconds": debouncer.cooldown, "poll_seconds": self._base_interval, "input_changes": self.input_changes, "edge_triggered": self._edge_triggered, "edge_skips": self.edge_skips}
+
+    def async_track_inputs(self) -> CALLBACK_TYPE:
+        """Subscribe to the configured input entities; returns the unsubscribe callback.
+
+        Poll-only, that is the power entities for time weighting plus the generation and inverter entities, which wake a long night interval when solar arrives.
+        """
+        if (interval := self._interval_power) is not None: self._power_entities = {str(self._entity_id(key)): (label, average) for key, label, average in zip((c.CONF_GENERATION_ENTITY_ID, c.CONF_GRID_ENTITY_ID), ("generation", "grid"), interval, strict=True)}
+        self._solar_entities = frozenset(entity_id for key in (c.CONF_GENERATION_ENTITY_ID, c.CONF_INVERTER_ENTITY_ID) if (entity_id := self._entity_id(key, optional=True)))
+        entity_ids = [entity_id for key in _INPUT_ENTITY_KEYS if (entity_id := self._entity_id(key, optional=True))] if self._input_debouncer is not None else sorted(self._solar_entities | self._power_entities.keys())
+        return async_track_state_change_event(self.hass, entity_ids, self._async_input_changed)
+
+    @callback
+    def _async_input_changed(self, event: Event[EventStateChangedData]) -> None:
+        old, new = event.data["old_state"], event.data["new_state"]
+        if new is not None and (power := self._power_entities.get(new.entity_id)) is not None:
+            with suppress(ValueError): power[1].add(new.last_updated_timestamp, self._normalized_power(new, power[0]))
+        if old is not None and new is not None and old.state == new.state: return  # attribute-only update
+        if self._input_debouncer is None:
+            if self._solar_watch and new is not None and new.entity_id in self._solar_entities: self._solar_watch = False; self.hass.async_create_task(self._async_try_evaluation("solar"))  # once; the evaluation re-arms it
+            return
+        self.input_changes += 1
+        if self._edge_triggered and not self._crossed_edge(): self.edge_skips += 1; return
+        self._input_debouncer.async_schedule_call()
+
+    def _input_class(self, home: HomeInput) -> int: return self._rules().input_class(replace(home, generation=self._generation_window.mean_with(home.generation)), self._session.last)
+
+    def _crossed_edge(self) -> bool:
+        """Whether the inputs now fall in a different class than at the last evaluation; running delays wake up on their deadline.
+
+        Classifies the inputs as the next evaluation would see them (time-weighted, then smoothed) without raising issues, recording fallbacks or expiring the timer.
+        """
+        if self._edge_class is None: return True
+        try: home = self._build_home_input(probe=True)[0]
+        except ValueError: return True  # let the evaluation surface the problem
+        if (interval := self._interval_power) is not None and home.have_solar:
+            now = dt_util.utcnow().timestamp(); home = replace(home, generation=interval[0].mean_with(now, home.generation), grid_usage=interval[1].mean_with(now, home.grid_usage))
+        return (self.parameters_version, self._input_class(home)) != self._edge_class
+
+    async def _async_try_evaluation(self, trigger: str) -> None:
+        try: await self.async_run_evaluation(trigger)
+        except Exception as err:  # noqa: BLE001
+            c.LOGGER.warning("Evaluation (%s) failed: %s", trigger, err); self._create_issue(c.ISSUE_RUNTIME, {"error": str(err)})
+    async def async_run_evaluation(self, trigger: str = "manual") -> None:
+        if (data := await self._evaluate(trigger)) is not self.data: self.async_set_updated_data(data)  # callers that joined an evaluation share its data
 
     async def _async_update_data(self) -> CoordinatorData:
         try: return await self._evaluate("poll")
@@ -103,91 +288,133 @@ class HomeRulesCoordinator(DataUpdateCoordinator[CoordinatorData]):
             raise UpdateFailed(translation_domain=c.DOMAIN, translation_key="update_failed", translation_placeholders={"error": str(err)}) from err
 
     async def _evaluate(self, trigger: str) -> CoordinatorData:
-        async with self._lock:
-            now = dt_util.utcnow().isoformat(); self._fallback_inputs = {}; self._clear_issue(c.ISSUE_ENTITY_UNAVAILABLE); home, evaluated_timer = self._build_home_input(); current = current_state(home); params = self.parameters; target = _evaluate_target_mode(params, home); decision_home = replace(home, generation=self._smoothed_generation(home.generation))
-            if not self._initialized: self._initialized = True; self._sync_on_startup(current, home)
-            elif self._session.last is None: self._session.last = current
-            result = adjust(params, decision_home, self._session); adjustment, reason = result.output, result.reason; await self._execute_adjustment(adjustment); timer = self._active_aircon_timer() if adjustment is HomeOutput.TIMER else evaluated_timer
-            previous = self._session.last; applied = apply_adjustment(self._session, current, adjustment); is_monitor = self.control_mode is c.ControlMode.MONITOR
-            if is_monitor: self._session.failed_to_change, applied = 0, True
-            if not applied: raise HomeAssistantError("failed to apply adjustment")
-            if previous is not None and previous != self._session.last: self._last_changed = now; await self._maybe_notify(previous, current, adjustment)
-            mode = self._session.last or current
-            record = {"time": now, "trigger": trigger, "current": current.value, "adjustment": adjustment.value, "mode": mode.value, "reason": reason, "dry_run": is_monitor, "control_mode": self.control_mode.value, "target_adjustment": target.output.value if target.output is not None else None, "target_reason": target.reason, "target_actionable": target.is_actionable, "blocked_reasons": [target.reason] if target.output is None and target.is_actionable else [], "fallback_inputs": dict(self._fallback_inputs), "controls_snapshot": {"control_mode": self.control_mode.value, "cooling_enabled": self.cooling_enabled, "dry_mode_enabled": self.dry_mode_enabled}, "policy_snapshot": {"dry_mode_humidity_cutoff": params.dry_mode_humidity_cutoff}} | {k: getattr(home, k) for k in _HOME_RECORD_FIELDS} | {k: getattr(self._session, k) for k in _SESSION_RECORD_FIELDS}
-            smoothed = self._run_shadow_smoothed(home, record)
-            record.update(smoothed)
-            self._last_record = record; self._recent.appendleft(record); await self._save_state(); self.hass.bus.async_fire(c.EVENT_EVALUATION, record)
-            for issue in _CLEAR_ISSUES: self._clear_issue(issue)
-            self._first_refresh_done = True
-            disagree_count = sum(1 for r in list(self._recent)[:10] if r.get("decision_differs", False))
-            return CoordinatorData(mode=mode, current=current, adjustment=adjustment, decision=f"{mode.value} - {reason}", reason=reason, solar_available=home.have_solar and home.generation > 0.0, auto_mode=self._auto_mode, dry_run=is_monitor, timer_finishes_at=timer, last_evaluated=now, last_changed=self._last_changed, smoothing_disagrees=disagree_count)
-
-    async def _maybe_notify(self, previous: HomeOutput, current: HomeOutput, adjustment: HomeOutput) -> None:
+        """Single flight: one evaluation runs and one waits; a caller arriving while one waits joins it and adds its trigger."""
+        if (queued := self._queued) is not None:
+            self.coalesced += 1
+            if trigger not in queued[1]: queued[1].append(trigger)
+            return await asyncio.shield(queued[0])
+        future: asyncio.Future[CoordinatorData] = self.hass.loop.create_future(); self._queued = queued = (future, [trigger])
+        try:
+            async with self._lock:
+                self._queued = None
+                try: future.set_result(await self._evaluate_once(queued[1]))
+                except Exception as err: future.set_exception(err)  # noqa: BLE001
+        finally:
+            if self._queued is queued: self._queued = None
+            if not future.done(): future.cancel()
+        return await future
+
+    async def _evaluate_once(self, triggers: list[str]) -> CoordinatorData:
+        started, now_dt = perf_counter_ns(), dt_util.utcnow(); now = now_dt.isoformat(); self._fallback_inputs = {}; self._clear_issue(c.ISSUE_ENTITY_UNAVAILABLE); home, evaluated_timer = self._build_home_input(); timer_before = self._aircon_timer_finishes_at; home = self._time_weighted(home, now_dt.timestamp()); current = current_state(home); params = self.parameters; target = _evaluate_target_mode(params, home); decision_home = replace(home, generation=self._smoothed_generation(home.generation))
+        if (stats := self._engine_stats) is not None: stats.count_target(target)
+        if not self._initialized: self._initialized = True; self._sync_on_startup(current, home)
+        elif self._session.last is None: self._session.last = current
+        stamp = now_dt.timestamp(); self._session.reactivate_delay, self._session.tolerated = self._deadlines.counters(stamp); fingerprint = (home, decision_home.generation, self._grid_window.mean_with(home.grid_usage), self._session.snapshot(), self.parameters_version, self.control_mode, tuple(self._fallback_inputs.items()), evaluated_timer)
+        result = self._rules().adjust(decision_home, self._session); self._deadlines = self._deadlines.advance(self._session, stamp, *delay_seconds(self.config_entry.options)); self._schedule_deadline(); adjustment, reason = result.output, result.reason; submitted = self._actuation.submitted; self._execute_adjustment(adjustment); timer = self._active_aircon_timer() if adjustment is HomeOutput.TIMER else evaluated_timer
+        previous, failed = self._session.last, self._session.failed_to_change; applied = apply_adjustment(self._session, current, adjustment); is_monitor = self.control_mode is c.ControlMode.MONITOR
+        if is_monitor: self._session.failed_to_change, applied = 0, True
+        elif self._session.failed_to_change > failed: self._session.failed_to_change = failed; applied = failed < ALLOWED_FAILURES  # a repeated decision is not a failure; confirmations count those
+        if not applied: raise HomeAssistantError("failed to apply adjustment")
+        if previous is not None and previous != self._session.last:
+            self._last_changed = now
+            if self._actuation.submitted == submitted: await self._maybe_notify(previous, self._session.last or current)  # a climate command notifies once its outcome is known
+        mode = self._session.last or current; last = self._recent[0] if self._recent and self._recent[0] is self._last_record else None
+        repeat = last is not None and fingerprint == self._fingerprint and adjustment is HomeOutput.NO_CHANGE and previous == self._session.last and timer_before == self._aircon_timer_finishes_at and (last["adjustment"], last["reason"]) == (adjustment.code, reason.code); self._fingerprint = fingerprint
+        if repeat and last is not None: last.count_repeat(now); self._repeat_total += 1; self._repeats_unsaved = True; self._generation_window.push(home.generation); self._grid_window.push(home.grid_usage)
+        else:
+            fields = {"time": now, "trigger": triggers[0], "current": current.code, "adjustment": adjustment.code, "mode": mode.code, "reason": reason.code, "dry_run": is_monitor, "control_mode": self.control_mode.value, "target_adjustment": target.output.code if target.output is not None else None, "target_reason": target.reason.code, "target_actionable": target.is_actionable, "blocked_reasons": [target.reason.code] if target.output is None and target.is_actionable else [], "fallback_inputs": dict(self._fallback_inputs), "controls_snapshot": {"control_mode": self.control_mode.value, "cooling_enabled": self.cooling_enabled, "dry_mode_enabled": self.dry_mode_enabled}, "policy_snapshot": {"dry_mode_humidity_cutoff": params.dry_mode_humidity_cutoff}} | {k: getattr(home, k) for k in _HOME_RECORD_FIELDS} | {k: getattr(self._session, k) for k in _SESSION_RECORD_FIELDS}
+            if len(triggers) > 1: fields["triggers"] = list(triggers)
+            fields.update(self._run_shadow_smoothed(home, fields)); record = EvaluationRecord(fields)
+            self._last_record = record; self._recent.appendleft(record); self._generation_window.push(home.generation); self._grid_window.push(home.grid_usage); await self._journal_append(fields); await self._save_state(flush=previous != self._session.last or timer_before != self._aircon_timer_finishes_at); self.hass.bus.async_fire(c.EVENT_EVALUATION, display_record(record))
+        for issue in _CLEAR_ISSUES: self._clear_issue(issue)
+        self._first_refresh_done = True
+        disagree_count = sum(1 for r in islice(self._recent, 10) if r.get("decision_differs", False)); oscillating = self.oscillation.observe(stamp, mode.code)
+        if self._edge_triggered: settled = self._input_class(replace(home, timer=timer is not None, auto=self._auto_mode)); self._edge_class = (self.parameters_version, settled) if self._rules().input_class(decision_home, previous) == settled else None  # None while smoothing still moves the class
+        interval = self._adaptive_interval(decision_home, mode, params); self.update_interval = timedelta(seconds=interval); self._solar_watch = self._input_debouncer is None and interval > self._base_interval  # poll-only: solar arriving ends a long interval early
+        if stats is not None: stats.evaluate_ns += perf_counter_ns() - started
+        return CoordinatorData(mode=mode, current=current, adjustment=adjustment, reason=reason, solar_available=home.have_solar and home.generation > 0.0, auto_mode=self._auto_mode, dry_run=is_monitor, timer_finishes_at=timer, last_evaluated=now, last_changed=self._last_changed, smoothing_disagrees=disagree_count, oscillating=oscillating, effective_interval=interval)
+
+    def _adaptive_interval(self, home: HomeInput, mode: HomeOutput, params: RuleParameters) -> int:
+        """Seconds to the next poll: the minimum while running or near a threshold; the maximum with no solar and the aircon off."""
+        o = self.config_entry.options; low, high = int(o.get(c.CONF_MIN_EVAL_INTERVAL, c.DEFAULT_MIN_EVAL_INTERVAL)), int(o.get(c.CONF_MAX_EVAL_INTERVAL, c.DEFAULT_MAX_EVAL_INTERVAL))
+        near = any(abs(home.generation - t) <= c.NEAR_THRESHOLD_FRACTION * t for t in (params.generation_cool_threshold, params.generation_dry_threshold, params.generation_boost_threshold))
+        if mode in _RUNNING or near: seconds = low
+        elif not home.have_solar or home.generation <= 0: seconds = high
+        else: seconds = self._base_interval
+        return min(high, max(low, seconds))
+
+    async def _maybe_notify(self, previous: HomeOutput, new: HomeOutput, error: str | None = None) -> None:
+        """Tell the notification service about a switch from `previous` to `new`, or that it failed with `error`."""
         service = str(self.config_entry.options.get(c.CONF_NOTIFICATION_SERVICE, "")).strip()
         if not service: self._clear_issue(c.ISSUE_NOTIFICATION_SERVICE); return
         domain, name = service.split(".", 1) if "." in service else ("notify", service)
         if not self.hass.services.has_service(domain, name): self._create_issue(c.ISSUE_NOTIFICATION_SERVICE, {"service": service}); return
         self._clear_issue(c.ISSUE_NOTIFICATION_SERVICE)
         _emoji = {"Cool": "❄️", "Dry": "💧", "Off": "⏹", "Timer": "⏱", "Disabled": "⏸", "Reset": "🔄"}
-        new = (self._session.last or current).value; icon = _emoji.get(new, "")
-        try: await self.hass.services.async_call(domain, name, {"title": f"{icon} Aircon → {new}", "message": f"Switched from {previous.value} to {new}"}, blocking=False)
+        data = {"title": f"{_emoji.get(new.value, '')} Aircon → {new.value}", "message": f"Switched from {previous.value} to {new.value}"} if error is None else {"title": f"⚠️ Aircon → {new.value} failed", "message": f"Could not switch from {previous.value} to {new.value}: {error}"}
+        try: await self.hass.services.async_call(domain, name, data, blocking=False)
         except ServiceValidationError: self._create_issue(c.ISSUE_NOTIFICATION_SERVICE, {"service": service})
 
+    @property
+    def _smoothing_window(self) -> int: return max(1, int(self.config_entry.options.get(c.CONF_SMOOTHING_WINDOW, c.DEFAULT_SMOOTHING_WINDOW)))
+
+    @property
+    def smoothing(self) -> dict[str, Any]:
+        """Rolling generation and grid windows (samples of past evaluations), plus the open time-weighted interval."""
+        windows = {"generation": self._generation_window.as_dict(), "grid_usage": self._grid_window.as_dict()}
+        if (interval := self._interval_power) is None: return windows
+        return windows | {"interval": {"generation": interval[0].as_dict(), "grid_usage": interval[1].as_dict()}}
+
+    def _time_weighted(self, home: HomeInput, now: float) -> HomeInput:
+        """`home` with generation and grid replaced by their time-weighted means since the previous evaluation."""
+        if (interval := self._interval_power) is None: return home
+        generation, grid_usage = (average.close(now, value) for average, value in zip(interval, (home.generation, home.grid_usage), strict=True))
+        return replace(home, generation=generation, grid_usage=grid_usage) if home.have_solar else home
+
     def _smoothed_generation(self, raw_gen: float) -> float:
-        window = max(1, int(self.config_entry.options.get(c.CONF_SMOOTHING_WINDOW, c.DEFAULT_SMOOTHING_WINDOW)))
-        if window <= 1 or not self._recent: return raw_gen
-        vals: list[float] = [r.get("raw_generation", r.get("generation", 0.0)) for r in list(self._recent)[:window - 1]] + [raw_gen]
-        return sum(vals) / len(vals)
+        window = self._smoothing_window; self._generation_window.resize(window); self._grid_window.resize(window)
+        return self._generation_window.mean_with(raw_gen)
 
     def _run_shadow_smoothed(self, home: HomeInput, record: dict[str, Any]) -> dict[str, Any]:
-        window = max(1, int(self.config_entry.options.get(c.CONF_SMOOTHING_WINDOW, c.DEFAULT_SMOOTHING_WINDOW)))
-        raw_gen, raw_grid = home.generation, home.grid_usage
-        if window > 1 and self._recent:
-            prev = list(self._recent)[:window - 1]
-            gen_vals = [r.get("raw_generation", r.get("generation", 0.0)) for r in prev] + [raw_gen]
-            grid_vals = [r.get("raw_grid_usage", r.get("grid_usage", 0.0)) for r in prev] + [raw_grid]
-            smoothed_gen = sum(gen_vals) / len(gen_vals); smoothed_grid = sum(grid_vals) / len(grid_vals)
-        else:
-            smoothed_gen, smoothed_grid = raw_gen, raw_grid
-        shadow_session = CachedState(reactivate_delay=self._session.reactivate_delay, tolerated=self._session.tolerated, last=self._session.last, failed_to_change=self._session.failed_to_change)
-        shadow_result = adjust(self.parameters, home, shadow_session)
-        differs = shadow_result.output.value != record["adjustment"]
-        return {"raw_generation": raw_gen, "raw_grid_usage": raw_grid, "smoothed_generation": round(smoothed_gen, 1), "smoothed_grid_usage": round(smoothed_grid, 1), "smoothed_adjustment": shadow_result.output.value, "smoothed_reason": shadow_result.reason, "decision_differs": differs}
+        raw_gen, raw_grid = home.generation, home.grid_usage; smoothed_gen, smoothed_grid = self._generation_window.mean_with(raw_gen), self._grid_window.mean_with(raw_grid)
+        shadow_result = self._rules().transition(home, self._session.snapshot()).result
+        differs = shadow_result.output.code != record["adjustment"]
+        return {"raw_generation": raw_gen, "raw_grid_usage": raw_grid, "smoothed_generation": round(smoothed_gen, 1), "smoothed_grid_usage": round(smoothed_grid, 1), "smoothed_adjustment": shadow_result.output.code, "smoothed_reason": shadow_result.reason.code, "decision_differs": differs}
 
     def _entity_id(self, key: str, *, optional: bool = False) -> str | None:
         value = str(self.config_entry.options.get(key, self.config_entry.data.get(key, ""))).strip()
         return (value or None) if optional else value or str(self.config_entry.data[key])
 
-    def _state(self, conf_key: str, label: str, *, allow_unavailable: bool = False) -> State: return self._get_state(str(self._entity_id(conf_key)), label, allow_unavailable=allow_unavailable)
+    def _state(self, conf_key: str, label: str, *, allow_unavailable: bool = False, probe: bool = False) -> State: return self._get_state(str(self._entity_id(conf_key)), label, allow_unavailable=allow_unavailable, probe=probe)
 
-    def _build_home_input(self) -> tuple[HomeInput, datetime | None]:
-        timer = self._active_aircon_timer(); climate = self._state(c.CONF_CLIMATE_ENTITY_ID, "climate")
-        inv_id = self._entity_id(c.CONF_INVERTER_ENTITY_ID, optional=True); inv = self._get_state(inv_id, "inverter", allow_unavailable=True) if inv_id else None
-        gen = self._state(c.CONF_GENERATION_ENTITY_ID, "generation", allow_unavailable=True); grid = self._state(c.CONF_GRID_ENTITY_ID, "grid", allow_unavailable=True); temp = self._state(c.CONF_TEMPERATURE_ENTITY_ID, "temperature", allow_unavailable=True); hum = self._state(c.CONF_HUMIDITY_ENTITY_ID, "humidity", allow_unavailable=True)
+    def _build_home_input(self, *, probe: bool = False) -> tuple[HomeInput, datetime | None]:
+        """The raw inputs and the running aircon timer; a `probe` only reads (no issues, fallback records or timer expiry) and raises ValueError instead."""
+        timer = self._active_aircon_timer() if not probe else (finishes if (finishes := self._aircon_timer_finishes_at) and finishes > dt_util.utcnow() else None); climate = self._state(c.CONF_CLIMATE_ENTITY_ID, "climate", probe=probe)
+        inv_id = self._entity_id(c.CONF_INVERTER_ENTITY_ID, optional=True); inv = self._get_state(inv_id, "inverter", allow_unavailable=True, probe=probe) if inv_id else None
+        gen = self._state(c.CONF_GENERATION_ENTITY_ID, "generation", allow_unavailable=True, probe=probe); grid = self._state(c.CONF_GRID_ENTITY_ID, "grid", allow_unavailable=True, probe=probe); temp = self._state(c.CONF_TEMPERATURE_ENTITY_ID, "temperature", allow_unavailable=True, probe=probe); hum = self._state(c.CONF_HUMIDITY_ENTITY_ID, "humidity", allow_unavailable=True, probe=probe)
         have_solar = str(inv.state).lower().strip().replace("-", "").replace("_", "").replace(" ", "") in {"on", "true", "1", "online"} if inv else not inv_id
         mode = AirconMode.UNKNOWN
         with suppress(ValueError): mode = AirconMode(str(climate.state).lower().strip())
         aggressive = self.control_mode is c.ControlMode.BOOST_COOLING; enabled = self.control_mode is not c.ControlMode.DISABLED
-        generation = self._normalized_power(gen, "generation") if have_solar else 0.0; grid_usage = self._normalized_power(grid, "grid") if have_solar else 0.0
-        return HomeInput(mode, have_solar, generation, grid_usage, timer is not None, self._normalized_temperature(temp), self._state_to_float(hum, "humidity"), self._auto_mode, aggressive, enabled, self.cooling_enabled), timer
+        generation = self._normalized_power(gen, "generation", probe=probe) if have_solar else 0.0; grid_usage = self._normalized_power(grid, "grid", probe=probe) if have_solar else 0.0  # not even read without solar
+        return normalized_input(HomeInput(mode, have_solar, generation, grid_usage, timer is not None, self._normalized_temperature(temp), self._state_to_float(hum, "humidity"), self._auto_mode, aggressive, enabled, self.cooling_enabled)), timer
 
     def _sync_on_startup(self, current: HomeOutput, home: HomeInput) -> None:
         if self._session.last is None: self._session.last = current
         elif home.timer and self._session.last is HomeOutput.TIMER: return
         elif self._session.last != current: c.LOGGER.info("Startup sync: restoring from %s to live state %s", self._session.last.value, current.value); self._session.last = current
 
-    async def _call_service(self, domain: str, service: str, data: dict[str, Any]) -> None:
-        try: await self.hass.services.async_call(domain, service, data, blocking=True)
-        except ServiceValidationError as err: raise HomeAssistantError(f"service call failed: {err}") from err
+    async def _call_service(self, call: Call) -> None: await self.hass.services.async_call(call.domain, call.service, dict(call.data), blocking=True)
 
-    async def _execute_adjustment(self, adjustment: HomeOutput) -> None:
+    def _execute_adjustment(self, adjustment: HomeOutput) -> None:
+        """Queue the climate commands for `adjustment` (planned when they start, see _plan_climate) and track the timer and auto mode."""
         if adjustment in (HomeOutput.NO_CHANGE, HomeOutput.RESET, HomeOutput.DISABLED): return
         if self.control_mode is c.ControlMode.MONITOR: c.LOGGER.info("MONITOR: would apply adjustment %s", adjustment.value)
         else:
             climate = str(self._entity_id(c.CONF_CLIMATE_ENTITY_ID))
-            if adjustment in (HomeOutput.COOL, HomeOutput.DRY):
-                for service, data in (("set_hvac_mode", {"entity_id": climate, "hvac_mode": adjustment.value.lower()}), ("set_temperature", {"entity_id": climate, "temperature": self.parameters.temperature_cool})): await self._call_service("climate", service, data)
-            elif adjustment is HomeOutput.OFF: await self._call_service("climate", "turn_off", {"entity_id": climate})
+            if adjustment in (HomeOutput.COOL, HomeOutput.DRY, HomeOutput.OFF):
+                hvac_mode, setpoint = (adjustment.value.lower(), self.parameters.temperature_cool) if adjustment is not HomeOutput.OFF else ("off", None)
+                plan = self._actuation.submitted + 1; self._expect(plan, adjustment, climate, hvac_mode, setpoint); self._actuation.submit(adjustment.value, partial(self._plan_climate, plan, climate, hvac_mode, setpoint))  # expect first: the plan may start and end within submit()
         if adjustment is HomeOutput.TIMER and self.control_mode is not c.ControlMode.MONITOR:
             self._aircon_timer_finishes_at = dt_util.utcnow() + timedelta(minutes=max(1, int(self.config_entry.options.get(c.CONF_AIRCON_TIMER_DURATION, c.DEFAULT_AIRCON_TIMER_DURATION)))); self._schedule_timer_expiry()
         elif adjustment is HomeOutput.OFF:
@@ -195,17 +422,19 @@ class HomeRulesCoordinator(DataUpdateCoordinator[CoordinatorData]):
         if adjustment in (HomeOutput.COOL, HomeOutput.DRY): self._auto_mode = True
         elif adjustment is HomeOutput.OFF: self._auto_mode = False
 
-    def _get_state(self, entity_id: str, label: str, *, allow_unavailable: bool = False) -> State:
+    def _get_state(self, entity_id: str, label: str, *, allow_unavailable: bool = False, probe: bool = False) -> State:
         state = self.hass.states.get(entity_id)
         if state is None:
+            if probe: raise ValueError(f"missing entity: {entity_id}")
             if not allow_unavailable and not self._first_refresh_done: raise ConfigEntryNotReady(f"Required entity not yet available: {entity_id}")
             self._create_issue(c.ISSUE_ENTITY_MISSING, {"entity_id": entity_id, "label": label}); raise ValueError(f"missing entity: {entity_id}")
         raw = str(state.state).lower()
         if raw not in {"unknown", "unavailable"}: return state
         if not allow_unavailable:
+            if probe: raise ValueError(f"entity unavailable: {entity_id}")
             if not self._first_refresh_done: raise ConfigEntryNotReady(f"Required entity not yet available: {entity_id}")
             self._create_issue(c.ISSUE_ENTITY_UNAVAILABLE, {"entity_id": entity_id, "label": label}); raise ValueError(f"entity unavailable: {entity_id}")
-        self._fallback_inputs[label] = raw
+        if not probe: self._fallback_inputs[label] = raw
         if label in self._FALLBACK_DEFAULTS: return State(entity_id, self._FALLBACK_DEFAULTS[label], state.attributes)
         if label == "temperature": return State(entity_id, str(self.parameters.temperature_threshold - 0.1), state.attributes)
         if label == "humidity": return State(entity_id, str(c.DRY_MODE_HUMIDITY_CUTOFF - 1.0), state.attributes)
@@ -235,11 +464,26 @@ class HomeRulesCoordinator(DataUpdateCoordinator[CoordinatorData]):
         self._timer_expiry_handle = None
         self.hass.async_create_task(self.async_run_evaluation("timer_expired"))
 
-    def _normalized_power(self, state: State, label: str) -> float:
+    def _cancel_deadline(self) -> None:
+        if self._deadline_handle is None: return
+        self._deadline_handle.cancel(); self._deadline_handle = None
+
+    def _schedule_deadline(self) -> None:
+        """One wake-up at the earliest session deadline (tolerance expiry or reactivation allowed)."""
+        self._cancel_deadline()
+        if (at := self._deadlines.next) is None: return
+        self._deadline_handle = self.hass.loop.call_later(max(0.0, at - dt_util.utcnow().timestamp()), self._async_handle_deadline)
+
+    def _async_handle_deadline(self) -> None:
+        self._deadline_handle = None
+        self.hass.async_create_task(self._async_try_evaluation("deadline"))
+
+    def _normalized_power(self, state: State, label: str, *, probe: bool = False) -> float:
         value = self._state_to_float(state, label); unit = c.normalize_power_unit(str(state.attributes.get(ATTR_UNIT_OF_MEASUREMENT, "")))
-        try: return max(0.0, PowerConverter.convert(value, UnitOfPower(unit), UnitOfPower.WATT))
+        try: return clean_power(PowerConverter.convert(value, UnitOfPower(unit), UnitOfPower.WATT))
         except ValueError:
-            self._create_issue(c.ISSUE_INVALID_UNIT, {"entity_id": state.entity_id, "unit": unit or "(none)"}); raise ValueError(f"unsupported power unit for {state.entity_id}: {unit}") from None
+            if not probe: self._create_issue(c.ISSUE_INVALID_UNIT, {"entity_id": state.entity_id, "unit": unit or "(none)"})
+            raise ValueError(f"unsupported power unit for {state.entity_id}: {unit}") from None
 
     def _normalized_temperature(self, state: State) -> float:
         value = self._state_to_float(state, "temperature"); unit = str(state.attributes.get(ATTR_UNIT_OF_MEASUREMENT, "")).strip().upper()
@@ -247,9 +491,125 @@ class HomeRulesCoordinator(DataUpdateCoordinator[CoordinatorData]):
         if unit in {"°F", "F"}: return TemperatureConverter.convert(value, UnitOfTemperature.FAHRENHEIT, UnitOfTemperature.CELSIUS)
         raise ValueError(f"unsupported temperature unit: {unit}")
 
-    async def _save_state(self) -> None:
-        session = asdict(self._session); session["last"] = self._session.last.value if self._session.last else None
-        await self._store.async_save({"controls": {"mode": self.control_mode.value, "cooling_enabled": self.cooling_enabled, c.CONF_DRY_MODE_ENABLED: self.dry_mode_enabled}, "session": session, "auto_mode": self._auto_mode, "last_changed": self._last_changed, "recent_evaluations": list(self._recent), "aircon_timer_finishes_at": self._aircon_timer_finishes_at and self._aircon_timer_finishes_at.isoformat(), "parameters": dict(self._parameters)})
+    async def _save_state(self, *, flush: bool = False) -> None:
+        """Write now when `flush` (state a restart must not lose) or without a save delay; otherwise within the save delay."""
+        if flush or self._save_delay <= 0: await self._store.async_save(self._storage_data())
+        elif not self._save_pending: self._save_pending = True; self._store.async_delay_save(self._storage_data, self._save_delay)
+
+    async def _journal_append(self, record: dict[str, Any]) -> None:
+        self._count_write(await self.hass.async_add_executor_job(self._journal.append, record), journal=True)
+        if self._journal.needs_compaction and (self._compaction is None or self._compaction.done()): self._compaction = self.config_entry.async_create_background_task(self.hass, self._async_compact_journal(), f"{c.DOMAIN} journal compaction")
+
+    async def _async_compact_journal(self) -> None: self._count_write(await self.hass.async_add_executor_job(self._journal.compact), journal=True)
+
+    def _count_write(self, size: int | None, *, journal: bool = False) -> None:
+        """Count a write of `size` bytes; None for a Store write, which _size_store_writes() sizes later."""
+        if size == 0: return
+        day = dt_util.now().date().isoformat()
+        if not self._writes or self._writes[-1][0] != day: self._size_store_writes(); self._writes.append([day, 0, 0, 0, 0])
+        counts = self._writes[-1]; counts[1 + 2 * journal] += 1; counts[2 + 2 * journal] += size or 0; self._unsized += size is None
+
+    def _size_store_writes(self) -> None:
+        """Add the bytes of the Store writes not yet sized, estimated from the last payload as the Store serializes it."""
+        if self._unsized and self._stored is not None: self._writes[-1][2] += self._unsized * len(prepare_save_json(self._stored)[1])
+        self._unsized = 0
+
+    def _plan_climate(self, plan: int, climate: str, hvac_mode: str, setpoint: float | None) -> Plan:
+        """The calls still needed once earlier commands are done; a mode the entity does not advertise is refused (ValueError).
+
+        Runs as plan number `plan` starts, so its apply latency is measured from here rather than from the decision.
+        """
+        if (expected := self._expected) is not None and expected[0] == plan: self._expected = (*expected[:5], monotonic())
+        state = self.hass.states.get(climate)
+        if climate not in self._hvac_modes and state is not None and (advertised := state.attributes.get("hvac_modes")): self._hvac_modes[climate] = frozenset(map(str, advertised))
+        try: calls, skipped = plan_climate(climate, hvac_mode, setpoint, state.state if state else None, state.attributes if state else {}, self._hvac_modes.get(climate))
+        except ValueError: self._count_calls(refused=1); raise
+        self._count_calls(sum(map(len, calls)), skipped); return calls
+
+    def _count_calls(self, sent: int = 0, skipped: int = 0, refused: int = 0) -> None:
+        day = dt_util.now().date().isoformat()
+        if not self._commands or self._commands[-1][0] != day: self._commands.append([day, 0, 0, 0])
+        counts = self._commands[-1]; counts[1] += sent; counts[2] += skipped; counts[3] += refused
+
+    @callback
+    def _actuation_done(self, outcome: Outcome) -> None:
+        """A plan that gave up counts as a failed change at once; one that returned has CONFIRMATION_TIMEOUT to show in the climate state.
+
+        Only the plan the coordinator still awaits counts: a newer decision has replaced what an older plan was sent to do.
+        """
+        self.actuations.appendleft(outcome.as_dict()); expected = self._expected is not None and self._expected[0] == outcome.plan
+        if outcome.superseded: return
+        if outcome.ok:
+            if expected and not self._confirm_reported(self.hass.states.get(str(self._entity_id(c.CONF_CLIMATE_ENTITY_ID)))) and self._confirm_handle is None: self._confirm_handle = self.hass.loop.call_later(c.CONFIRMATION_TIMEOUT, self._async_confirmation_timed_out)
+            return
+        c.LOGGER.warning("Applying %s failed after %d attempt(s): %s", outcome.label, outcome.attempts, outcome.error)
+        if expected: self._action_failed(f"failed to apply {outcome.label}: {outcome.error}")
+
+    def _action_failed(self, error: str) -> None:
+        """The awaited command failed: count it, raise a repairs issue and follow up a switch with a failure notification."""
+        if (expected := self._expected) is not None and expected[4] not in (None, expected[1]): self._notify_later(expected[4], expected[1], error)
+        self._stop_confirming(); self._session.failed_to_change += 1; self._create_issue(c.ISSUE_RUNTIME, {"error": error}); self.config_entry.async_create_task(self.hass, self._save_state(), f"{c.DOMAIN} save after failed actuation")
+
+    def _notify_later(self, previous: HomeOutput, new: HomeOutput, error: str | None = None) -> None: self.config_entry.async_create_task(self.hass, self._maybe_notify(previous, new, error), f"{c.DOMAIN} notification")
+
+    def _expect(self, plan: int, adjustment: HomeOutput, climate: str, hvac_mode: str, setpoint: float | None) -> None:
+        """Watch `climate` until it reports `hvac_mode` (and `setpoint`) for plan number `plan`; replaces the confirmation of an earlier command.
+
+        Called before the decision is applied to the session, so the last output recorded there is what a switch notification switches from.
+        """
+        self._stop_confirming(); self._expected = (plan, adjustment, hvac_mode, setpoint, self._session.last, monotonic())
+        self._confirm_unsub = async_track_state_change_event(self.hass, [climate], self._async_climate_changed)
+
+    def _stop_confirming(self) -> None:
+        self._expected = None
+        if self._confirm_unsub is not None: self._confirm_unsub(); self._confirm_unsub = None
+        if self._confirm_handle is not None: self._confirm_handle.cancel(); self._confirm_handle = None
+
+    @callback
+    def _async_climate_changed(self, event: Event[EventStateChangedData]) -> None: self._confirm_reported(event.data["new_state"])
+
+    def _confirm_reported(self, state: State | None) -> bool:
+        """Confirm the awaited command if `state` shows it; a plan with nothing to send is confirmed as it returns."""
+        if (expected := self._expected) is None or state is None or state.state != expected[2]: return False
+        if expected[3] is not None and not setpoint_matches(state.attributes.get("temperature"), expected[3], setpoint_step(state.attributes)): return False
+        self.apply_latency.add(monotonic() - expected[5]); self.confirmed += 1; self._session.failed_to_change = 0; self._stop_confirming()
+        if expected[4] not in (None, expected[1]): self._notify_later(expected[4], expected[1])
+        return True
+
+    @callback
+    def _async_confirmation_timed_out(self) -> None:
+        self._confirm_handle = None
+        if (expected := self._expected) is None: return
+        state = self.hass.states.get(str(self._entity_id(c.CONF_CLIMATE_ENTITY_ID))); self.unconfirmed += 1
+        c.LOGGER.warning("%s was not confirmed within %s s", expected[1].value, c.CONFIRMATION_TIMEOUT); self._action_failed(f"{expected[1].value} not confirmed: climate reports {state.state if state else 'nothing'}")
+
+    @property
+    def actuation(self) -> dict[str, Any]:
+        """Actuation queue settings and counters, confirmations with their apply-latency histogram, calls sent and skipped per local day, cached hvac modes and the latest plan outcomes."""
+        return self._actuation.as_dict() | {"confirmed": self.confirmed, "unconfirmed": self.unconfirmed, "awaiting_confirmation": self._expected[1].value if self._expected else None, "apply_latency": self.apply_latency.as_dict(), "commands": [dict(zip(("day", "sent", "skipped", "refused"), counts, strict=True)) for counts in self._commands], "hvac_modes": {k: sorted(v) for k, v in self._hvac_modes.items()}, "recent": list(self.actuations)}
+
+    @property
+    def evaluations(self) -> dict[str, Any]:
+        """Whether an evaluation is running, the triggers of the one waiting, and how many callers joined a waiting evaluation."""
+        return {"running": self._lock.locked(), "queued": list(self._queued[1]) if self._queued is not None else None, "coalesced": self.coalesced}
+
+    @property
+    def repeats(self) -> dict[str, Any]:
+        """Evaluations folded into the previous record since startup, and the repeat count of the newest record."""
+        return {"total": self._repeat_total, "newest_record": self._recent[0].get("repeats", 0) if self._recent else 0}
+
+    @property
+    def persistence(self) -> dict[str, Any]:
+        """Save delay, whether a write is pending, Store and journal writes and bytes per local day, and the journal segment."""
+        self._size_store_writes()
+        return {"save_delay_seconds": self._save_delay, "pending": self._save_pending, "days": [dict(zip(("day", "store_writes", "store_bytes", "journal_writes", "journal_bytes"), counts, strict=True)) for counts in self._writes], "journal": self._journal.as_dict()}
+
+    def _storage_data(self) -> dict[str, Any]:
+        """The stored state; called when the Store writes, which is also where writes are counted."""
+        session = asdict(self._session); session["last"] = self._session.last.code if self._session.last else None; session["deadlines"] = asdict(self._deadlines)
+        data = {"controls": {"mode": self.control_mode.value, "cooling_enabled": self.cooling_enabled, c.CONF_DRY_MODE_ENABLED: self.dry_mode_enabled}, "session": session, "auto_mode": self._auto_mode, "last_changed": self._last_changed, "aircon_timer_finishes_at": self._aircon_timer_finishes_at and self._aircon_timer_finishes_at.isoformat(), "parameters": dict(self._parameters), "smoothing": {"generation": list(self._generation_window), "grid_usage": list(self._grid_window)}, "repeats": {r["time"]: [r["repeats"], r["repeated_until"]] for r in self._recent if "repeats" in r}}
+        self._save_pending = self._repeats_unsaved = False; self._stored = data; self._count_write(None)
+        return data
 
     def _create_issue(self, issue: str, placeholders: dict[str, str]) -> None:
         ir.async_create_issue(self.hass, c.DOMAIN, f"{self.config_entry.entry_id}_{issue}", is_fixable=False, is_persistent=False, severity=ir.IssueSeverity.ERROR, translation_key=issue, translation_placeholders=placeholders)
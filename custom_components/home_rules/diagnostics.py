@@ -5,6 +5,7 @@ from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant
 
 from . import const as c
+from .coordinator import display_record
 
 
 async def async_get_config_entry_diagnostics(hass: HomeAssistant, entry: ConfigEntry) -> dict[str, Any]:
@@ -23,6 +24,14 @@ async def async_get_config_entry_diagnostics(hass: HomeAssistant, entry: ConfigE
         "policy": {
             "dry_mode_humidity_cutoff": c.DRY_MODE_HUMIDITY_CUTOFF,
         },
-        "session": dict(coordinator._last_record),
-        "recent_evaluations": list(coordinator._recent),
+        "session": display_record(coordinator._last_record),
+        "recent_evaluations": [display_record(r) for r in coordinator._recent],
+        "engine_stats": coordinator.engine_stats,
+        "oscillation": coordinator.oscillation.as_dict(),
+        "event_driven": coordinator.event_driven,
+        "smoothing": coordinator.smoothing,
+        "persistence": coordinator.persistence,
+        "repeats": coordinator.repeats,
+        "actuation": coordinator.actuation,
+        "evaluations": coordinator.evaluations,
     }
@@ -5,7 +5,11 @@ from dataclasses import dataclass
 from datetime import datetime
 from typing import Any
 
-from homeassistant.components.binary_sensor import BinarySensorEntity, BinarySensorEntityDescription
+from homeassistant.components.binary_sensor import (
+    BinarySensorDeviceClass,
+    BinarySensorEntity,
+    BinarySensorEntityDescription,
+)
 from homeassistant.components.button import ButtonEntity
 from homeassistant.components.number import NumberEntity, NumberEntityDescription, NumberMode
 from homeassistant.components.select import SelectEntity
@@ -19,7 +23,7 @@ from homeassistant.helpers.update_coordinator import CoordinatorEntity
 from homeassistant.util import dt as dt_util
 
 from . import const as c
-from .coordinator import HomeRulesConfigEntry, HomeRulesCoordinator
+from .coordinator import HomeRulesConfigEntry, HomeRulesCoordinator, display_record
 
 _DIAG, _CONF, _TS, _DUR = EntityCategory.DIAGNOSTIC, EntityCategory.CONFIG, SensorDeviceClass.TIMESTAMP, SensorDeviceClass.DURATION
 type Entry = HomeRulesConfigEntry
@@ -37,10 +41,12 @@ SENSORS = (
     _sensor("last_evaluated", device_class=_TS, entity_category=_DIAG),
     _sensor("last_changed", device_class=_TS, entity_category=_DIAG),
     _sensor("timer_finishes_at", device_class=_DUR, native_unit_of_measurement=UnitOfTime.SECONDS, entity_category=_DIAG),
+    _sensor("effective_interval", device_class=_DUR, native_unit_of_measurement=UnitOfTime.SECONDS, entity_category=_DIAG),
 )
 BINARY_SENSORS = (
     BinarySensorEntityDescription(key="solar_available", translation_key="solar_available", entity_category=_DIAG),
     BinarySensorEntityDescription(key="auto_mode", translation_key="auto_mode", entity_category=_DIAG),
+    BinarySensorEntityDescription(key="oscillating", translation_key="oscillating", device_class=BinarySensorDeviceClass.PROBLEM, entity_category=_DIAG),
 )
 
 
@@ -62,6 +68,7 @@ class HomeRulesSensor(HomeRulesEntity, SensorEntity):
         if key == "timer_finishes_at":
             if not isinstance(value, datetime): return 0
             return max(0, int((value - dt_util.utcnow()).total_seconds()))
+        if key == "effective_interval": return value if isinstance(value, int) else None
         if self.entity_description.device_class == _TS:
             return None if value is None else value if isinstance(value, datetime) else dt_util.parse_datetime(str(value))
         return str(value.value if hasattr(value, "value") else value)
@@ -69,7 +76,7 @@ class HomeRulesSensor(HomeRulesEntity, SensorEntity):
     @property
     def extra_state_attributes(self) -> dict[str, Any] | None:
         key = self.entity_description.key
-        if key == "decision": return {**dict(self.coordinator._last_record), "recent": list(self.coordinator._recent)[:10]}
+        if key == "decision": return {**display_record(self.coordinator._last_record), "recent": [display_record(r) for r in list(self.coordinator._recent)[:10]]}
         return None
 
 
@@ -80,6 +87,9 @@ class HomeRulesBinarySensor(HomeRulesEntity, BinarySensorEntity):
     @property
     def is_on(self) -> bool: return bool(getattr(self.coordinator.data, self.entity_description.key))
 
+    @property
+    def extra_state_attributes(self) -> dict[str, Any] | None: return self.coordinator.oscillation.as_dict() if self.entity_description.key == "oscillating" else None
+
 
 class HomeRulesModeSelect(HomeRulesEntity, SelectEntity):
     _attr_translation_key = "control_mode"
@@ -0,0 +1,244 @@
+"""Exhaustive exploration of the closed-loop decision state machine.
+
+No Home Assistant dependencies. With RuleParameters fixed, adjust() only sees
+which side of each threshold an input falls (see compiled.py), so a handful
+of representative inputs covers every input class. For each steady
+environment (generation, temperature and humidity class, flags, and whether
+running the aircon draws from the grid), explore() starts from every aircon
+mode and follows the loop the coordinator runs live: decide, track the
+adjustment, apply it to the aircon, and evaluate again after the poll
+interval or at the next session deadline, whichever comes first. The delays
+are minutes, as in the options. Each of those walks is deterministic, so it
+ends in a cycle; nodes already resolved are memoized and never walked twice.
+
+A cycle whose aircon mode changes is flapping under steady inputs. A cycle
+that holds some mode for less than MIN_DWELL seconds short-cycles the
+compressor, which the options flow rejects.
+
+Usage::
+
+    python scripts/explorer.py --grid-usage-delay 1 --interval 60
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+from collections.abc import Iterator, Sequence
+from dataclasses import dataclass, replace
+from itertools import product
+from typing import NamedTuple
+
+from .compiled import compile_rules
+from .replay import add_parameter_arguments, parameters_from_args, plant_mode
+from .rules import (
+    AirconMode,
+    Deadlines,
+    HomeInput,
+    HomeOutput,
+    RuleParameters,
+    SessionState,
+    current_state,
+    deadline_parameters,
+    track_adjustment,
+)
+
+MIN_DWELL = 180.0
+DEFAULT_INTERVAL = 60.0
+_MODES = (AirconMode.OFF, AirconMode.COOL, AirconMode.DRY)
+
+
+class Environment(NamedTuple):
+    """Steady inputs; `grid_when_running` is the grid draw class while the aircon runs (none while off)."""
+
+    generation: float
+    temperature: float
+    humidity: float
+    grid_when_running: bool
+    have_solar: bool
+    aggressive_cooling: bool
+    enabled: bool
+    cooling_enabled: bool
+
+
+class _Node(NamedTuple):
+    """Loop state at an evaluation; `deadlines` are relative to it."""
+
+    state: SessionState
+    mode: AirconMode
+    auto: bool
+    timer: bool
+    deadlines: Deadlines
+
+
+@dataclass(frozen=True, slots=True)
+class Cycle:
+    """Aircon modes around a cycle; seconds[k] is how long modes[k] held before the next evaluation."""
+
+    environment: Environment
+    modes: tuple[AirconMode, ...]
+    seconds: tuple[float, ...]
+
+    @property
+    def min_dwell(self) -> float:
+        """Shortest run of one mode around the cycle, in seconds."""
+        modes, seconds, n = self.modes, self.seconds, len(self.modes)
+        start = next(i for i in range(n) if modes[i] != modes[i - 1])
+        runs: list[float] = []
+        run = seconds[start]
+        for k in range(1, n + 1):
+            i = (start + k) % n
+            if modes[i] == modes[i - 1]:
+                run += seconds[i]
+            else:
+                runs.append(run)
+                run = seconds[i]
+        return min(runs)
+
+
+@dataclass(frozen=True, slots=True)
+class Exploration:
+    states: frozenset[SessionState]
+    nodes: int
+    flapping: tuple[Cycle, ...]
+    max_steps_to_stable: int
+
+    @property
+    def short_cycles(self) -> tuple[Cycle, ...]:
+        return tuple(c for c in self.flapping if c.min_dwell < MIN_DWELL)
+
+
+def _classes(low: float, high: float, delta: float) -> list[float]:
+    """Representatives for the classes split by `low` and `high` (strict and inclusive sides)."""
+    return sorted({low - delta, low, low + delta, high - delta, high, high + delta})
+
+
+def environments(config: RuleParameters) -> Iterator[Environment]:
+    """One Environment per input class that can change adjust()'s outcome."""
+    edges = sorted(
+        {config.generation_boost_threshold, config.generation_cool_threshold, config.generation_dry_threshold}
+    )
+    generations = [g for g in (edges[0] - 1, *edges) if g >= 0] or [0.0]
+    seen: set[tuple[bool, bool]] = set()
+    temperatures = []
+    for t in _classes(config.temperature_cool, config.temperature_threshold, 0.05):
+        key = (t > config.temperature_cool, t >= config.temperature_threshold)
+        if key not in seen:
+            seen.add(key)
+            temperatures.append(t)
+    humidities = (config.dry_mode_humidity_cutoff - 1, config.dry_mode_humidity_cutoff)
+    flags = product((False, True), repeat=5)
+    for (gen, temp, hum), (grid, solar, aggressive, enabled, cooling) in product(
+        product(generations, temperatures, humidities), list(flags)
+    ):
+        yield Environment(gen, temp, hum, grid, solar, aggressive, enabled, cooling)
+
+
+def explore(config: RuleParameters, interval: float = DEFAULT_INTERVAL) -> Exploration:
+    """Walk the closed loop from every aircon mode in every environment, polling every `interval` seconds."""
+    rules = compile_rules(deadline_parameters(config))
+    delays = (60.0 * config.grid_usage_delay, 60.0 * config.reactivate_delay)
+    states: set[SessionState] = set()
+    flapping: list[Cycle] = []
+    worst, nodes = 0, 0
+
+    for env in environments(config):
+
+        def home(node: _Node, env: Environment = env) -> HomeInput:
+            grid = 1.0 if env.grid_when_running and node.mode is not AirconMode.OFF else 0.0
+            return HomeInput(
+                node.mode,
+                env.have_solar,
+                env.generation,
+                grid,
+                node.timer,
+                env.temperature,
+                env.humidity,
+                node.auto,
+                env.aggressive_cooling,
+                env.enabled,
+                env.cooling_enabled,
+            )
+
+        # Evaluations until the aircon mode stops changing; None while on a flapping cycle.
+        settle: dict[_Node, int | None] = {}
+        # Seconds from each node's evaluation to the next one.
+        waits: dict[_Node, float] = {}
+        for mode, auto in product(_MODES, (False, True)):
+            start = _Node(SessionState(), mode, auto, False, Deadlines())
+            start = start._replace(state=SessionState(last=current_state(home(start))))
+            path: list[_Node] = []
+            on_path: dict[_Node, int] = {}
+            node = start
+            while node not in settle and node not in on_path:
+                on_path[node] = len(path)
+                path.append(node)
+                h = home(node)
+                reactivate_delay, tolerated = node.deadlines.counters(0.0)
+                state = replace(node.state, reactivate_delay=reactivate_delay, tolerated=tolerated)
+                result, state = rules.transition(h, state)
+                deadlines = node.deadlines.advance(state, 0.0, *delays)
+                _, state = track_adjustment(state, current_state(h), result.output)
+                pending = [t for t in (deadlines.tolerate_until, deadlines.reactivate_at) if t is not None and t > 0]
+                waits[node] = wait = min([interval, *pending])
+                out = result.output
+                node = _Node(
+                    state,
+                    plant_mode(out, node.mode),
+                    True if out in (HomeOutput.COOL, HomeOutput.DRY) else False if out is HomeOutput.OFF else node.auto,
+                    True if out is HomeOutput.TIMER else False if out is HomeOutput.OFF else node.timer,
+                    _shifted(deadlines, wait),
+                )
+            if node in on_path:
+                cycle = path[on_path[node] :]
+                modes = tuple(n.mode for n in cycle)
+                stable = len(set(modes)) == 1
+                if not stable:
+                    flapping.append(Cycle(env, modes, tuple(waits[cycle[k - 1]] for k in range(len(cycle)))))
+                for n in cycle:
+                    settle[n] = 0 if stable else None
+                path = path[: on_path[node]]
+            nxt = node
+            for n in reversed(path):
+                after = settle[nxt]
+                settle[n] = None if after is None else 0 if after == 0 and n.mode == nxt.mode else after + 1
+                nxt = n
+            if (steps := settle[start]) is not None:
+                worst = max(worst, steps)
+        nodes += len(settle)
+        states.update(n.state for n in settle)
+
+    return Exploration(frozenset(states), nodes, tuple(flapping), worst)
+
+
+def _shifted(deadlines: Deadlines, seconds: float) -> Deadlines:
+    """`deadlines` as seen `seconds` later; past ones stay at 0, which reads the same and keeps the nodes finite."""
+    return Deadlines(
+        *(None if t is None else max(0.0, t - seconds) for t in (deadlines.tolerate_until, deadlines.reactivate_at))
+    )
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python scripts/explorer.py",
+        description="Explore every reachable decision state for one parameter set.",
+    )
+    parser.add_argument("--interval", type=float, default=DEFAULT_INTERVAL, help="seconds between evaluations")
+    add_parameter_arguments(parser)
+    args = parser.parse_args(argv)
+    report = explore(parameters_from_args(args), args.interval)
+    out = sys.stdout
+    out.write(f"reachable nodes: {report.nodes}\nreachable session states: {len(report.states)}\n")
+    for s in sorted(report.states, key=lambda s: (s.reactivate_delay, s.tolerated, str(s.last), s.failed_to_change)):
+        out.write(f"  {s}\n")
+    out.write(f"max evaluations to a stable mode: {report.max_steps_to_stable}\n")
+    out.write(f"flapping cycles under steady inputs: {len(report.flapping)}\n")
+    for cycle in report.flapping:
+        short = "  SHORT-CYCLING" if cycle.min_dwell < MIN_DWELL else ""
+        dwell = f"min dwell {cycle.min_dwell / 60:g} min"
+        out.write(f"  {' -> '.join(m.value for m in cycle.modes)}  {dwell}  {cycle.environment}{short}\n")
+    return 1 if report.short_cycles else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
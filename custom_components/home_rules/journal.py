@@ -0,0 +1,138 @@
+"""Append-only journal of evaluation records.
+
+No Home Assistant dependencies. Every method does blocking file I/O, so the
+coordinator runs them in the executor. A record is framed as a 4-byte
+big-endian length followed by compact JSON and appended to the newest
+segment file (``00000001.seg``, ``00000002.seg``, ...), so writing one
+evaluation costs the bytes of that record however long the history is.
+
+Once the newest segment holds 2 x `keep` records, compact() starts the next
+segment with the newest `keep` records and deletes the older segments.
+The newest segment therefore always holds the whole retained history, and
+startup reads only that file. A frame cut short by a crash is dropped and
+truncated away when the tail is read.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import shutil
+import struct
+import threading
+from collections.abc import Iterable
+from pathlib import Path
+from typing import Any
+
+_LENGTH = struct.Struct(">I")
+_SUFFIX = ".seg"
+
+
+def _frame(record: dict[str, Any]) -> bytes:
+    payload = json.dumps(record, separators=(",", ":")).encode()
+    return _LENGTH.pack(len(payload)) + payload
+
+
+def _frames(data: bytes) -> tuple[list[dict[str, Any]], int]:
+    """(records, bytes) of the complete, readable frames at the start of `data`."""
+    records: list[dict[str, Any]] = []
+    end, size = 0, len(data)
+    while end + _LENGTH.size <= size:
+        (length,) = _LENGTH.unpack_from(data, end)
+        start = end + _LENGTH.size
+        if start + length > size:
+            break
+        try:
+            records.append(json.loads(data[start : start + length]))
+        except ValueError:
+            break
+        end = start + length
+    return records, end
+
+
+class Journal:
+    """Segmented, length-prefixed record log under `directory` retaining the newest `keep` records."""
+
+    __slots__ = ("directory", "keep", "_count", "_lock", "_segment")
+
+    def __init__(self, directory: Path, keep: int) -> None:
+        self.directory, self.keep = directory, max(1, keep)
+        self._segment: Path | None = None
+        self._count = 0  # records in the newest segment
+        self._lock = threading.Lock()
+
+    def _segments(self) -> list[Path]:
+        if not self.directory.is_dir():
+            return []
+        return sorted(p for p in self.directory.iterdir() if p.suffix == _SUFFIX and p.stem.isdigit())
+
+    def _next_segment(self) -> Path:
+        index = int(self._segment.stem) + 1 if self._segment is not None else 1
+        return self.directory / f"{index:08d}{_SUFFIX}"
+
+    @property
+    def needs_compaction(self) -> bool:
+        return self._count >= 2 * self.keep
+
+    def as_dict(self) -> dict[str, Any]:
+        return {"segment": self._segment.name if self._segment else None, "records": self._count, "keep": self.keep}
+
+    def tail(self) -> list[dict[str, Any]]:
+        """The newest `keep` records, oldest first, read from the newest segment only; call before append()."""
+        with self._lock:
+            segments = self._segments()
+            if not segments:
+                self._segment, self._count = None, 0
+                return []
+            segment = segments[-1]
+            data = segment.read_bytes()
+            records, end = _frames(data)
+            if end < len(data):  # torn or corrupt tail: keep the frames before it
+                with segment.open("r+b") as f:
+                    f.truncate(end)
+            self._segment, self._count = segment, len(records)
+            return records[-self.keep :]
+
+    def append(self, record: dict[str, Any]) -> int:
+        """Append `record` to the newest segment; returns the bytes written."""
+        frame = _frame(record)
+        with self._lock:
+            if self._segment is None:
+                self.directory.mkdir(parents=True, exist_ok=True)
+                self._segment = self._next_segment()
+            with self._segment.open("ab") as f:
+                f.write(frame)
+            self._count += 1
+        return len(frame)
+
+    def _start_segment(self, records: Iterable[dict[str, Any]]) -> int:
+        """Write `records` to a new newest segment and delete the others; returns the bytes written."""
+        self.directory.mkdir(parents=True, exist_ok=True)
+        frames = [_frame(r) for r in records]
+        segment = self._next_segment()
+        partial = segment.with_suffix(".tmp")
+        partial.write_bytes(b"".join(frames))
+        os.replace(partial, segment)
+        for old in self._segments():
+            if old != segment:
+                old.unlink(missing_ok=True)
+        self._segment, self._count = segment, len(frames)
+        return sum(map(len, frames))
+
+    def compact(self) -> int:
+        """Once the newest segment is full, carry its last `keep` records into a new one; returns the bytes written."""
+        with self._lock:
+            if self._segment is None or self._count < 2 * self.keep:
+                return 0
+            records, _ = _frames(self._segment.read_bytes())
+            return self._start_segment(records[-self.keep :])
+
+    def replace(self, records: Iterable[dict[str, Any]]) -> int:
+        """Make `records` (oldest first) the whole journal; returns the bytes written."""
+        with self._lock:
+            return self._start_segment(records)
+
+    def remove(self) -> None:
+        with self._lock:
+            shutil.rmtree(self.directory, ignore_errors=True)
+            self._segment, self._count = None, 0
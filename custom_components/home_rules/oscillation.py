@@ -0,0 +1,54 @@
+"""Online short-cycle detection over the stream of decided modes.
+
+No Home Assistant dependencies. OscillationDetector sees one (time, mode) pair
+per evaluation and keeps only the timestamps of the last few mode changes, so
+each observation is O(1) in time and memory.
+"""
+
+from __future__ import annotations
+
+from collections import deque
+from typing import Any
+
+DEFAULT_TRANSITIONS = 4
+
+
+class OscillationDetector:
+    """Flags `transitions` or more mode changes within `window` seconds.
+
+    Counters: `changes` (mode changes seen), `reversals` (A -> B -> A changes)
+    and `episodes` (times the oscillating flag turned on).
+    """
+
+    __slots__ = ("changes", "episodes", "oscillating", "reversals", "window", "_before", "_mode", "_times")
+
+    def __init__(self, window: float, transitions: int = DEFAULT_TRANSITIONS) -> None:
+        self.window = window
+        self.changes = self.reversals = self.episodes = 0
+        self.oscillating = False
+        self._mode: int | None = None
+        self._before: int | None = None
+        self._times: deque[float] = deque(maxlen=max(2, transitions))
+
+    def observe(self, when: float, mode: int) -> bool:
+        """Record the mode decided at `when` (seconds); return whether the stream is oscillating."""
+        if mode != self._mode:
+            if self._mode is not None:
+                self.changes += 1
+                self.reversals += mode == self._before
+                self._times.append(when)
+            self._before, self._mode = self._mode, mode
+        times = self._times
+        oscillating = len(times) == times.maxlen and when - times[0] <= self.window
+        self.episodes += oscillating and not self.oscillating
+        self.oscillating = oscillating
+        return oscillating
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "oscillating": self.oscillating,
+            "window_seconds": self.window,
+            "changes": self.changes,
+            "reversals": self.reversals,
+            "episodes": self.episodes,
+        }
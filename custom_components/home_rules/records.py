@@ -0,0 +1,129 @@
+"""Compact evaluation history records.
+
+No Home Assistant dependencies. The coordinator keeps its recent
+evaluations in memory as EvaluationRecord objects. Every field has its own
+slot, so there is no per-record dict. The nested snapshots (controls,
+policy, fallback inputs) are stored as interned item tuples, shared by every
+record that saw the same values; the intern table keeps the INTERN_LIMIT
+most recently used snapshots across all config entries. A record reads like the dict it replaces;
+as_dict() builds that dict only when diagnostics, events, entity attributes
+or the journal need it.
+
+An evaluation that repeats the previous one exactly is not stored again:
+count_repeat() folds it into the previous record's ``repeats`` and
+``repeated_until``.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Iterator, Mapping
+from contextlib import suppress
+from typing import Any
+
+FIELDS = (
+    "time",
+    "trigger",
+    "triggers",
+    "current",
+    "adjustment",
+    "mode",
+    "reason",
+    "dry_run",
+    "control_mode",
+    "target_adjustment",
+    "target_reason",
+    "target_actionable",
+    "blocked_reasons",
+    "fallback_inputs",
+    "controls_snapshot",
+    "policy_snapshot",
+    "generation",
+    "grid_usage",
+    "temperature",
+    "humidity",
+    "have_solar",
+    "auto",
+    "tolerated",
+    "reactivate_delay",
+    "raw_generation",
+    "raw_grid_usage",
+    "smoothed_generation",
+    "smoothed_grid_usage",
+    "smoothed_adjustment",
+    "smoothed_reason",
+    "decision_differs",
+    "repeats",
+    "repeated_until",
+)
+_FIELD_SET = frozenset(FIELDS)
+_NESTED = frozenset(("fallback_inputs", "controls_snapshot", "policy_snapshot"))
+_MISSING = object()
+
+Items = tuple[tuple[str, Any], ...]
+INTERN_LIMIT = 256
+# Least recently used first; records keep their own references, so evicting a snapshot only ends its sharing.
+_interned: dict[Items, Items] = {}
+
+
+def intern_items(mapping: Mapping[str, Any]) -> Items:
+    """`mapping` as an items tuple, shared with recent equal mappings (unhashable values are not shared)."""
+    items = tuple(mapping.items())
+    with suppress(TypeError):
+        shared = _interned.pop(items, items)
+        _interned[shared] = shared
+        if len(_interned) > INTERN_LIMIT:
+            del _interned[next(iter(_interned))]
+        return shared
+    return items
+
+
+class EvaluationRecord(Mapping[str, Any]):
+    """One evaluation of the history; keys outside FIELDS (older records) are kept as they are."""
+
+    __slots__ = (*FIELDS, "_extra")
+
+    def __init__(self, fields: Mapping[str, Any]) -> None:
+        extra: dict[str, Any] | None = None
+        for key, value in fields.items():
+            if key not in _FIELD_SET:
+                extra = extra or {}
+                extra[key] = value
+            elif key in _NESTED and isinstance(value, Mapping):
+                setattr(self, key, intern_items(value))
+            elif key == "blocked_reasons" and isinstance(value, list):
+                setattr(self, key, tuple(value))
+            else:
+                setattr(self, key, value)
+        self._extra = extra
+
+    def __getitem__(self, key: str) -> Any:
+        if key in _FIELD_SET:
+            value = getattr(self, key, _MISSING)
+            if value is not _MISSING:
+                if isinstance(value, tuple):
+                    return dict(value) if key in _NESTED else list(value)
+                return value
+        elif self._extra is not None and key in self._extra:
+            return self._extra[key]
+        raise KeyError(key)
+
+    def __iter__(self) -> Iterator[str]:
+        for key in FIELDS:
+            if hasattr(self, key):
+                yield key
+        if self._extra is not None:
+            yield from self._extra
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
+
+    def __repr__(self) -> str:
+        return f"EvaluationRecord({self.as_dict()!r})"
+
+    def as_dict(self) -> dict[str, Any]:
+        return {key: self[key] for key in self}
+
+    def count_repeat(self, when: str, repeats: int = 1) -> None:
+        """Fold `repeats` more identical evaluations, the last at `when`, into this record."""
+        self.repeats = getattr(self, "repeats", 0) + repeats
+        self.repeated_until = when
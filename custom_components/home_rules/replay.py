@@ -0,0 +1,244 @@
+"""Replay recorded inputs through the rules engine.
+
+No Home Assistant dependencies. Rows are read lazily from a JSONL or CSV file
+and decisions are yielded one at a time, so memory use does not grow with the
+length of the recording.
+
+Each row carries a ``time`` plus the HomeInput fields. ``aircon_mode``,
+``generation``, ``grid_usage``, ``temperature`` and ``humidity`` are required.
+``have_solar``, ``timer``, ``aggressive_cooling``, ``enabled`` and
+``cooling_enabled`` are optional. ``auto`` is optional too: without it, auto
+mode is tracked from the replayed adjustments, as the coordinator does.
+Power readings are normalized as the coordinator reads them: negative ones
+count as 0, and without solar generation and grid usage are 0.
+Replay runs like Monitor mode: adjustments are assumed to be applied and
+never count as failures.
+
+The delays are minutes, as in the integration options, and run on the row
+times like the coordinator's deadlines. ``time`` is epoch seconds or an ISO
+8601 timestamp; a row without one is taken as ``--step-seconds`` after the
+previous row.
+
+Usage::
+
+    python scripts/replay.py inputs.jsonl --smoothing-window 5 > decisions.jsonl
+"""
+
+from __future__ import annotations
+
+import argparse
+import csv
+import json
+import sys
+from collections.abc import Iterable, Iterator, Mapping, Sequence
+from contextlib import suppress
+from dataclasses import dataclass, fields, replace
+from datetime import datetime
+from pathlib import Path
+from typing import Any
+
+from .compiled import compile_rules
+from .rolling import RollingWindow
+from .rules import (
+    AdjustResult,
+    AirconMode,
+    CachedState,
+    Deadlines,
+    HomeInput,
+    HomeOutput,
+    RuleParameters,
+    apply_adjustment,
+    current_state,
+    deadline_parameters,
+    normalized_input,
+)
+
+# Same values as the integration's option defaults in const.py, which imports Home Assistant.
+DEFAULT_PARAMETERS = RuleParameters(5500.0, 3500.0, 500.0, 24.0, 65.0, True, 6, 6, 22.0)
+DEFAULT_SMOOTHING_WINDOW = 5
+DEFAULT_STEP_SECONDS = 60.0
+_TRUE = {"1", "true", "yes", "on"}
+_PLANT = {HomeOutput.COOL: AirconMode.COOL, HomeOutput.DRY: AirconMode.DRY, HomeOutput.OFF: AirconMode.OFF}
+_OPTIONAL_FLAGS = {
+    "have_solar": True,
+    "timer": False,
+    "aggressive_cooling": False,
+    "enabled": True,
+    "cooling_enabled": True,
+}
+
+
+@dataclass(frozen=True, slots=True)
+class ReplayStep:
+    time: str
+    home: HomeInput
+    generation: float
+    result: AdjustResult
+    mode: HomeOutput
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "time": self.time,
+            "adjustment": self.result.output.value,
+            "reason": self.result.reason.value,
+            "mode": self.mode.value,
+            "generation": round(self.generation, 1),
+        }
+
+
+def plant_mode(output: HomeOutput, mode: AirconMode) -> AirconMode:
+    """Aircon mode once `output` is applied to an aircon in `mode`; other outputs leave it as it is."""
+    return _PLANT.get(output, mode)
+
+
+def parse_flag(value: Any) -> bool:
+    return value if isinstance(value, bool) else str(value).strip().lower() in _TRUE
+
+
+def parse_row(row: Mapping[str, Any], auto: bool) -> tuple[str, HomeInput]:
+    """Build (time, HomeInput) from a JSONL object or CSV row; `auto` is used when the row has none."""
+    mode = AirconMode.UNKNOWN
+    with suppress(ValueError):
+        mode = AirconMode(str(row["aircon_mode"]).lower().strip())
+    flags = {
+        k: parse_flag(row[k]) if row.get(k) not in (None, "") else default for k, default in _OPTIONAL_FLAGS.items()
+    }
+    home = HomeInput(
+        aircon_mode=mode,
+        generation=float(row["generation"]),
+        grid_usage=float(row["grid_usage"]),
+        temperature=float(row["temperature"]),
+        humidity=float(row["humidity"]),
+        auto=parse_flag(row["auto"]) if row.get("auto") not in (None, "") else auto,
+        **flags,
+    )
+    return str(row.get("time", "")), home
+
+
+def parse_time(value: Any) -> float | None:
+    """Epoch seconds of a row's ``time`` (a number or an ISO 8601 timestamp), or None if it has no usable one."""
+    if value in (None, ""):
+        return None
+    with suppress(ValueError):
+        return float(value)
+    with suppress(ValueError):
+        return datetime.fromisoformat(str(value)).timestamp()
+    return None
+
+
+def next_time(value: Any, previous: float | None, step_seconds: float = DEFAULT_STEP_SECONDS) -> float:
+    """Epoch seconds of a row with ``time`` `value`; without one, `step_seconds` after the `previous` row."""
+    if (stamp := parse_time(value)) is not None:
+        return stamp
+    return 0.0 if previous is None else previous + step_seconds
+
+
+def read_rows(path: Path) -> Iterator[dict[str, Any]]:
+    """Stream rows from a CSV (by extension) or JSONL file."""
+    with path.open(newline="", encoding="utf-8") as f:
+        if path.suffix.lower() == ".csv":
+            yield from csv.DictReader(f)
+            return
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
+
+
+class Replayer:
+    """Coordinator bookkeeping carried between replayed rows: session, deadlines, auto mode and generation history."""
+
+    __slots__ = ("auto", "deadlines", "rules", "session", "_delays", "_window")
+
+    def __init__(
+        self,
+        config: RuleParameters = DEFAULT_PARAMETERS,
+        smoothing_window: int = DEFAULT_SMOOTHING_WINDOW,
+        session: CachedState | None = None,
+    ) -> None:
+        self.rules = compile_rules(deadline_parameters(config))
+        self.session, self.auto = session or CachedState(), False
+        self.deadlines = Deadlines()
+        self._delays = 60.0 * config.grid_usage_delay, 60.0 * config.reactivate_delay
+        self._window = RollingWindow(smoothing_window)
+
+    def smooth(self, raw: float) -> float:
+        """Smoothed generation for this row; `raw` joins the history for later rows."""
+        value = self._window.mean_with(raw)
+        self._window.push(raw)
+        return value
+
+    def step(self, home: HomeInput, now: float) -> tuple[AdjustResult, HomeOutput]:
+        """Decide on `home` (normalized, with smoothed generation) at `now` (epoch seconds); return (result, mode)."""
+        session, current = self.session, current_state(home)
+        if session.last is None:
+            session.last = current
+        session.reactivate_delay, session.tolerated = self.deadlines.counters(now)
+        result = self.rules.adjust(home, session)
+        self.deadlines = self.deadlines.advance(session, now, *self._delays)
+        apply_adjustment(session, current, result.output)
+        session.failed_to_change = 0
+        if result.output in (HomeOutput.COOL, HomeOutput.DRY):
+            self.auto = True
+        elif result.output is HomeOutput.OFF:
+            self.auto = False
+        return result, session.last or current
+
+
+def replay(
+    rows: Iterable[Mapping[str, Any]],
+    config: RuleParameters = DEFAULT_PARAMETERS,
+    *,
+    smoothing_window: int = DEFAULT_SMOOTHING_WINDOW,
+    session: CachedState | None = None,
+    step_seconds: float = DEFAULT_STEP_SECONDS,
+) -> Iterator[ReplayStep]:
+    """Yield one ReplayStep per row, evaluated the way HomeRulesCoordinator would."""
+    replayer, now = Replayer(config, smoothing_window, session), None
+    for row in rows:
+        time, home = parse_row(row, replayer.auto)
+        home = normalized_input(home)
+        now = next_time(row.get("time"), now, step_seconds)
+        generation = replayer.smooth(home.generation)
+        result, mode = replayer.step(replace(home, generation=generation), now)
+        yield ReplayStep(time, home, generation, result, mode)
+
+
+def add_parameter_arguments(parser: argparse.ArgumentParser, *, many: bool = False) -> None:
+    """Add a --option per RuleParameters field; with `many`, each takes one or more values and defaults to None."""
+    for f in fields(RuleParameters):
+        default = getattr(DEFAULT_PARAMETERS, f.name)
+        kind = parse_flag if isinstance(default, bool) else type(default)
+        flag = f"--{f.name.replace('_', '-')}"
+        if many:
+            parser.add_argument(flag, type=kind, nargs="+", default=None)
+        else:
+            parser.add_argument(flag, type=kind, default=default)
+
+
+def parameters_from_args(args: argparse.Namespace) -> RuleParameters:
+    return RuleParameters(**{f.name: getattr(args, f.name) for f in fields(RuleParameters)})
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python scripts/replay.py",
+        description="Replay recorded inputs through the rules engine.",
+    )
+    parser.add_argument("path", type=Path, help="JSONL or CSV file of timestamped inputs")
+    parser.add_argument("--smoothing-window", type=int, default=DEFAULT_SMOOTHING_WINDOW)
+    parser.add_argument("--step-seconds", type=float, default=DEFAULT_STEP_SECONDS, help="row duration without times")
+    add_parameter_arguments(parser)
+    args = parser.parse_args(argv)
+    steps = replay(
+        read_rows(args.path),
+        parameters_from_args(args),
+        smoothing_window=args.smoothing_window,
+        step_seconds=args.step_seconds,
+    )
+    for step in steps:
+        sys.stdout.write(json.dumps(step.as_dict()) + "\n")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,181 @@
+"""Rolling windows and interval averages over sensor samples.
+
+No Home Assistant dependencies. RollingWindow keeps a running sum for the
+mean and monotonic queues for the minimum and maximum, so pushing a sample
+and reading any of the three is O(1) (amortized for min and max) however
+long the stream runs. This is the generation and grid smoothing the
+coordinator and replay apply before adjust().
+
+The running sum is kept in integer units of 1/`scale` (milliwatts for the
+default scale), so adding and removing samples is exact: the mean of a
+window never drifts with the length of the stream, and a window of zeros
+averages to exactly zero.
+
+TimeWeightedAverage integrates every sample of a signal between two
+evaluations with the trapezoidal rule, so the decision can see the mean
+power over the interval rather than the one reading taken at evaluation
+time. It keeps only the running area, the last sample and the extremes.
+"""
+
+from __future__ import annotations
+
+from collections import deque
+from collections.abc import Iterable, Iterator
+from math import isfinite
+from typing import Any
+
+DEFAULT_SCALE = 1000
+
+
+class RollingWindow:
+    """The latest `size` samples with O(1) mean, min and max."""
+
+    __slots__ = ("scale", "size", "_count", "_max", "_min", "_nonfinite", "_sum", "_values")
+
+    def __init__(self, size: int, values: Iterable[float] = (), *, scale: int = DEFAULT_SCALE) -> None:
+        self.size, self.scale = max(1, size), scale
+        self._values: deque[float] = deque()
+        self._sum = self._nonfinite = 0
+        self._count = 0  # samples ever pushed; the newest sample has index _count - 1
+        self._min: deque[tuple[int, float]] = deque()
+        self._max: deque[tuple[int, float]] = deque()
+        for value in values:
+            self.push(value)
+
+    def __len__(self) -> int:
+        return len(self._values)
+
+    def __iter__(self) -> Iterator[float]:
+        """Samples, oldest first."""
+        return iter(self._values)
+
+    def _units(self, value: float) -> int:
+        return round(value * self.scale) if isfinite(value) else 0
+
+    def push(self, value: float) -> None:
+        index = self._count
+        self._count += 1
+        self._values.append(value)
+        self._sum += self._units(value)
+        self._nonfinite += not isfinite(value)
+        while self._min and self._min[-1][1] >= value:
+            self._min.pop()
+        self._min.append((index, value))
+        while self._max and self._max[-1][1] <= value:
+            self._max.pop()
+        self._max.append((index, value))
+        while len(self._values) > self.size:
+            self._evict()
+
+    def _evict(self) -> None:
+        index = self._count - len(self._values)
+        value = self._values.popleft()
+        self._sum -= self._units(value)
+        self._nonfinite -= not isfinite(value)
+        if self._min[0][0] == index:
+            self._min.popleft()
+        if self._max[0][0] == index:
+            self._max.popleft()
+
+    def resize(self, size: int) -> None:
+        """Change the window size in place; shrinking drops the oldest samples."""
+        self.size = max(1, size)
+        while len(self._values) > self.size:
+            self._evict()
+
+    @property
+    def mean(self) -> float | None:
+        if not self._values:
+            return None
+        return float("nan") if self._nonfinite else self._sum / (len(self._values) * self.scale)
+
+    @property
+    def min(self) -> float | None:
+        return self._min[0][1] if self._min else None
+
+    @property
+    def max(self) -> float | None:
+        return self._max[0][1] if self._max else None
+
+    def mean_with(self, value: float) -> float:
+        """Mean the window would have after push(value), without pushing it."""
+        n = len(self._values)
+        if self.size == 1 or not n:
+            return value
+        total, nonfinite = self._sum + self._units(value), self._nonfinite + (not isfinite(value))
+        if n == self.size:
+            oldest = self._values[0]
+            total, nonfinite, n = total - self._units(oldest), nonfinite - (not isfinite(oldest)), n - 1
+        return float("nan") if nonfinite else total / ((n + 1) * self.scale)
+
+    def as_dict(self) -> dict[str, Any]:
+        return {"size": self.size, "samples": len(self), "mean": self.mean, "min": self.min, "max": self.max}
+
+
+class TimeWeightedAverage:
+    """Trapezoidal time-weighted mean, min and max of a signal since the interval started."""
+
+    __slots__ = ("samples", "_area", "_last", "_max", "_min", "_start")
+
+    def __init__(self) -> None:
+        self._start: float | None = None
+        self._last: tuple[float, float] | None = None
+        self._reset()
+
+    def _reset(self) -> None:
+        self.samples, self._area, self._start, self._last = 0, 0.0, None, None
+        self._min = self._max = float("nan")
+
+    def add(self, when: float, value: float) -> None:
+        """Record `value` (finite) observed at `when` (seconds); samples older than the last one are ignored."""
+        if self._last is None:
+            self._start = when
+            self._min = self._max = value
+        else:
+            last_when, last_value = self._last
+            if when < last_when:
+                return
+            self._area += (last_value + value) / 2 * (when - last_when)
+            self._min, self._max = min(self._min, value), max(self._max, value)
+        self._last = (when, value)
+        self.samples += 1
+
+    @property
+    def seconds(self) -> float:
+        return self._last[0] - self._start if self._last is not None and self._start is not None else 0.0
+
+    @property
+    def mean(self) -> float | None:
+        if self._last is None:
+            return None
+        seconds = self.seconds
+        return self._area / seconds if seconds > 0 else self._last[1]
+
+    def mean_with(self, when: float, value: float) -> float:
+        """Mean close(when, value) would return, without closing the interval."""
+        if self._last is None or self._start is None:
+            return value
+        last_when, last_value = self._last
+        if when < last_when:
+            return self._area / self.seconds if self.seconds > 0 else last_value
+        seconds = when - self._start
+        area = self._area + (last_value + value) / 2 * (when - last_when)
+        return area / seconds if seconds > 0 else value
+
+    def close(self, when: float, value: float) -> float:
+        """Add the reading at `when`, return the interval mean and start the next interval from that reading."""
+        self.add(when, value)
+        mean = self.mean
+        self._reset()
+        self.add(when, value)
+        return value if mean is None else mean
+
+    def as_dict(self) -> dict[str, Any]:
+        empty = self._last is None
+        return {
+            "samples": self.samples,
+            "seconds": self.seconds,
+            "mean": self.mean,
+            "min": None if empty else self._min,
+            "max": None if empty else self._max,
+        }
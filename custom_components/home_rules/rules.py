@@ -12,36 +12,81 @@ Decision tree (high-level):
   6. Aircon ON + free solar → maintain or upgrade mode
 """
 
-from dataclasses import dataclass
-from enum import StrEnum
-from typing import NamedTuple
+from __future__ import annotations
+
+from bisect import bisect_left
+from collections.abc import Iterable
+from dataclasses import dataclass, replace
+from enum import IntFlag, StrEnum
+from typing import TYPE_CHECKING, NamedTuple
+
+if TYPE_CHECKING:
+    import numpy as np
+    from numpy.typing import ArrayLike, NDArray
 
 ALLOWED_FAILURES = 3
+# Delay counts for deadline-driven sessions (see Deadlines): one tolerated evaluation, one reactivation wait.
+DEADLINE_GRID_USAGE_DELAY, DEADLINE_REACTIVATE_DELAY = 2, 1
 
-# Reason constants — every decision path has a named reason.
-R_NO_SOLAR = "No solar available"
-R_INSUFFICIENT_SOLAR = "Insufficient solar"
-R_BOOST_SOLAR = "Boost solar available"
-R_BOOST_COOLING = "Boost cooling on solar"
-R_BOOST_GRID_TOLERATED = "Boost grid tolerated"
-R_SOLAR_COOL = "Solar above cool threshold"
-R_SOLAR_DRY = "Solar above dry threshold"
-R_DRY_DISABLED = "Dry mode disabled"
-R_HUMIDITY_TOO_LOW = "Humidity too low for dry mode"
-R_ALREADY_COOLING = "Already cooling on solar"
-R_ALREADY_DRYING = "Already drying on solar"
-R_GRID_TOLERATED = "Grid usage tolerated"
-R_GRID_TOO_HIGH = "Grid usage too high"
-R_REACTIVATE_WAIT = "Waiting reactivate delay"
-R_DISABLED = "Disabled"
-R_UNKNOWN_MODE = "Unknown aircon mode"
-R_TIMER_EXPIRED = "Timer expired"
-R_MANUAL = "Manual"
-R_AUTO_IDLE = "Auto idle"
-R_NO_CHANGE = "No change"
-R_COOLING_DISABLED = "Cooling disabled"
-R_BELOW_COOL_SETPOINT = "Temperature below cool setpoint"
-R_BELOW_THRESHOLD = "Temperature below threshold"
+
+class Reason(StrEnum):
+    """Every decision path has a named reason.
+
+    Append only: the member index is the stable code persisted in history.
+    """
+
+    NO_SOLAR = "No solar available"
+    INSUFFICIENT_SOLAR = "Insufficient solar"
+    BOOST_SOLAR = "Boost solar available"
+    BOOST_COOLING = "Boost cooling on solar"
+    BOOST_GRID_TOLERATED = "Boost grid tolerated"
+    SOLAR_COOL = "Solar above cool threshold"
+    SOLAR_DRY = "Solar above dry threshold"
+    DRY_DISABLED = "Dry mode disabled"
+    HUMIDITY_TOO_LOW = "Humidity too low for dry mode"
+    ALREADY_COOLING = "Already cooling on solar"
+    ALREADY_DRYING = "Already drying on solar"
+    GRID_TOLERATED = "Grid usage tolerated"
+    GRID_TOO_HIGH = "Grid usage too high"
+    REACTIVATE_WAIT = "Waiting reactivate delay"
+    DISABLED = "Disabled"
+    UNKNOWN_MODE = "Unknown aircon mode"
+    TIMER_EXPIRED = "Timer expired"
+    MANUAL = "Manual"
+    AUTO_IDLE = "Auto idle"
+    NO_CHANGE = "No change"
+    COOLING_DISABLED = "Cooling disabled"
+    BELOW_COOL_SETPOINT = "Temperature below cool setpoint"
+    BELOW_THRESHOLD = "Temperature below threshold"
+
+    @property
+    def code(self) -> int:
+        return _R[self]
+
+
+R_NO_SOLAR = Reason.NO_SOLAR
+R_INSUFFICIENT_SOLAR = Reason.INSUFFICIENT_SOLAR
+R_BOOST_SOLAR = Reason.BOOST_SOLAR
+R_BOOST_COOLING = Reason.BOOST_COOLING
+R_BOOST_GRID_TOLERATED = Reason.BOOST_GRID_TOLERATED
+R_SOLAR_COOL = Reason.SOLAR_COOL
+R_SOLAR_DRY = Reason.SOLAR_DRY
+R_DRY_DISABLED = Reason.DRY_DISABLED
+R_HUMIDITY_TOO_LOW = Reason.HUMIDITY_TOO_LOW
+R_ALREADY_COOLING = Reason.ALREADY_COOLING
+R_ALREADY_DRYING = Reason.ALREADY_DRYING
+R_GRID_TOLERATED = Reason.GRID_TOLERATED
+R_GRID_TOO_HIGH = Reason.GRID_TOO_HIGH
+R_REACTIVATE_WAIT = Reason.REACTIVATE_WAIT
+R_DISABLED = Reason.DISABLED
+R_UNKNOWN_MODE = Reason.UNKNOWN_MODE
+R_TIMER_EXPIRED = Reason.TIMER_EXPIRED
+R_MANUAL = Reason.MANUAL
+R_AUTO_IDLE = Reason.AUTO_IDLE
+R_NO_CHANGE = Reason.NO_CHANGE
+R_COOLING_DISABLED = Reason.COOLING_DISABLED
+R_BELOW_COOL_SETPOINT = Reason.BELOW_COOL_SETPOINT
+R_BELOW_THRESHOLD = Reason.BELOW_THRESHOLD
 
 
 class AirconMode(StrEnum):
@@ -56,6 +101,8 @@ class AirconMode(StrEnum):
 
 
 class HomeOutput(StrEnum):
+    """Adjustment decided by the engine. Append only: the member index is the stable code."""
+
     NO_CHANGE = "No Change"
     OFF = "Off"
     COOL = "Cool"
@@ -64,11 +111,34 @@ class HomeOutput(StrEnum):
     DISABLED = "Disabled"
     RESET = "Reset"
 
+    @property
+    def code(self) -> int:
+        return _OUT[self]
+
 
 OUT = HomeOutput
 
 
-@dataclass
+class HomeFlag(IntFlag):
+    """Boolean HomeInput fields packed into one integer column for batch evaluation."""
+
+    HAVE_SOLAR = 1
+    TIMER = 2
+    AUTO = 4
+    AGGRESSIVE_COOLING = 8
+    ENABLED = 16
+    COOLING_ENABLED = 32
+
+
+# Code tables — a code is the index into its tuple. Output and reason codes are persisted.
+AIRCON_MODE_CODES: tuple[AirconMode, ...] = tuple(AirconMode)
+OUTPUT_CODES: tuple[HomeOutput, ...] = tuple(HomeOutput)
+REASON_CODES: tuple[Reason, ...] = tuple(Reason)
+_OUT = {output: i for i, output in enumerate(OUTPUT_CODES)}
+_R = {reason: i for i, reason in enumerate(REASON_CODES)}
+
+
+@dataclass(frozen=True, slots=True)
 class HomeInput:
     aircon_mode: AirconMode
     have_solar: bool
@@ -83,7 +153,7 @@ class HomeInput:
     cooling_enabled: bool
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class RuleParameters:
     generation_cool_threshold: float
     generation_dry_threshold: float
@@ -96,17 +166,98 @@ class RuleParameters:
     temperature_cool: float
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
+class SessionState:
+    """Immutable, hashable session state for the pure transition() API."""
+
+    reactivate_delay: int = 0
+    tolerated: int = 0
+    last: HomeOutput | None = None
+    failed_to_change: int = 0
+
+
+@dataclass(slots=True)
 class CachedState:
+    """Mutable session state updated in place by adjust() and apply_adjustment()."""
+
     reactivate_delay: int = 0
     tolerated: int = 0
     last: HomeOutput | None = None
     failed_to_change: int = 0
 
+    def snapshot(self) -> SessionState:
+        return SessionState(self.reactivate_delay, self.tolerated, self.last, self.failed_to_change)
+
+    def restore(self, state: SessionState) -> None:
+        self.reactivate_delay, self.tolerated = state.reactivate_delay, state.tolerated
+        self.last, self.failed_to_change = state.last, state.failed_to_change
+
+
+@dataclass(frozen=True, slots=True)
+class Deadlines:
+    """Wall-clock form of the session delays, in epoch seconds.
+
+    transition() counts delays in evaluations, which suits replay but not a
+    coordinator whose evaluations are event-driven or adaptive. Run with
+    RuleParameters whose delays are DEADLINE_GRID_USAGE_DELAY and
+    DEADLINE_REACTIVATE_DELAY (or 0), the counters only ever say "tolerating"
+    and "waiting": counters() sets them from the deadlines before an
+    evaluation and advance() turns the counters it leaves into deadlines.
+    """
+
+    tolerate_until: float | None = None
+    reactivate_at: float | None = None
+
+    def counters(self, now: float) -> tuple[int, int]:
+        """(reactivate_delay, tolerated) for transition() at `now`."""
+        waiting = self.reactivate_at is not None and now < self.reactivate_at
+        expired = self.tolerate_until is not None and now >= self.tolerate_until
+        return int(waiting), DEADLINE_GRID_USAGE_DELAY - 1 if expired else 0
+
+    def advance(
+        self, state: SessionState | CachedState, now: float, grid_usage_delay: float, reactivate_delay: float
+    ) -> Deadlines:
+        """Deadlines after transition() left `state` at `now`; the delays are in seconds."""
+        if state.reactivate_delay:  # just shut off for grid usage
+            reactivate_at: float | None = now + reactivate_delay
+        else:
+            reactivate_at = self.reactivate_at if self.reactivate_at is not None and now < self.reactivate_at else None
+        started = self.tolerate_until is not None
+        tolerate_until = (self.tolerate_until if started else now + grid_usage_delay) if state.tolerated else None
+        if (tolerate_until, reactivate_at) == (self.tolerate_until, self.reactivate_at):
+            return self
+        return Deadlines(tolerate_until, reactivate_at)
+
+    @property
+    def next(self) -> float | None:
+        """Earliest pending deadline, if any."""
+        pending = [t for t in (self.tolerate_until, self.reactivate_at) if t is not None]
+        return min(pending) if pending else None
+
+
+def deadline_parameters(config: RuleParameters) -> RuleParameters:
+    """`config`, whose delays are minutes as in the options, as transition() runs next to Deadlines.
+
+    Each delay becomes its Deadlines count, or stays 0 for no delay; pass the
+    minutes (as seconds) to Deadlines.advance().
+    """
+    return replace(
+        config,
+        grid_usage_delay=DEADLINE_GRID_USAGE_DELAY if config.grid_usage_delay > 0 else 0,
+        reactivate_delay=DEADLINE_REACTIVATE_DELAY if config.reactivate_delay > 0 else 0,
+    )
+
 
 class AdjustResult(NamedTuple):
     output: HomeOutput
-    reason: str
+    reason: Reason
+
+
+class Transition(NamedTuple):
+    """Result from transition(): the adjustment and the session state after it."""
+
+    result: AdjustResult
+    state: SessionState
 
 
 class TargetResult(NamedTuple):
@@ -120,7 +271,7 @@ class TargetResult(NamedTuple):
     """
 
     output: HomeOutput | None
-    reason: str
+    reason: Reason
     is_actionable: bool
 
 
@@ -160,6 +311,21 @@ def _evaluate_target_mode(config: RuleParameters, home: HomeInput) -> TargetResu
     return TargetResult(None, R_INSUFFICIENT_SOLAR, False)
 
 
+def clean_power(value: float) -> float:
+    """A power reading as the rules see it: a negative reading (export) counts as 0 W."""
+    return max(0.0, value)
+
+
+def normalized_input(home: HomeInput) -> HomeInput:
+    """`home` with its power readings cleaned, and generation and grid at 0 without solar, as adjust() expects."""
+    generation = grid_usage = 0.0
+    if home.have_solar:
+        generation, grid_usage = clean_power(home.generation), clean_power(home.grid_usage)
+    if (generation, grid_usage) == (home.generation, home.grid_usage):
+        return home
+    return replace(home, generation=generation, grid_usage=grid_usage)
+
+
 def current_state(home: HomeInput) -> HomeOutput:
     """Map the current aircon mode to a HomeOutput value."""
     if not home.enabled:
@@ -172,7 +338,7 @@ def current_state(home: HomeInput) -> HomeOutput:
     )
 
 
-def _idle_reason(config: RuleParameters, home: HomeInput, activation: str | None, default: str) -> str:
+def _idle_reason(config: RuleParameters, home: HomeInput, activation: Reason | None, default: Reason) -> Reason:
     """Explain why the aircon is idle (off and not activating).
 
     Checks are in priority order — first match wins.
@@ -186,91 +352,343 @@ def _idle_reason(config: RuleParameters, home: HomeInput, activation: str | None
     return activation or default
 
 
-def adjust(config: RuleParameters, home: HomeInput, state: CachedState) -> AdjustResult:
+_WAIT = AdjustResult(HomeOutput.NO_CHANGE, R_REACTIVATE_WAIT)
+
+
+def _reset_tolerance(state: SessionState) -> SessionState:
+    return state if state.tolerated == 0 else replace(state, tolerated=0)
+
+
+def transition(config: RuleParameters, home: HomeInput, state: SessionState) -> Transition:
     """Core decision function. Evaluates inputs and returns the adjustment to make.
 
-    Mutates `state` (tolerance counters, reactivation delay, last output).
+    Pure: returns the next session state (tolerance counter, reactivation
+    delay) instead of mutating `state`; an unchanged state is returned as is.
     """
     h = home
     if not h.enabled:
-        state.tolerated = 0
         out = HomeOutput.NO_CHANGE if state.last is HomeOutput.DISABLED else HomeOutput.DISABLED
-        return AdjustResult(out, R_DISABLED)
+        return Transition(AdjustResult(out, R_DISABLED), _reset_tolerance(state))
     if h.aircon_mode == AirconMode.UNKNOWN:
-        return AdjustResult(HomeOutput.NO_CHANGE, R_UNKNOWN_MODE)
+        return Transition(AdjustResult(HomeOutput.NO_CHANGE, R_UNKNOWN_MODE), state)
     if state.reactivate_delay:
-        state.reactivate_delay -= 1
-        return AdjustResult(HomeOutput.NO_CHANGE, R_REACTIVATE_WAIT)
+        return Transition(_WAIT, replace(state, reactivate_delay=state.reactivate_delay - 1))
 
     target = _evaluate_target_mode(config, h)
     activation = target.reason if target.is_actionable else None
 
     # --- Aircon is OFF ---
     if h.aircon_mode == AirconMode.OFF:
-        state.tolerated = 0
+        reset = _reset_tolerance(state)
         temp_ok = (
             h.temperature > config.temperature_cool
             if h.aggressive_cooling
             else h.temperature >= config.temperature_threshold
         )
         if h.cooling_enabled and temp_ok and target.output is not None:
-            return AdjustResult(target.output, target.reason)
+            return Transition(AdjustResult(target.output, target.reason), reset)
         if h.auto:
-            return AdjustResult(HomeOutput.OFF, _idle_reason(config, h, activation, R_AUTO_IDLE))
+            return Transition(AdjustResult(HomeOutput.OFF, _idle_reason(config, h, activation, R_AUTO_IDLE)), reset)
         if state.last is HomeOutput.TIMER and not h.timer:
-            return AdjustResult(HomeOutput.RESET, R_TIMER_EXPIRED)
-        return AdjustResult(HomeOutput.NO_CHANGE, _idle_reason(config, h, activation, R_NO_CHANGE))
+            return Transition(AdjustResult(HomeOutput.RESET, R_TIMER_EXPIRED), reset)
+        return Transition(AdjustResult(HomeOutput.NO_CHANGE, _idle_reason(config, h, activation, R_NO_CHANGE)), reset)
 
     # --- Aircon is ON + grid draw (or no solar) ---
     if not h.have_solar or h.grid_usage > 0:
         if h.auto:
             # If a mode transition is available (e.g. COOL→DRY downgrade), apply immediately.
             if target.output is not None:
-                state.tolerated = 0
-                return AdjustResult(target.output, target.reason)
+                return Transition(AdjustResult(target.output, target.reason), _reset_tolerance(state))
             # Boost: tolerate grid draw while solar is available.
             if h.aggressive_cooling and h.have_solar and h.generation >= config.generation_boost_threshold:
-                state.tolerated = 0
-                return AdjustResult(HomeOutput.NO_CHANGE, R_BOOST_GRID_TOLERATED)
+                return Transition(AdjustResult(HomeOutput.NO_CHANGE, R_BOOST_GRID_TOLERATED), _reset_tolerance(state))
             # Solar: tolerate briefly, then shut off.
-            state.tolerated += 1
-            if state.tolerated < config.grid_usage_delay:
-                return AdjustResult(HomeOutput.NO_CHANGE, R_GRID_TOLERATED)
-            state.tolerated = 0
-            state.reactivate_delay = config.reactivate_delay
-            return AdjustResult(HomeOutput.OFF, R_GRID_TOO_HIGH)
+            tolerated = state.tolerated + 1
+            if tolerated < config.grid_usage_delay:
+                return Transition(
+                    AdjustResult(HomeOutput.NO_CHANGE, R_GRID_TOLERATED), replace(state, tolerated=tolerated)
+                )
+            next_state = replace(state, tolerated=0, reactivate_delay=config.reactivate_delay)
+            return Transition(AdjustResult(HomeOutput.OFF, R_GRID_TOO_HIGH), next_state)
         if h.timer:
-            return AdjustResult(OUT.NO_CHANGE, R_NO_CHANGE)
+            return Transition(AdjustResult(OUT.NO_CHANGE, R_NO_CHANGE), state)
         if state.last is HomeOutput.TIMER:
-            return AdjustResult(OUT.OFF, R_TIMER_EXPIRED)
-        return AdjustResult(OUT.TIMER, R_MANUAL)
+            return Transition(AdjustResult(OUT.OFF, R_TIMER_EXPIRED), state)
+        return Transition(AdjustResult(OUT.TIMER, R_MANUAL), state)
 
     # --- Aircon is ON + free solar ---
     if h.auto:
-        state.tolerated = 0
         if target.output is not None:
-            return AdjustResult(target.output, target.reason)
-        return AdjustResult(HomeOutput.NO_CHANGE, activation or R_NO_CHANGE)
+            return Transition(AdjustResult(target.output, target.reason), _reset_tolerance(state))
+        return Transition(AdjustResult(HomeOutput.NO_CHANGE, activation or R_NO_CHANGE), _reset_tolerance(state))
+
+    return Transition(AdjustResult(HomeOutput.NO_CHANGE, R_NO_CHANGE), state)
 
-    return AdjustResult(HomeOutput.NO_CHANGE, R_NO_CHANGE)
+
+def branch(home: HomeInput, state: SessionState | CachedState) -> str:
+    """Name of the top-level transition() branch `home` takes from `state`."""
+    h = home
+    if not h.enabled:
+        return "disabled"
+    if h.aircon_mode == AirconMode.UNKNOWN:
+        return "unknown_mode"
+    if state.reactivate_delay:
+        return "reactivate_wait"
+    if h.aircon_mode == AirconMode.OFF:
+        return "off"
+    source = "on_grid" if not h.have_solar or h.grid_usage > 0 else "on_solar"
+    return f"{source}_auto" if h.auto else f"{source}_manual"
+
+
+def adjust(config: RuleParameters, home: HomeInput, state: CachedState) -> AdjustResult:
+    """Mutating wrapper around transition(): updates `state` in place and returns the adjustment."""
+    result, next_state = transition(config, home, state.snapshot())
+    state.restore(next_state)
+    return result
+
+
+def track_adjustment(state: SessionState, current: HomeOutput, adjustment: HomeOutput) -> tuple[bool, SessionState]:
+    """Pure form of apply_adjustment(): returns (should proceed, next state)."""
+    if adjustment in (HomeOutput.NO_CHANGE, HomeOutput.RESET):
+        last = current if adjustment is HomeOutput.RESET else state.last
+    elif state.last is None or state.last != adjustment:
+        last = adjustment
+    else:
+        failed = state.failed_to_change + 1
+        return failed <= ALLOWED_FAILURES, SessionState(state.reactivate_delay, state.tolerated, state.last, failed)
+    if last is state.last and not state.failed_to_change:
+        return True, state
+    return True, SessionState(state.reactivate_delay, state.tolerated, last, 0)
 
 
 def apply_adjustment(session: CachedState, current: HomeOutput, adjustment: HomeOutput) -> bool:
     """Track whether an adjustment was successfully applied.
 
     Returns True if the adjustment should proceed, False if too many
-    consecutive failures to change to the same state.
+    consecutive failures to change to the same state. Mutates `session`;
+    see track_adjustment() for the pure form.
     """
-    if adjustment in (HomeOutput.NO_CHANGE, HomeOutput.RESET):
-        if adjustment is HomeOutput.RESET:
-            session.last = current
-        session.failed_to_change = 0
-        return True
-
-    if session.last is None or session.last != adjustment:
-        session.last = adjustment
-        session.failed_to_change = 0
-        return True
-
-    session.failed_to_change += 1
-    return session.failed_to_change <= ALLOWED_FAILURES
+    proceed, next_state = track_adjustment(session.snapshot(), current, adjustment)
+    session.restore(next_state)
+    return proceed
+
+
+class HomeColumns(NamedTuple):
+    """Column-oriented HomeInput samples for adjust_many.
+
+    aircon_mode holds AIRCON_MODE_CODES indices and flags holds HomeFlag bits.
+    """
+
+    generation: ArrayLike
+    grid_usage: ArrayLike
+    temperature: ArrayLike
+    humidity: ArrayLike
+    aircon_mode: ArrayLike
+    flags: ArrayLike
+
+    @classmethod
+    def from_inputs(cls, homes: Iterable[HomeInput]) -> HomeColumns:
+        rows = [
+            (h.generation, h.grid_usage, h.temperature, h.humidity, _AIRCON_MODE_INDEX[h.aircon_mode], home_flags(h))
+            for h in homes
+        ]
+        gen, grid, temp, hum, mode, flags = (list(col) for col in zip(*rows, strict=True)) if rows else ([],) * 6
+        return cls(gen, grid, temp, hum, mode, flags)
+
+
+class TargetColumns(NamedTuple):
+    """Result from evaluate_target_many: OUTPUT_CODES (NO_CHANGE for no target), REASON_CODES, is_actionable."""
+
+    outputs: NDArray[np.int8]
+    reasons: NDArray[np.int8]
+    actionable: NDArray[np.bool_]
+
+
+class BatchResult(NamedTuple):
+    """Result from adjust_many: per-sample OUTPUT_CODES / REASON_CODES and the final state."""
+
+    outputs: NDArray[np.int8]
+    reasons: NDArray[np.int8]
+    state: CachedState
+
+
+_AIRCON_MODE_INDEX = {mode: i for i, mode in enumerate(AIRCON_MODE_CODES)}
+# Per-sample counter handling in the adjust_many scan loop.
+_KEEP, _RESET, _TOLERATE = 0, 1, 2
+
+
+def home_flags(home: HomeInput) -> int:
+    """Pack the boolean fields of a HomeInput into HomeFlag bits."""
+    f = HomeFlag(0)
+    for flag, on in (
+        (HomeFlag.HAVE_SOLAR, home.have_solar),
+        (HomeFlag.TIMER, home.timer),
+        (HomeFlag.AUTO, home.auto),
+        (HomeFlag.AGGRESSIVE_COOLING, home.aggressive_cooling),
+        (HomeFlag.ENABLED, home.enabled),
+        (HomeFlag.COOLING_ENABLED, home.cooling_enabled),
+    ):
+        if on:
+            f |= flag
+    return int(f)
+
+
+def evaluate_target_many(
+    config: RuleParameters,
+    generation: ArrayLike,
+    humidity: ArrayLike,
+    aircon_mode: ArrayLike,
+    *,
+    have_solar: ArrayLike = True,
+    aggressive_cooling: ArrayLike = False,
+) -> TargetColumns:
+    """Vectorized _evaluate_target_mode over broadcastable input arrays.
+
+    Inputs broadcast against each other, so a generation column and a humidity
+    row evaluate a full threshold grid. aircon_mode holds AIRCON_MODE_CODES
+    indices. Rules are applied as masks from lowest to highest priority so the
+    first matching branch of the scalar function wins. Requires NumPy.
+    """
+    import numpy as np
+
+    gen, hum, mode, solar, aggressive = np.broadcast_arrays(
+        np.asarray(generation, dtype=np.float64),
+        np.asarray(humidity, dtype=np.float64),
+        np.asarray(aircon_mode),
+        np.asarray(have_solar, dtype=bool),
+        np.asarray(aggressive_cooling, dtype=bool),
+    )
+    is_cool = mode == _AIRCON_MODE_INDEX[AirconMode.COOL]
+    boost = aggressive & (gen >= config.generation_boost_threshold)
+    cool = gen >= config.generation_cool_threshold
+    dry = gen >= config.generation_dry_threshold
+    # Highest priority last: each rule overwrites the ones below it.
+    rules = (
+        (dry, OUT.DRY, R_SOLAR_DRY, True),
+        (dry & (hum < config.dry_mode_humidity_cutoff), OUT.NO_CHANGE, R_HUMIDITY_TOO_LOW, True),
+        (dry & (not config.dry_mode_enabled), OUT.NO_CHANGE, R_DRY_DISABLED, True),
+        (dry & (mode == _AIRCON_MODE_INDEX[AirconMode.DRY]), OUT.NO_CHANGE, R_ALREADY_DRYING, False),
+        (cool, OUT.NO_CHANGE, R_ALREADY_COOLING, False),
+        (cool & ~is_cool, OUT.COOL, R_SOLAR_COOL, True),
+        (boost, OUT.NO_CHANGE, R_BOOST_COOLING, False),
+        (boost & ~is_cool, OUT.COOL, R_BOOST_SOLAR, True),
+        (~solar, OUT.NO_CHANGE, R_NO_SOLAR, True),
+    )
+    outputs = np.full(gen.shape, _OUT[OUT.NO_CHANGE], dtype=np.int8)
+    reasons = np.full(gen.shape, _R[R_INSUFFICIENT_SOLAR], dtype=np.int8)
+    actionable = np.zeros(gen.shape, dtype=bool)
+    for mask, output, reason, is_actionable in rules:
+        np.copyto(outputs, _OUT[output], where=mask)
+        np.copyto(reasons, _R[reason], where=mask)
+        np.copyto(actionable, is_actionable, where=mask)
+    return TargetColumns(outputs, reasons, actionable)
+
+
+def adjust_many(config: RuleParameters, columns: HomeColumns, state: CachedState) -> BatchResult:
+    """Evaluate a time series of inputs, equivalent to calling adjust() once per sample.
+
+    Every branch that does not depend on the tolerance/reactivation counters is
+    resolved with NumPy masks; only those two counters are carried through a
+    scan loop. `state` is not mutated — the final state is returned instead.
+    Requires NumPy.
+    """
+    import numpy as np
+
+    gen = np.asarray(columns.generation, dtype=np.float64)
+    grid = np.asarray(columns.grid_usage, dtype=np.float64)
+    temp = np.asarray(columns.temperature, dtype=np.float64)
+    hum = np.asarray(columns.humidity, dtype=np.float64)
+    mode = np.asarray(columns.aircon_mode, dtype=np.int64)
+    flags = np.asarray(columns.flags, dtype=np.int64)
+
+    have_solar = (flags & HomeFlag.HAVE_SOLAR) != 0
+    timer = (flags & HomeFlag.TIMER) != 0
+    auto = (flags & HomeFlag.AUTO) != 0
+    aggressive = (flags & HomeFlag.AGGRESSIVE_COOLING) != 0
+    enabled = (flags & HomeFlag.ENABLED) != 0
+    cooling_enabled = (flags & HomeFlag.COOLING_ENABLED) != 0
+    is_off = mode == _AIRCON_MODE_INDEX[AirconMode.OFF]
+    is_unknown = mode == _AIRCON_MODE_INDEX[AirconMode.UNKNOWN]
+    boost_gen = gen >= config.generation_boost_threshold
+
+    t_out, t_reason, t_actionable = evaluate_target_many(
+        config, gen, hum, mode, have_solar=have_solar, aggressive_cooling=aggressive
+    )
+    has_target = t_out != _OUT[OUT.NO_CHANGE]
+
+    def idle(default: Reason) -> NDArray[np.integer]:
+        fallback = np.where(t_actionable, t_reason, _R[default])
+        return np.select(
+            [~cooling_enabled, aggressive & (temp <= config.temperature_cool), temp < config.temperature_threshold],
+            [_R[R_COOLING_DISABLED], _R[R_BELOW_COOL_SETPOINT], _R[R_BELOW_THRESHOLD]],
+            fallback,
+        )
+
+    last_timer, last_disabled = state.last is OUT.TIMER, state.last is OUT.DISABLED
+    temp_ok = np.where(aggressive, temp > config.temperature_cool, temp >= config.temperature_threshold)
+    on_grid = ~is_off & (~have_solar | (grid > 0))
+    on_free = ~is_off & ~on_grid
+    nc, nc_reason = _OUT[OUT.NO_CHANGE], _R[R_NO_CHANGE]
+    # (condition, output code, reason code, counter handling) in adjust() branch order.
+    branches = (
+        (~enabled, _OUT[OUT.NO_CHANGE if last_disabled else OUT.DISABLED], _R[R_DISABLED], _RESET),
+        (is_unknown, nc, _R[R_UNKNOWN_MODE], _KEEP),
+        (is_off & cooling_enabled & temp_ok & has_target, t_out, t_reason, _RESET),
+        (is_off & auto, _OUT[OUT.OFF], idle(R_AUTO_IDLE), _RESET),
+        (is_off & (last_timer & ~timer), _OUT[OUT.RESET], _R[R_TIMER_EXPIRED], _RESET),
+        (is_off, nc, idle(R_NO_CHANGE), _RESET),
+        (on_grid & auto & has_target, t_out, t_reason, _RESET),
+        (on_grid & auto & aggressive & have_solar & boost_gen, nc, _R[R_BOOST_GRID_TOLERATED], _RESET),
+        (on_grid & auto, nc, _R[R_GRID_TOLERATED], _TOLERATE),
+        (on_grid & timer, nc, nc_reason, _KEEP),
+        (on_grid & last_timer, _OUT[OUT.OFF], _R[R_TIMER_EXPIRED], _KEEP),
+        (on_grid, _OUT[OUT.TIMER], _R[R_MANUAL], _KEEP),
+        (on_free & auto & has_target, t_out, t_reason, _RESET),
+        (on_free & auto, nc, np.where(t_actionable, t_reason, nc_reason), _RESET),
+    )
+    conds = [cond for cond, *_ in branches]
+    outputs = np.select(conds, [o for _, o, _, _ in branches], nc).astype(np.int8)
+    reasons = np.select(conds, [r for _, _, r, _ in branches], nc_reason).astype(np.int8)
+    counters = np.select(conds, [k for *_, k in branches], _KEEP)
+    gated = enabled & ~is_unknown
+    is_reset = counters == _RESET
+
+    # Scan: only reactivation windows and grid-tolerance samples carry state, so
+    # jump between them; resets in between are counted with prefix sums.
+    gated_idx: list[int] = np.flatnonzero(gated).tolist()
+    resets = np.concatenate(([0], np.cumsum(is_reset)))
+    ungated_resets = np.concatenate(([0], np.cumsum(is_reset & ~gated)))
+    n, rd, tol = len(outputs), state.reactivate_delay, state.tolerated
+    waited: list[int] = []
+    too_high: list[int] = []
+
+    def wait(pos: int, rd: int) -> tuple[int, int]:
+        """Consume the reactivation delay over the next gated samples from `pos`."""
+        g = bisect_left(gated_idx, pos)
+        take = len(gated_idx) - g if rd < 0 else min(rd, len(gated_idx) - g)
+        waited.extend(gated_idx[g : g + take])
+        return (gated_idx[g + take - 1] + 1 if take else n), rd - take
+
+    pos = 0
+    if rd:
+        pos, rd = wait(0, rd)
+        if ungated_resets[pos]:
+            tol = 0
+    for j in np.flatnonzero(counters == _TOLERATE).tolist():
+        if j < pos:
+            continue
+        if resets[j] != resets[pos]:
+            tol = 0
+        tol += 1
+        pos = j + 1
+        if tol >= config.grid_usage_delay:
+            tol, rd = 0, config.reactivate_delay
+            too_high.append(j)
+            if rd:
+                pos, rd = wait(pos, rd)
+    if resets[n] != resets[pos]:
+        tol = 0
+
+    outputs[too_high], reasons[too_high] = _OUT[OUT.OFF], _R[R_GRID_TOO_HIGH]
+    outputs[waited], reasons[waited] = nc, _R[R_REACTIVATE_WAIT]
+    return BatchResult(outputs, reasons, replace(state, reactivate_delay=rd, tolerated=tol))
@@ -0,0 +1,261 @@
+"""Parallel parameter sweep over recorded inputs.
+
+No Home Assistant dependencies; needs NumPy. The history file (JSONL or CSV,
+see replay.py) is read once, smoothed, and saved as .npy columns in a
+temporary directory. Worker processes memory-map those columns, so the
+history is shared through the page cache and never pickled per task. Each
+task replays one RuleParameters combination with replay.Replayer in a closed
+loop: each decision is applied to a simulated aircon, which the next row
+sees instead of the recorded mode. Wherever the simulated aircon runs and
+the recorded one did not (or the other way round), the recorded grid usage
+is shifted by ``--aircon-power``. Each task reports:
+
+- compressor cycles: starts of the simulated aircon (Cool or Dry) from off
+- grid import minutes: simulated running minutes with grid usage > 0
+- solar-cooled minutes: simulated running minutes with solar and no grid usage
+
+The aircon power is one estimate for every mode and hour, so treat the
+results as a relative ranking between combinations rather than a forecast.
+The delays are minutes and run on the row times, as in replay.py.
+
+Usage::
+
+    python scripts/sweep.py history.jsonl \\
+        --generation-cool-threshold 4500 5000 5500 6000 --grid-usage-delay 2 4 6 > sweep.csv
+"""
+
+from __future__ import annotations
+
+import argparse
+import csv
+import os
+import sys
+import tempfile
+from array import array
+from collections.abc import Iterable, Iterator, Mapping, Sequence
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import fields
+from itertools import product
+from multiprocessing import get_context
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, NamedTuple
+
+from .replay import (
+    DEFAULT_PARAMETERS,
+    DEFAULT_SMOOTHING_WINDOW,
+    DEFAULT_STEP_SECONDS,
+    Replayer,
+    add_parameter_arguments,
+    next_time,
+    parse_flag,
+    parse_row,
+    plant_mode,
+    read_rows,
+)
+from .rules import AIRCON_MODE_CODES, AirconMode, HomeFlag, HomeInput, RuleParameters, home_flags, normalized_input
+
+if TYPE_CHECKING:
+    from numpy.typing import NDArray
+
+_COLUMNS = ("generation", "grid_usage", "temperature", "humidity", "aircon_mode", "flags", "auto", "time", "seconds")
+_AIRCON_MODE_INDEX = {mode: i for i, mode in enumerate(AIRCON_MODE_CODES)}
+_ON = frozenset((AirconMode.COOL, AirconMode.DRY))
+_BLOCK = 1 << 16
+_FLAG_BITS = (
+    HomeFlag.HAVE_SOLAR,
+    HomeFlag.TIMER,
+    HomeFlag.AGGRESSIVE_COOLING,
+    HomeFlag.ENABLED,
+    HomeFlag.COOLING_ENABLED,
+)
+DEFAULT_AIRCON_POWER = 2000.0
+
+# Memory-mapped history columns and the aircon's draw in W, set once per worker process by _open_history().
+_history: dict[str, NDArray[Any]] = {}
+_aircon_power = DEFAULT_AIRCON_POWER
+
+
+class SweepResult(NamedTuple):
+    config: RuleParameters
+    compressor_cycles: int
+    grid_import_minutes: float
+    solar_cooled_minutes: float
+
+
+def write_history(
+    rows: Iterable[Mapping[str, Any]],
+    directory: Path,
+    *,
+    smoothing_window: int = DEFAULT_SMOOTHING_WINDOW,
+    step_seconds: float = DEFAULT_STEP_SECONDS,
+) -> int:
+    """Stream `rows` into .npy columns under `directory`; return the number of rows.
+
+    generation holds the smoothed, normalized reading the decision sees, and
+    grid_usage the recorded one, normalized only once simulate() has shifted
+    it by the simulated aircon's draw; auto is -1 where
+    the row leaves auto mode to be tracked from the replayed adjustments; time
+    is the row's epoch seconds (see replay.next_time()) and seconds how long
+    the row lasted.
+    """
+    import numpy as np
+
+    smoother = Replayer(smoothing_window=smoothing_window)
+    floats = {name: array("d") for name in ("generation", "grid_usage", "temperature", "humidity")}
+    modes, flags, autos, times = array("b"), array("h"), array("b"), array("d")
+    now: float | None = None
+    for row in rows:
+        _, home = parse_row(row, auto=False)
+        floats["generation"].append(smoother.smooth(normalized_input(home).generation))
+        for name in ("grid_usage", "temperature", "humidity"):
+            floats[name].append(getattr(home, name))
+        modes.append(_AIRCON_MODE_INDEX[home.aircon_mode])
+        flags.append(home_flags(home))
+        autos.append(-1 if row.get("auto") in (None, "") else int(parse_flag(row["auto"])))
+        now = next_time(row.get("time"), now, step_seconds)
+        times.append(now)
+
+    stamps = np.frombuffer(times, dtype=np.float64)
+    seconds = np.full(len(stamps), step_seconds)
+    if len(stamps) > 1:
+        seconds[:-1] = np.diff(stamps)
+        seconds[-1] = seconds[-2]
+    columns: dict[str, Any] = {name: np.frombuffer(values, dtype=np.float64) for name, values in floats.items()}
+    columns |= {
+        "aircon_mode": np.frombuffer(modes, dtype=np.int8),
+        "flags": np.frombuffer(flags, dtype=np.int16),
+        "auto": np.frombuffer(autos, dtype=np.int8),
+        "time": stamps,
+        "seconds": seconds,
+    }
+    for name in _COLUMNS:
+        np.save(directory / f"{name}.npy", columns[name])
+    return len(stamps)
+
+
+def _open_history(directory: str, aircon_power: float = DEFAULT_AIRCON_POWER) -> None:
+    import numpy as np
+
+    global _aircon_power
+    _aircon_power = aircon_power
+    _history.clear()
+    _history.update({name: np.load(Path(directory) / f"{name}.npy", mmap_mode="r") for name in _COLUMNS})
+
+
+def _blocks() -> Iterator[tuple[list[Any], ...]]:
+    """Decode the mapped history in blocks of _BLOCK rows, so memory stays flat for long histories."""
+    h, n = _history, len(_history["seconds"])
+    for start in range(0, n, _BLOCK):
+        part = slice(start, start + _BLOCK)
+        flags = h["flags"][part]
+        yield (
+            [AIRCON_MODE_CODES[m] for m in h["aircon_mode"][part].tolist()],
+            *(h[name][part].tolist() for name in ("generation", "grid_usage", "temperature", "humidity", "auto")),
+            *(((flags & bit) != 0).tolist() for bit in _FLAG_BITS),
+            h["time"][part].tolist(),
+            h["seconds"][part].tolist(),
+        )
+
+
+def simulate(config: RuleParameters) -> SweepResult:
+    """Replay the history opened in this process with `config`, in a closed loop with a simulated aircon."""
+    replayer, power = Replayer(config, smoothing_window=1), _aircon_power
+    cycles, grid_s, solar_s, running = 0, 0.0, 0.0, False
+    plant: AirconMode | None = None
+    for mode, gen, grid, temp, hum, auto, solar, timer, aggressive, enabled, cooling, time, seconds in _blocks():
+        for i in range(len(seconds)):
+            recorded_on = mode[i] in _ON
+            # The simulated aircon starts as recorded, and follows the recording until its mode is known.
+            plant = mode[i] if plant in (None, AirconMode.UNKNOWN) else plant
+            home = HomeInput(
+                plant,
+                solar[i],
+                gen[i],
+                grid[i] + ((plant in _ON) - recorded_on) * power,
+                timer[i],
+                temp[i],
+                hum[i],
+                replayer.auto if auto[i] < 0 else auto[i] == 1,
+                aggressive[i],
+                enabled[i],
+                cooling[i],
+            )
+            result, _ = replayer.step(normalized_input(home), time[i])
+            plant = plant_mode(result.output, plant)
+            was_running, running = running, plant in _ON
+            if not running:
+                continue
+            cycles += not was_running
+            if grid[i] + (1 - recorded_on) * power > 0:
+                grid_s += seconds[i]
+            elif solar[i]:
+                solar_s += seconds[i]
+    return SweepResult(config, cycles, grid_s / 60, solar_s / 60)
+
+
+def parameter_grid(values: Mapping[str, Sequence[Any]]) -> list[RuleParameters]:
+    """Every combination of `values` (RuleParameters field -> candidates); other fields use the defaults."""
+    names = [f.name for f in fields(RuleParameters)]
+    axes = [values.get(name) or [getattr(DEFAULT_PARAMETERS, name)] for name in names]
+    return [RuleParameters(*combo) for combo in product(*axes)]
+
+
+def sweep(
+    rows: Iterable[Mapping[str, Any]],
+    grid: Sequence[RuleParameters],
+    *,
+    smoothing_window: int = DEFAULT_SMOOTHING_WINDOW,
+    step_seconds: float = DEFAULT_STEP_SECONDS,
+    aircon_power: float = DEFAULT_AIRCON_POWER,
+    workers: int | None = None,
+) -> Iterator[SweepResult]:
+    """Simulate `rows` once per entry of `grid` across a process pool; results come back in grid order."""
+    workers = workers or os.cpu_count() or 1
+    with tempfile.TemporaryDirectory(prefix="home_rules_sweep_") as directory:
+        write_history(rows, Path(directory), smoothing_window=smoothing_window, step_seconds=step_seconds)
+        # spawn: workers must not inherit the caller's threads (or Home Assistant's event loop).
+        context = get_context("spawn")
+        initargs = (directory, aircon_power)
+        with ProcessPoolExecutor(workers, context, initializer=_open_history, initargs=initargs) as pool:
+            yield from pool.map(simulate, grid, chunksize=max(1, len(grid) // (workers * 4)))
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python scripts/sweep.py",
+        description="Replay recorded inputs once per parameter combination and compare the outcomes.",
+    )
+    parser.add_argument("path", type=Path, help="JSONL or CSV file of timestamped inputs")
+    parser.add_argument("--smoothing-window", type=int, default=DEFAULT_SMOOTHING_WINDOW)
+    parser.add_argument("--step-seconds", type=float, default=DEFAULT_STEP_SECONDS, help="row duration without times")
+    parser.add_argument("--aircon-power", type=float, default=DEFAULT_AIRCON_POWER, help="aircon draw in W")
+    parser.add_argument("--workers", type=int, default=None)
+    add_parameter_arguments(parser, many=True)
+    args = parser.parse_args(argv)
+    grid = parameter_grid({f.name: getattr(args, f.name) for f in fields(RuleParameters)})
+    swept = [f.name for f in fields(RuleParameters) if getattr(args, f.name)]
+    writer = csv.writer(sys.stdout)
+    writer.writerow([*swept, "compressor_cycles", "grid_import_minutes", "solar_cooled_minutes"])
+    results = sweep(
+        read_rows(args.path),
+        grid,
+        smoothing_window=args.smoothing_window,
+        step_seconds=args.step_seconds,
+        aircon_power=args.aircon_power,
+        workers=args.workers,
+    )
+    for result in results:
+        row = [getattr(result.config, name) for name in swept]
+        writer.writerow(
+            [
+                *row,
+                result.compressor_cycles,
+                round(result.grid_import_minutes, 1),
+                round(result.solar_cooled_minutes, 1),
+            ]
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
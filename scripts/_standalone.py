@@ -0,0 +1,28 @@
+"""Load Home Rules' pure modules without the integration's package __init__.
+
+custom_components/home_rules/__init__.py sets up the Home Assistant
+integration and so imports homeassistant. The offline tools (replay, sweep,
+explorer) need none of it: the scripts next to this file register a bare
+package module in its place and import the tool modules beneath it.
+"""
+
+from __future__ import annotations
+
+import importlib
+import sys
+from pathlib import Path
+from types import ModuleType
+
+ROOT = Path(__file__).resolve().parent.parent
+PACKAGE = "custom_components.home_rules"
+
+
+def load(name: str) -> ModuleType:
+    """Import custom_components.home_rules.<name> without running the package __init__."""
+    if PACKAGE not in sys.modules:
+        if str(ROOT) not in sys.path:
+            sys.path.insert(0, str(ROOT))
+        package = ModuleType(PACKAGE)
+        package.__path__ = [str(ROOT / "custom_components" / "home_rules")]
+        sys.modules[PACKAGE] = package
+    return importlib.import_module(f"{PACKAGE}.{name}")
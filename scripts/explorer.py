@@ -0,0 +1,11 @@
+"""List the decision states and steady-input cycles of a parameter set; runs without Home Assistant installed.
+
+Usage: python scripts/explorer.py [parameter options]
+"""
+
+from _standalone import load
+
+explorer = load("explorer")
+
+if __name__ == "__main__":
+    raise SystemExit(explorer.main())
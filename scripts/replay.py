@@ -0,0 +1,11 @@
+"""Replay recorded inputs through the rules engine; runs without Home Assistant installed.
+
+Usage: python scripts/replay.py history.jsonl [--smoothing-window 5] [parameter options]
+"""
+
+from _standalone import load
+
+replay = load("replay")
+
+if __name__ == "__main__":
+    raise SystemExit(replay.main())
@@ -0,0 +1,13 @@
+"""Sweep parameter combinations over recorded inputs; runs without Home Assistant installed (needs NumPy).
+
+Usage: python scripts/sweep.py history.jsonl --generation-cool-threshold 5000 5500 [parameter options]
+"""
+
+from _standalone import load
+
+# Loaded at import, not under __main__: spawned workers import this script as __mp_main__
+# and need the package in place before they unpickle their tasks.
+sweep = load("sweep")
+
+if __name__ == "__main__":
+    raise SystemExit(sweep.main())
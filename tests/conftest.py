@@ -19,6 +19,12 @@ else:
     def _enable_custom_integrations(enable_custom_integrations):
         """Enable custom component loading in HA tests."""
 
+    @pytest.fixture(autouse=True)
+    def _config_dir_in_tmp_path(request, tmp_path):
+        """Write evaluation journals under tmp_path rather than the plugin's shared testing config."""
+        if "hass" in request.fixturenames:
+            request.getfixturevalue("hass").config.config_dir = str(tmp_path)
+
     @pytest.fixture
     def coord_factory(hass):
         """Factory fixture: creates an initialized HomeRulesCoordinator with configurable HA states.
@@ -0,0 +1,174 @@
+"""Actuation queue tests (no Home Assistant needed)."""
+
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+from custom_components.home_rules.actuation import ActuationQueue, Call, LatencyHistogram, Outcome, plan_climate
+
+MODE = Call("climate", "set_hvac_mode", {})
+SETPOINT = Call("climate", "set_temperature", {})
+OFF = Call("climate", "turn_off", {})
+
+
+class PermanentError(Exception):
+    pass
+
+
+def make_queue(call, **kwargs) -> tuple[ActuationQueue, list[Outcome]]:
+    outcomes: list[Outcome] = []
+    return ActuationQueue(call, outcomes.append, asyncio.ensure_future, **kwargs), outcomes
+
+
+async def test_stages_run_in_order_and_calls_of_a_stage_together() -> None:
+    log: list[str] = []
+    both_started = asyncio.Barrier(2)
+
+    async def call(c: Call) -> None:
+        log.append(c.service)
+        if c is not MODE:
+            await both_started.wait()  # only returns once both calls of the stage are running
+
+    queue, outcomes = make_queue(call, timeout=1)
+    queue.submit("Cool", [[MODE], [SETPOINT, OFF]])
+    assert queue.busy
+    await queue.wait()
+    assert log == ["set_hvac_mode", "set_temperature", "turn_off"]
+    assert [(o.label, o.ok, o.attempts) for o in outcomes] == [("Cool", True, 3)]
+
+
+async def test_timeouts_are_retried_with_backoff() -> None:
+    attempts = 0
+
+    async def call(c: Call) -> None:
+        nonlocal attempts
+        attempts += 1
+        if attempts < 3:
+            await asyncio.sleep(1)
+
+    queue, outcomes = make_queue(call, timeout=0.01, retries=2, backoff=0.001)
+    queue.submit("Off", [[OFF]])
+    await queue.wait()
+    (outcome,) = outcomes
+    assert (outcome.ok, outcome.attempts, queue.timeouts, queue.calls) == (True, 3, 2, 3)
+
+
+async def test_gives_up_after_the_retries() -> None:
+    async def call(c: Call) -> None:
+        await asyncio.sleep(1)
+
+    queue, outcomes = make_queue(call, timeout=0.01, retries=1, backoff=0.001)
+    queue.submit("Off", [[OFF]])
+    await queue.wait()
+    (outcome,) = outcomes
+    assert (outcome.ok, outcome.attempts, queue.failed) == (False, 2, 1)
+    assert outcome.error == "climate.turn_off timed out after 0.01 s"
+
+
+async def test_permanent_errors_are_not_retried() -> None:
+    async def call(c: Call) -> None:
+        raise PermanentError("no such service")
+
+    queue, outcomes = make_queue(call, permanent=(PermanentError,), backoff=10)
+    queue.submit("Cool", [[MODE], [SETPOINT]])
+    await queue.wait()
+    assert [(o.ok, o.attempts, o.error) for o in outcomes] == [(False, 1, "no such service")]
+
+
+async def test_a_waiting_plan_is_replaced_by_a_newer_one() -> None:
+    release, log = asyncio.Event(), list[str]()
+
+    async def call(c: Call) -> None:
+        log.append(c.service)
+        await release.wait()
+
+    queue, outcomes = make_queue(call)
+    assert queue.submit("Cool", [[MODE]]) == 1
+    await asyncio.sleep(0)  # Cool starts
+    assert queue.submit("Dry", [[MODE]]) == 2
+    assert queue.submit("Off", [[OFF]]) == 3
+    assert queue.as_dict()["active"] == "Cool"
+    assert queue.as_dict()["pending"] == "Off"
+    release.set()
+    await queue.wait()
+    assert log == ["set_hvac_mode", "turn_off"]
+    assert [(o.plan, o.label, o.ok, o.superseded) for o in outcomes] == [
+        (2, "Dry", False, True),
+        (1, "Cool", True, False),
+        (3, "Off", True, False),
+    ]
+    assert queue.superseded == 1
+
+
+async def test_cancel_drops_the_running_plan() -> None:
+    async def call(c: Call) -> None:
+        await asyncio.sleep(10)
+
+    queue, outcomes = make_queue(call)
+    queue.submit("Off", [[OFF]])
+    await asyncio.sleep(0)
+    queue.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await queue.wait()
+    assert not queue.busy
+    assert outcomes == []
+
+
+async def test_a_plan_function_runs_when_the_plan_starts() -> None:
+    log: list[str] = []
+
+    async def call(c: Call) -> None:
+        log.append(c.service)
+
+    def refuse() -> list[list[Call]]:
+        raise ValueError("climate.test does not support hvac_mode dry")
+
+    queue, outcomes = make_queue(call)
+    queue.submit("Dry", refuse)
+    await queue.wait()
+    queue.submit("Off", lambda: [[OFF]])
+    await queue.wait()
+    assert log == ["turn_off"]
+    assert [(o.label, o.ok, o.attempts, o.error) for o in outcomes] == [
+        ("Dry", False, 0, "climate.test does not support hvac_mode dry"),
+        ("Off", True, 1, None),
+    ]
+
+
+def test_plan_climate_sends_only_what_differs() -> None:
+    mode = Call("climate", "set_hvac_mode", {"entity_id": "climate.ac", "hvac_mode": "cool"})
+    setpoint = Call("climate", "set_temperature", {"entity_id": "climate.ac", "temperature": 22.0})
+    assert plan_climate("climate.ac", "cool", 22.0, "off", {}) == ([[mode], [setpoint]], 0)
+    assert plan_climate("climate.ac", "cool", 22.0, "off", {"temperature": 22}) == ([[mode]], 1)
+    assert plan_climate("climate.ac", "cool", 22.0, "cool", {"temperature": 24.0}) == ([[setpoint]], 1)
+    assert plan_climate("climate.ac", "cool", 22.0, "cool", {"temperature": 22.0}) == ([], 2)
+    assert plan_climate("climate.ac", "off", None, "off", {}) == ([], 1)
+    turn_off = Call("climate", "turn_off", {"entity_id": "climate.ac"})
+    assert plan_climate("climate.ac", "off", None, "cool", {}) == ([[turn_off]], 0)
+
+
+def test_plan_climate_accepts_a_setpoint_rounded_to_the_device_step() -> None:
+    assert plan_climate("climate.ac", "cool", 22.5, "cool", {"temperature": 22}) == ([], 2)
+    assert plan_climate("climate.ac", "cool", 22.5, "cool", {"temperature": 23, "target_temp_step": 1}) == ([], 2)
+    assert plan_climate("climate.ac", "cool", 22.5, "cool", {"temperature": 24, "target_temp_step": 1})[1] == 1
+
+
+def test_plan_climate_refuses_modes_the_device_does_not_advertise() -> None:
+    with pytest.raises(ValueError, match="does not support hvac_mode dry"):
+        plan_climate("climate.ac", "dry", 22.0, "off", {}, frozenset({"off", "cool"}))
+    assert plan_climate("climate.ac", "off", None, "cool", {}, frozenset({"cool"}))[0]  # off is always attempted
+
+
+def test_latency_histogram_buckets() -> None:
+    histogram = LatencyHistogram((1.0, 5.0))
+    assert histogram.as_dict()["mean_seconds"] is None
+    for seconds in (0.5, 1.0, 3.0, 12.5):
+        histogram.add(seconds)
+    assert histogram.as_dict() == {
+        "count": 4,
+        "mean_seconds": 4.25,
+        "max_seconds": 12.5,
+        "buckets": {"<=1s": 2, "<=5s": 1, ">5s": 1},
+    }
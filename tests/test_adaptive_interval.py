@@ -0,0 +1,70 @@
+"""Adaptive evaluation interval tests for Home Rules."""
+
+from __future__ import annotations
+
+from datetime import timedelta
+
+import pytest
+
+pytest.importorskip("pytest_homeassistant_custom_component")
+
+POLL_ONLY = {"event_debounce": 0}
+
+
+async def _interval(coord_factory, **states: str) -> int:
+    coordinator = await coord_factory(options=POLL_ONLY, **states)
+    await coordinator.async_run_evaluation("test")
+    assert coordinator.update_interval == timedelta(seconds=coordinator.data.effective_interval)
+    return coordinator.data.effective_interval
+
+
+async def test_night_with_aircon_off_uses_longest_interval(coord_factory) -> None:
+    from custom_components.home_rules.const import DEFAULT_MAX_EVAL_INTERVAL
+
+    assert await _interval(coord_factory, generation="0") == DEFAULT_MAX_EVAL_INTERVAL
+    assert await _interval(coord_factory, inverter="offline") == DEFAULT_MAX_EVAL_INTERVAL
+
+
+async def test_solar_arriving_ends_the_night_interval(hass, coord_factory) -> None:
+    """Poll-only, a generation rise during the longest interval evaluates at once instead of at the next poll."""
+    from custom_components.home_rules.const import DEFAULT_EVAL_INTERVAL, DEFAULT_MAX_EVAL_INTERVAL
+
+    coordinator = await coord_factory(options=POLL_ONLY, generation="0")
+    unsubscribe = coordinator.async_track_inputs()
+    await coordinator.async_run_evaluation("poll")
+    assert coordinator.data.effective_interval == DEFAULT_MAX_EVAL_INTERVAL
+
+    hass.states.async_set("sensor.generation", "150", {"unit_of_measurement": "W"})
+    await hass.async_block_till_done()
+    assert [r["trigger"] for r in coordinator._recent][:2] == ["solar", "poll"]
+    assert coordinator.data.effective_interval == DEFAULT_EVAL_INTERVAL
+
+    hass.states.async_set("sensor.generation", "300", {"unit_of_measurement": "W"})
+    await hass.async_block_till_done()
+    assert len(coordinator._recent) == 2  # daytime intervals stay poll-only
+    unsubscribe()
+
+
+async def test_steady_daytime_uses_configured_interval(coord_factory) -> None:
+    from custom_components.home_rules.const import DEFAULT_EVAL_INTERVAL
+
+    assert await _interval(coord_factory, generation="2000") == DEFAULT_EVAL_INTERVAL
+
+
+@pytest.mark.parametrize("states", [{"generation": "5400"}, {"generation": "6000", "climate": "cool"}])
+async def test_near_threshold_or_running_uses_shortest_interval(coord_factory, states: dict[str, str]) -> None:
+    from custom_components.home_rules.const import DEFAULT_MIN_EVAL_INTERVAL
+
+    assert await _interval(coord_factory, **states) == DEFAULT_MIN_EVAL_INTERVAL
+
+
+async def test_bounds_clamp_the_interval(coord_factory) -> None:
+    from custom_components.home_rules.const import CONF_MAX_EVAL_INTERVAL, CONF_MIN_EVAL_INTERVAL
+
+    coordinator = await coord_factory(generation="2000", options={**POLL_ONLY, CONF_MIN_EVAL_INTERVAL: 300})
+    await coordinator.async_run_evaluation("test")
+    assert coordinator.data.effective_interval == 300
+
+    coordinator = await coord_factory(generation="0", options={**POLL_ONLY, CONF_MAX_EVAL_INTERVAL: 600})
+    await coordinator.async_run_evaluation("test")
+    assert coordinator.data.effective_interval == 600
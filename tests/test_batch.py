@@ -0,0 +1,170 @@
+"""Batch (column) evaluation tests for the rules engine.
+
+adjust_many must agree with calling adjust() once per sample, so most tests
+here are differential checks against the scalar engine.
+"""
+
+from __future__ import annotations
+
+import random
+from dataclasses import replace
+
+import pytest
+
+from custom_components.home_rules.rules import (
+    AIRCON_MODE_CODES,
+    OUTPUT_CODES,
+    REASON_CODES,
+    AirconMode,
+    CachedState,
+    HomeColumns,
+    HomeFlag,
+    HomeInput,
+    HomeOutput,
+    RuleParameters,
+    _evaluate_target_mode,
+    adjust,
+    adjust_many,
+    evaluate_target_many,
+    home_flags,
+)
+
+pytest.importorskip("numpy")
+
+TEST_PARAMS = RuleParameters(
+    generation_cool_threshold=5500,
+    generation_dry_threshold=3500,
+    generation_boost_threshold=500,
+    temperature_threshold=24,
+    dry_mode_humidity_cutoff=65,
+    dry_mode_enabled=True,
+    grid_usage_delay=2,
+    reactivate_delay=2,
+    temperature_cool=22,
+)
+
+
+def random_home(rng: random.Random) -> HomeInput:
+    """Inputs clustered around the thresholds so every branch is exercised."""
+    return HomeInput(
+        aircon_mode=rng.choice(list(AirconMode)),
+        have_solar=rng.random() < 0.85,
+        generation=rng.choice([0.0, 499.0, 500.0, 3499.0, 3500.0, 5499.0, 5500.0, rng.uniform(0, 8000)]),
+        grid_usage=rng.choice([0.0, 0.0, 0.1, rng.uniform(0, 2000)]),
+        timer=rng.random() < 0.2,
+        temperature=rng.choice([21.9, 22.0, 22.1, 23.9, 24.0, rng.uniform(15, 35)]),
+        humidity=rng.choice([64.9, 65.0, rng.uniform(20, 90)]),
+        auto=rng.random() < 0.6,
+        aggressive_cooling=rng.random() < 0.3,
+        enabled=rng.random() < 0.9,
+        cooling_enabled=rng.random() < 0.9,
+    )
+
+
+def scalar_run(params: RuleParameters, homes: list[HomeInput], state: CachedState):
+    state = replace(state)
+    results = [adjust(params, h, state) for h in homes]
+    return results, state
+
+
+def test_home_flags_round_trip() -> None:
+    h = HomeInput(AirconMode.COOL, True, 0.0, 0.0, False, 24.0, 50.0, True, False, True, True)
+    assert home_flags(h) == HomeFlag.HAVE_SOLAR | HomeFlag.AUTO | HomeFlag.ENABLED | HomeFlag.COOLING_ENABLED
+
+
+def test_empty_batch_returns_initial_state() -> None:
+    state = CachedState(reactivate_delay=1, tolerated=1, last=HomeOutput.COOL)
+    result = adjust_many(TEST_PARAMS, HomeColumns.from_inputs([]), state)
+    assert len(result.outputs) == 0
+    assert result.state == state
+
+
+def test_input_state_is_not_mutated() -> None:
+    state = CachedState(reactivate_delay=2)
+    homes = [HomeInput(AirconMode.OFF, True, 6000.0, 0.0, False, 25.0, 40.0, True, False, True, True)] * 3
+    result = adjust_many(TEST_PARAMS, HomeColumns.from_inputs(homes), state)
+    assert state.reactivate_delay == 2
+    assert result.state.reactivate_delay == 0
+
+
+def test_tolerance_then_reactivate_sequence() -> None:
+    """COOL on grid: tolerated, shut off, then the reactivation wait kicks in."""
+    on_grid = HomeInput(AirconMode.COOL, True, 2000.0, 500.0, False, 25.0, 40.0, True, False, True, True)
+    off = replace(on_grid, aircon_mode=AirconMode.OFF, generation=6000.0, grid_usage=0.0)
+    homes = [on_grid, on_grid, off, off, off]
+    result = adjust_many(TEST_PARAMS, HomeColumns.from_inputs(homes), CachedState())
+    assert [OUTPUT_CODES[o] for o in result.outputs] == [
+        HomeOutput.NO_CHANGE,
+        HomeOutput.OFF,
+        HomeOutput.NO_CHANGE,
+        HomeOutput.NO_CHANGE,
+        HomeOutput.COOL,
+    ]
+
+
+@pytest.mark.parametrize("seed", range(20))
+@pytest.mark.parametrize("last", [None, HomeOutput.TIMER, HomeOutput.DISABLED, HomeOutput.COOL])
+def test_matches_scalar_adjust(seed: int, last: HomeOutput | None) -> None:
+    rng = random.Random(seed)  # noqa: S311
+    params = replace(
+        TEST_PARAMS,
+        dry_mode_enabled=rng.random() < 0.7,
+        grid_usage_delay=rng.randint(0, 4),
+        reactivate_delay=rng.randint(0, 3),
+    )
+    homes = [random_home(rng) for _ in range(400)]
+    state = CachedState(reactivate_delay=rng.randint(0, 2), tolerated=rng.randint(0, 2), last=last)
+
+    expected, expected_state = scalar_run(params, homes, state)
+    result = adjust_many(params, HomeColumns.from_inputs(homes), state)
+
+    assert [(OUTPUT_CODES[o], REASON_CODES[r]) for o, r in zip(result.outputs, result.reasons, strict=True)] == [
+        (e.output, e.reason) for e in expected
+    ]
+    assert result.state == expected_state
+
+
+@pytest.mark.parametrize("dry_mode_enabled", [True, False])
+def test_evaluate_target_many_matches_scalar_over_grid(dry_mode_enabled: bool) -> None:
+    """Every cell of a generation x humidity x mode x flags grid matches _evaluate_target_mode."""
+    import numpy as np
+
+    params = replace(TEST_PARAMS, dry_mode_enabled=dry_mode_enabled)
+    gens = np.array([0.0, 499.0, 500.0, 3499.0, 3500.0, 5499.0, 5500.0, 9000.0])
+    hums = np.array([64.9, 65.0, 80.0])
+    modes = np.arange(len(AIRCON_MODE_CODES))
+    solar = np.array([True, False])
+    boost = np.array([True, False])
+    g, h, m, s, b = np.meshgrid(gens, hums, modes, solar, boost, indexing="ij")
+
+    result = evaluate_target_many(params, g, h, m, have_solar=s, aggressive_cooling=b)
+
+    assert result.outputs.shape == g.shape
+    for idx in np.ndindex(g.shape):
+        home = HomeInput(
+            AIRCON_MODE_CODES[m[idx]], bool(s[idx]), float(g[idx]), 0.0, False, 24.0, float(h[idx]), True,
+            bool(b[idx]), True, True,
+        )  # fmt: skip
+        expected = _evaluate_target_mode(params, home)
+        output = OUTPUT_CODES[result.outputs[idx]]
+        assert (None if output is HomeOutput.NO_CHANGE else output) == expected.output
+        assert REASON_CODES[result.reasons[idx]] == expected.reason
+        assert bool(result.actionable[idx]) is expected.is_actionable
+
+
+def test_evaluate_target_many_broadcasts_scalars() -> None:
+    """A generation row against a humidity column yields a 2-D heatmap."""
+    import numpy as np
+
+    off = AIRCON_MODE_CODES.index(AirconMode.OFF)
+    result = evaluate_target_many(TEST_PARAMS, np.linspace(0, 8000, 5), np.array([[50.0], [70.0]]), off)
+
+    assert result.outputs.shape == (2, 5)
+    assert REASON_CODES[result.reasons[0, 2]] == "Humidity too low for dry mode"
+    assert [OUTPUT_CODES[o] for o in result.outputs[1]] == [
+        HomeOutput.NO_CHANGE,
+        HomeOutput.NO_CHANGE,
+        HomeOutput.DRY,
+        HomeOutput.COOL,
+        HomeOutput.COOL,
+    ]
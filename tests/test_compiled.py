@@ -0,0 +1,138 @@
+"""Compiled decision table tests.
+
+CompiledRules must be indistinguishable from rules.adjust(), including the
+state mutations, so these are differential tests over randomized inputs.
+"""
+
+from __future__ import annotations
+
+import random
+from dataclasses import replace
+
+import pytest
+
+from custom_components.home_rules.compiled import EngineStats, compile_rules
+from custom_components.home_rules.rules import (
+    AirconMode,
+    CachedState,
+    HomeInput,
+    HomeOutput,
+    RuleParameters,
+    SessionState,
+    adjust,
+    branch,
+    transition,
+)
+
+TEST_PARAMS = RuleParameters(
+    generation_cool_threshold=5500,
+    generation_dry_threshold=3500,
+    generation_boost_threshold=500,
+    temperature_threshold=24,
+    dry_mode_humidity_cutoff=65,
+    dry_mode_enabled=True,
+    grid_usage_delay=2,
+    reactivate_delay=2,
+    temperature_cool=22,
+)
+
+
+def random_home(rng: random.Random) -> HomeInput:
+    return HomeInput(
+        aircon_mode=rng.choice(list(AirconMode)),
+        have_solar=rng.random() < 0.85,
+        generation=rng.choice([0.0, 499.0, 500.0, 3499.0, 3500.0, 5499.0, 5500.0, rng.uniform(0, 8000)]),
+        grid_usage=rng.choice([0.0, 0.0, 0.1, rng.uniform(0, 2000)]),
+        timer=rng.random() < 0.2,
+        temperature=rng.choice([21.9, 22.0, 22.1, 23.9, 24.0, rng.uniform(15, 35)]),
+        humidity=rng.choice([64.9, 65.0, rng.uniform(20, 90)]),
+        auto=rng.random() < 0.6,
+        aggressive_cooling=rng.random() < 0.3,
+        enabled=rng.random() < 0.9,
+        cooling_enabled=rng.random() < 0.9,
+    )
+
+
+@pytest.mark.parametrize("seed", range(30))
+def test_compiled_matches_branchy_adjust(seed: int) -> None:
+    rng = random.Random(seed)  # noqa: S311
+    params = replace(
+        TEST_PARAMS,
+        generation_boost_threshold=rng.choice([500.0, 4000.0, 6000.0]),
+        dry_mode_enabled=rng.random() < 0.7,
+        grid_usage_delay=rng.randint(0, 4),
+        reactivate_delay=rng.randint(0, 3),
+    )
+    compiled = compile_rules(params)
+    last = rng.choice([None, *HomeOutput])
+    expected_state = CachedState(reactivate_delay=rng.randint(0, 2), tolerated=rng.randint(0, 2), last=last)
+    state = replace(expected_state)
+
+    for _ in range(500):
+        h = random_home(rng)
+        assert compiled.adjust(h, state) == adjust(params, h, expected_state)
+        assert state == expected_state
+        if rng.random() < 0.1:  # the coordinator changes `last` between evaluations
+            state.last = expected_state.last = rng.choice([None, *HomeOutput])
+
+
+def test_table_fills_lazily_and_reuses_cells() -> None:
+    compiled = compile_rules(TEST_PARAMS)
+    h = HomeInput(AirconMode.OFF, True, 6000.0, 0.0, False, 25.0, 40.0, True, False, True, True)
+    assert len(compiled) == 0
+    compiled.adjust(h, CachedState())
+    compiled.adjust(replace(h, generation=7000.0, temperature=30.0), CachedState())
+    assert len(compiled) == 1
+
+
+def test_input_class_changes_only_across_an_edge() -> None:
+    compiled = compile_rules(TEST_PARAMS)
+    h = HomeInput(AirconMode.OFF, True, 6000.0, 0.0, False, 25.0, 40.0, True, False, True, True)
+    same = compiled.input_class(h, None)
+    assert compiled.input_class(replace(h, generation=9000.0, temperature=30.0, humidity=50.0), None) == same
+    for crossed in (
+        replace(h, generation=5499.0),
+        replace(h, grid_usage=0.1),
+        replace(h, temperature=23.9),
+        replace(h, humidity=65.0),
+        replace(h, aircon_mode=AirconMode.COOL),
+    ):
+        assert compiled.input_class(crossed, None) != same
+    assert compiled.input_class(h, HomeOutput.TIMER) != same
+
+
+def test_nan_inputs_fall_back_to_branchy_engine() -> None:
+    compiled = compile_rules(TEST_PARAMS)
+    h = HomeInput(AirconMode.OFF, True, float("nan"), 0.0, False, float("nan"), 40.0, True, False, True, True)
+    assert compiled.adjust(h, CachedState()) == adjust(TEST_PARAMS, h, CachedState())
+
+
+@pytest.mark.parametrize("seed", range(10))
+def test_compiled_transition_matches_pure_transition(seed: int) -> None:
+    rng = random.Random(seed)  # noqa: S311
+    compiled = compile_rules(replace(TEST_PARAMS, grid_usage_delay=rng.randint(0, 4)))
+    state = SessionState(reactivate_delay=rng.randint(0, 2), last=rng.choice([None, *HomeOutput]))
+    for _ in range(300):
+        h = random_home(rng)
+        expected = transition(compiled.config, h, state)
+        assert compiled.transition(h, state) == expected
+        state = expected.state
+
+
+def test_engine_stats_count_every_adjust_without_changing_results() -> None:
+    rng = random.Random(7)  # noqa: S311
+    stats = EngineStats()
+    plain, counted = compile_rules(TEST_PARAMS), compile_rules(TEST_PARAMS, stats)
+    plain_state, counted_state = CachedState(), CachedState()
+    expected_branches: dict[str, int] = {}
+    for _ in range(200):
+        h = random_home(rng)
+        name = branch(h, counted_state)
+        expected_branches[name] = expected_branches.get(name, 0) + 1
+        assert counted.adjust(h, counted_state) == plain.adjust(h, plain_state)
+
+    report = stats.as_dict()
+    assert report["evaluations"] == 200
+    assert report["branches"] == expected_branches
+    assert sum(report["reasons"].values()) == 200
+    assert report["adjust_seconds"] > 0
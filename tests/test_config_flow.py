@@ -66,6 +66,7 @@ async def test_config_flow_happy_path_creates_entry(hass) -> None:
         CONF_AIRCON_TIMER_DURATION,
         CONF_CLIMATE_ENTITY_ID,
         CONF_EVAL_INTERVAL,
+        CONF_EVENT_DEBOUNCE,
         CONF_GENERATION_BOOST_THRESHOLD,
         CONF_GENERATION_COOL_THRESHOLD,
         CONF_GENERATION_DRY_THRESHOLD,
@@ -73,16 +74,25 @@ async def test_config_flow_happy_path_creates_entry(hass) -> None:
         CONF_GRID_ENTITY_ID,
         CONF_GRID_USAGE_DELAY,
         CONF_HUMIDITY_ENTITY_ID,
+        CONF_MAX_EVAL_INTERVAL,
+        CONF_MIN_EVAL_INTERVAL,
+        CONF_OSCILLATION_WINDOW,
         CONF_REACTIVATE_DELAY,
+        CONF_SAVE_DELAY,
         CONF_SMOOTHING_WINDOW,
         CONF_TEMPERATURE_ENTITY_ID,
         DEFAULT_AIRCON_TIMER_DURATION,
         DEFAULT_EVAL_INTERVAL,
+        DEFAULT_EVENT_DEBOUNCE,
         DEFAULT_GENERATION_BOOST_THRESHOLD,
         DEFAULT_GENERATION_COOL_THRESHOLD,
         DEFAULT_GENERATION_DRY_THRESHOLD,
         DEFAULT_GRID_USAGE_DELAY,
+        DEFAULT_MAX_EVAL_INTERVAL,
+        DEFAULT_MIN_EVAL_INTERVAL,
+        DEFAULT_OSCILLATION_WINDOW,
         DEFAULT_REACTIVATE_DELAY,
+        DEFAULT_SAVE_DELAY,
         DEFAULT_SMOOTHING_WINDOW,
     )
 
@@ -113,6 +123,11 @@ async def test_config_flow_happy_path_creates_entry(hass) -> None:
         CONF_GRID_USAGE_DELAY: DEFAULT_GRID_USAGE_DELAY,
         CONF_REACTIVATE_DELAY: DEFAULT_REACTIVATE_DELAY,
         CONF_SMOOTHING_WINDOW: DEFAULT_SMOOTHING_WINDOW,
+        CONF_OSCILLATION_WINDOW: DEFAULT_OSCILLATION_WINDOW,
+        CONF_EVENT_DEBOUNCE: DEFAULT_EVENT_DEBOUNCE,
+        CONF_MIN_EVAL_INTERVAL: DEFAULT_MIN_EVAL_INTERVAL,
+        CONF_MAX_EVAL_INTERVAL: DEFAULT_MAX_EVAL_INTERVAL,
+        CONF_SAVE_DELAY: DEFAULT_SAVE_DELAY,
     }
 
 
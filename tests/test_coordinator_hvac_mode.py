@@ -27,6 +27,7 @@ async def test_execute_adjustment_sets_explicit_hvac_mode(hass, coord_factory) -
 
     coordinator = await coord_factory()
     await coordinator.async_set_mode(ControlMode.SOLAR_COOLING)
+    await hass.async_block_till_done()  # commands run in the actuation queue, after the evaluation returns
 
     assert calls == [
         ("climate", "set_hvac_mode", {"entity_id": "climate.test", "hvac_mode": "cool"}),
@@ -36,3 +37,258 @@ async def test_execute_adjustment_sets_explicit_hvac_mode(hass, coord_factory) -
             {"entity_id": "climate.test", "temperature": coordinator.parameters.temperature_cool},
         ),
     ]
+
+
+async def test_slow_climate_does_not_hold_the_evaluation(hass, coord_factory) -> None:
+    """Evaluations return, and release the lock, while the climate commands are still running."""
+    import asyncio
+
+    from custom_components.home_rules.const import ControlMode
+    from custom_components.home_rules.rules import HomeOutput
+
+    release = asyncio.Event()
+    calls: list[str] = []
+
+    async def slow_service(call) -> None:
+        calls.append(call.service)
+        await release.wait()
+
+    hass.services.async_register("climate", "set_hvac_mode", slow_service)
+    hass.services.async_register("climate", "set_temperature", slow_service)
+
+    coordinator = await coord_factory()
+    await coordinator.async_set_mode(ControlMode.SOLAR_COOLING)
+    assert coordinator.data.adjustment is HomeOutput.COOL
+    assert not coordinator._lock.locked()
+    assert (calls, coordinator.actuation["active"]) == (["set_hvac_mode"], "Cool")
+
+    release.set()
+    await hass.async_block_till_done()
+    assert calls == ["set_hvac_mode", "set_temperature"]
+    assert coordinator.actuation["recent"][0] | {"seconds": 0} == {
+        "plan": 1,
+        "label": "Cool",
+        "ok": True,
+        "attempts": 2,
+        "seconds": 0,
+        "error": None,
+        "superseded": False,
+    }
+
+
+async def test_failed_command_counts_as_a_failed_change(hass, coord_factory) -> None:
+    """A command that still fails after its retries bumps the failure counter and raises a repair issue."""
+    from homeassistant.exceptions import HomeAssistantError
+    from homeassistant.helpers import issue_registry as ir
+
+    from custom_components.home_rules.const import DOMAIN, ISSUE_RUNTIME, ControlMode
+
+    async def failing_service(call) -> None:
+        raise HomeAssistantError("cloud unreachable")
+
+    hass.services.async_register("climate", "set_hvac_mode", failing_service)
+    coordinator = await coord_factory()
+    coordinator._actuation.backoff = 0
+    await coordinator.async_set_mode(ControlMode.SOLAR_COOLING)
+    await hass.async_block_till_done()
+
+    assert coordinator._session.failed_to_change == 1
+    assert coordinator.actuation["recent"][0]["attempts"] == coordinator._actuation.retries + 1
+    issue = ir.async_get(hass).async_get_issue(DOMAIN, f"{coordinator.config_entry.entry_id}_{ISSUE_RUNTIME}")
+    assert issue is not None
+    assert issue.translation_placeholders == {"error": "failed to apply Cool: cloud unreachable"}
+
+
+async def test_command_is_confirmed_by_the_climate_state(hass, coord_factory) -> None:
+    """The climate entity reporting the commanded mode and setpoint confirms the command and records its latency."""
+    from custom_components.home_rules.const import ControlMode
+
+    async def climate_service(call) -> None:
+        state = hass.states.get("climate.test")
+        if call.service == "set_hvac_mode":
+            hass.states.async_set("climate.test", call.data["hvac_mode"], state.attributes)
+        else:
+            attributes = {**state.attributes, "temperature": call.data["temperature"]}
+            hass.states.async_set("climate.test", state.state, attributes)
+
+    hass.services.async_register("climate", "set_hvac_mode", climate_service)
+    hass.services.async_register("climate", "set_temperature", climate_service)
+    coordinator = await coord_factory()
+    coordinator._session.failed_to_change = 2
+    await coordinator.async_set_mode(ControlMode.SOLAR_COOLING)
+    await hass.async_block_till_done()
+
+    actuation = coordinator.actuation
+    assert (actuation["confirmed"], actuation["unconfirmed"], actuation["awaiting_confirmation"]) == (1, 0, None)
+    assert actuation["apply_latency"]["count"] == 1
+    assert actuation["apply_latency"]["buckets"]["<=1s"] == 1
+    assert coordinator._session.failed_to_change == 0
+
+
+async def test_a_replaced_plan_failing_is_not_a_failed_change(hass, coord_factory) -> None:
+    """Only the plan for the latest decision counts; an older one failing after it was replaced does not."""
+    import asyncio
+
+    from homeassistant.exceptions import HomeAssistantError
+    from homeassistant.helpers import issue_registry as ir
+
+    from custom_components.home_rules.const import DOMAIN, ISSUE_RUNTIME, ControlMode
+    from custom_components.home_rules.rules import HomeOutput
+
+    release = asyncio.Event()
+
+    async def failing_service(call) -> None:
+        await release.wait()
+        raise HomeAssistantError("cloud unreachable")
+
+    async def turn_off(call) -> None:
+        hass.states.async_set("climate.test", "off", hass.states.get("climate.test").attributes)
+
+    hass.services.async_register("climate", "set_hvac_mode", failing_service)
+    hass.services.async_register("climate", "turn_off", turn_off)
+    coordinator = await coord_factory()
+    coordinator._actuation.retries = 0
+    await coordinator.async_set_mode(ControlMode.SOLAR_COOLING)
+    coordinator._execute_adjustment(HomeOutput.OFF)
+    release.set()
+    await hass.async_block_till_done()
+
+    assert [(r["label"], r["ok"]) for r in coordinator.actuation["recent"]] == [("Off", True), ("Cool", False)]
+    assert coordinator._session.failed_to_change == 0
+    assert coordinator.actuation["confirmed"] == 1
+    assert ir.async_get(hass).async_get_issue(DOMAIN, f"{coordinator.config_entry.entry_id}_{ISSUE_RUNTIME}") is None
+
+
+async def test_setpoint_confirmation_uses_the_planning_tolerance(hass, coord_factory) -> None:
+    """A setpoint the entity reports more than one step off does not confirm the command."""
+    from custom_components.home_rules.const import ControlMode
+
+    async def climate_service(call) -> None:
+        state = hass.states.get("climate.test")
+        if call.service == "set_hvac_mode":
+            hass.states.async_set("climate.test", call.data["hvac_mode"], state.attributes)
+        else:
+            attributes = {**state.attributes, "temperature": call.data["temperature"] + 1.0}
+            hass.states.async_set("climate.test", state.state, attributes)
+
+    hass.services.async_register("climate", "set_hvac_mode", climate_service)
+    hass.services.async_register("climate", "set_temperature", climate_service)
+    coordinator = await coord_factory()
+    await coordinator.async_set_mode(ControlMode.SOLAR_COOLING)
+    await hass.async_block_till_done()
+
+    assert (coordinator.actuation["confirmed"], coordinator.actuation["awaiting_confirmation"]) == (0, "Cool")
+    coordinator._stop_confirming()
+
+
+@pytest.mark.parametrize("attributes", [{"target_temp_step": 1}, {}])
+async def test_a_device_rounding_the_setpoint_confirms_it(hass, coord_factory, attributes) -> None:
+    """A whole-degree device reporting 23 for a 22.5 setpoint has applied the command."""
+    import math
+
+    from custom_components.home_rules.const import CONF_TEMPERATURE_COOL, ControlMode
+
+    async def climate_service(call) -> None:
+        state = hass.states.get("climate.test")
+        if call.service == "set_hvac_mode":
+            hass.states.async_set("climate.test", call.data["hvac_mode"], state.attributes)
+        else:
+            rounded = math.floor(call.data["temperature"] + 0.5)
+            hass.states.async_set("climate.test", state.state, {**state.attributes, "temperature": rounded})
+
+    hass.states.async_set("climate.test", "off", attributes)
+    hass.services.async_register("climate", "set_hvac_mode", climate_service)
+    hass.services.async_register("climate", "set_temperature", climate_service)
+    coordinator = await coord_factory(options={CONF_TEMPERATURE_COOL: 22.5})
+    await coordinator.async_set_mode(ControlMode.SOLAR_COOLING)
+    await hass.async_block_till_done()
+
+    assert hass.states.get("climate.test").attributes["temperature"] == 23
+    assert (coordinator.actuation["confirmed"], coordinator.actuation["awaiting_confirmation"]) == (1, None)
+    assert [(r["label"], r["ok"]) for r in coordinator.actuation["recent"]] == [("Cool", True)]
+    assert coordinator._session.failed_to_change == 0
+
+
+async def test_apply_latency_starts_when_the_plan_does(hass, coord_factory) -> None:
+    """Time a command spends queued behind an earlier one is not counted as apply latency."""
+    import asyncio
+    from unittest.mock import patch
+
+    from custom_components.home_rules.const import ControlMode
+    from custom_components.home_rules.rules import HomeOutput
+
+    release, clock = asyncio.Event(), [0.0]
+
+    async def slow_service(call) -> None:
+        await release.wait()
+
+    async def turn_off(call) -> None:
+        hass.states.async_set("climate.test", "off", hass.states.get("climate.test").attributes)
+
+    hass.services.async_register("climate", "set_hvac_mode", slow_service)
+    hass.services.async_register("climate", "set_temperature", slow_service)
+    hass.services.async_register("climate", "turn_off", turn_off)
+    coordinator = await coord_factory()
+    with patch("custom_components.home_rules.coordinator.monotonic", lambda: clock[0]):
+        await coordinator.async_set_mode(ControlMode.SOLAR_COOLING)
+        coordinator._execute_adjustment(HomeOutput.OFF)  # waits behind the Cool plan
+        clock[0] = 50.0
+        release.set()
+        await hass.async_block_till_done()
+
+    latency = coordinator.actuation["apply_latency"]
+    assert (latency["count"], latency["max_seconds"]) == (1, 0.0)
+
+
+async def test_unconfirmed_command_times_out(hass, coord_factory) -> None:
+    """A command the climate entity never reflects counts as a failure after the timeout, not on the next poll."""
+    from datetime import timedelta
+
+    from homeassistant.util import dt as dt_util
+    from pytest_homeassistant_custom_component.common import async_fire_time_changed
+
+    from custom_components.home_rules.const import CONFIRMATION_TIMEOUT, ControlMode
+    from custom_components.home_rules.rules import HomeOutput
+
+    async def ignored(call) -> None:
+        pass
+
+    hass.services.async_register("climate", "set_hvac_mode", ignored)
+    hass.services.async_register("climate", "set_temperature", ignored)
+    coordinator = await coord_factory()
+    await coordinator.async_set_mode(ControlMode.SOLAR_COOLING)
+    await hass.async_block_till_done()
+    await coordinator.async_run_evaluation("poll")  # the same decision again
+    await hass.async_block_till_done()
+    assert coordinator.data.adjustment is HomeOutput.COOL
+    assert coordinator._session.failed_to_change == 0
+    assert coordinator.actuation["awaiting_confirmation"] == "Cool"
+
+    async_fire_time_changed(hass, dt_util.utcnow() + timedelta(seconds=CONFIRMATION_TIMEOUT + 1))
+    await hass.async_block_till_done()
+    assert (coordinator.actuation["unconfirmed"], coordinator.actuation["awaiting_confirmation"]) == (1, None)
+    assert coordinator._session.failed_to_change == 1
+
+
+async def test_commands_the_climate_already_reflects_are_skipped(hass, coord_factory) -> None:
+    """Only the calls that change something are sent; the advertised modes are cached per entity."""
+    from custom_components.home_rules.const import ControlMode
+
+    calls: list[str] = []
+
+    async def climate_service(call) -> None:
+        calls.append(call.service)
+        hass.states.async_set("climate.test", call.data["hvac_mode"], hass.states.get("climate.test").attributes)
+
+    hass.services.async_register("climate", "set_hvac_mode", climate_service)
+    coordinator = await coord_factory()
+    temperature = coordinator.parameters.temperature_cool
+    hass.states.async_set("climate.test", "off", {"temperature": temperature, "hvac_modes": ["off", "cool"]})
+    await coordinator.async_set_mode(ControlMode.SOLAR_COOLING)
+    await hass.async_block_till_done()
+
+    assert calls == ["set_hvac_mode"]
+    actuation = coordinator.actuation
+    assert [(d["sent"], d["skipped"], d["refused"]) for d in actuation["commands"]] == [(1, 1, 0)]
+    assert actuation["hvac_modes"] == {"climate.test": ["cool", "off"]}
+    assert actuation["confirmed"] == 1
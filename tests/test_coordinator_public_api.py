@@ -81,6 +81,26 @@ async def test_async_set_control_disables_dry_mode(coord_factory) -> None:
     assert coordinator.data.reason == "Dry mode disabled"
 
 
+async def test_parameters_snapshot_is_rebuilt_only_after_a_change(coord_factory) -> None:
+    from custom_components.home_rules.const import CONF_TEMPERATURE_THRESHOLD
+
+    coordinator = await coord_factory()
+    await coordinator.async_run_evaluation("manual")
+    params, version, rules = coordinator.parameters, coordinator.parameters_version, coordinator._compiled
+    await coordinator.async_run_evaluation("manual")
+    assert coordinator.parameters is params
+    assert (coordinator.parameters_version, coordinator._compiled) == (version, rules)
+
+    await coordinator.async_set_parameter(CONF_TEMPERATURE_THRESHOLD, 27.0)
+    assert coordinator.parameters.temperature_threshold == 27.0
+    assert coordinator.parameters_version == version + 1
+    assert coordinator._compiled is not rules
+
+    await coordinator.async_set_control("dry_mode_enabled", False)
+    assert coordinator.parameters.dry_mode_enabled is False
+    assert coordinator.parameters_version == version + 2
+
+
 async def test_evaluation_fires_ha_event(hass, coord_factory) -> None:
     """Each evaluation fires an EVENT_EVALUATION event on the HA event bus."""
     from custom_components.home_rules.const import EVENT_EVALUATION
@@ -94,3 +114,265 @@ async def test_evaluation_fires_ha_event(hass, coord_factory) -> None:
 
     assert len(events) == 1
     assert events[0].data["trigger"] == "characterization"
+
+
+async def test_history_stores_codes_and_displays_strings(hass, coord_factory) -> None:
+    """History records hold integer codes; events and diagnostics get display strings."""
+    from custom_components.home_rules.const import EVENT_EVALUATION
+    from custom_components.home_rules.coordinator import display_record
+    from custom_components.home_rules.rules import HomeOutput, Reason
+
+    events: list[Any] = []
+    hass.bus.async_listen(EVENT_EVALUATION, lambda e: events.append(e))
+
+    coordinator = await coord_factory()
+    await coordinator.async_run_evaluation("codes")
+    await hass.async_block_till_done()
+
+    record = coordinator._last_record
+    assert record["adjustment"] == HomeOutput.COOL.code
+    assert record["reason"] == Reason.SOLAR_COOL.code
+    assert display_record(record)["adjustment"] == "Cool"
+    assert events[0].data["reason"] == "Solar above cool threshold"
+    assert coordinator.data.decision == "Cool - Solar above cool threshold"
+
+
+async def test_legacy_string_history_is_converted_on_load(hass, coord_factory) -> None:
+    """Records persisted as strings by older versions load as codes."""
+    from homeassistant.helpers.storage import Store
+
+    from custom_components.home_rules.const import DOMAIN, STORAGE_VERSION
+    from custom_components.home_rules.coordinator import HomeRulesCoordinator
+    from custom_components.home_rules.rules import HomeOutput, Reason
+
+    coordinator = await coord_factory()
+    store: Store[dict[str, Any]] = Store(hass, STORAGE_VERSION, f"{DOMAIN}_{coordinator.config_entry.entry_id}")
+    legacy = {"adjustment": "Cool", "reason": "Solar above cool threshold", "blocked_reasons": ["Dry mode disabled"]}
+    await store.async_save({"session": {"last": "Cool"}, "recent_evaluations": [legacy]})
+
+    reloaded = HomeRulesCoordinator(hass, coordinator.config_entry)
+    await reloaded.async_initialize()
+
+    assert reloaded._session.last is HomeOutput.COOL
+    assert reloaded._recent[0]["adjustment"] == HomeOutput.COOL.code
+    assert reloaded._recent[0]["reason"] == Reason.SOLAR_COOL.code
+    assert reloaded._recent[0]["blocked_reasons"] == [Reason.DRY_DISABLED.code]
+
+
+async def test_tick_session_is_migrated_to_deadlines(hass, coord_factory, freezer) -> None:
+    """Stored evaluation counters become deadlines at the configured interval and survive a reload."""
+    from homeassistant.helpers.storage import Store
+    from homeassistant.util import dt as dt_util
+
+    from custom_components.home_rules.const import DOMAIN, STORAGE_VERSION
+    from custom_components.home_rules.coordinator import HomeRulesCoordinator
+    from custom_components.home_rules.rules import Deadlines
+
+    coordinator = await coord_factory()
+    store: Store[dict[str, Any]] = Store(hass, STORAGE_VERSION, f"{DOMAIN}_{coordinator.config_entry.entry_id}")
+    await store.async_save({"session": {"last": 0, "reactivate_delay": 2, "tolerated": 1}})
+
+    now = dt_util.utcnow().timestamp()
+    reloaded = HomeRulesCoordinator(hass, coordinator.config_entry)
+    await reloaded.async_initialize()
+    # The first tolerated reading was the last evaluation; the restart was due three evaluations on.
+    assert reloaded._deadlines == Deadlines(tolerate_until=now + 6 * 60, reactivate_at=now + 3 * 180)
+
+    await reloaded._save_state()
+    again = HomeRulesCoordinator(hass, coordinator.config_entry)
+    await again.async_initialize()
+    assert again._deadlines == reloaded._deadlines
+
+
+async def test_deadline_schedules_one_wake_up(hass, coord_factory, freezer) -> None:
+    """Grid draw while cooling sets a tolerance deadline; the wake-up at it shuts the aircon off."""
+    from datetime import timedelta
+
+    from homeassistant.util import dt as dt_util
+    from pytest_homeassistant_custom_component.common import async_fire_time_changed
+
+    from custom_components.home_rules.const import CONF_EVENT_DEBOUNCE, CONF_GRID_USAGE_DELAY
+    from custom_components.home_rules.rules import HomeOutput, Reason
+
+    coordinator = await coord_factory(
+        climate="cool", grid="800", options={CONF_GRID_USAGE_DELAY: 4, CONF_EVENT_DEBOUNCE: 0}
+    )
+    coordinator._auto_mode = True
+    await coordinator.async_run_evaluation("test")
+    assert coordinator.data.reason is Reason.GRID_TOLERATED
+    assert coordinator._deadlines.tolerate_until == dt_util.utcnow().timestamp() + 240
+
+    freezer.tick(240)
+    async_fire_time_changed(hass, dt_util.utcnow() + timedelta(seconds=1))
+    await hass.async_block_till_done()
+
+    assert coordinator._last_record["trigger"] == "deadline"
+    assert coordinator.data.adjustment is HomeOutput.OFF
+    assert coordinator._deadlines.reactivate_at is not None
+    await coordinator.async_shutdown()
+
+
+async def test_routine_saves_are_coalesced(hass, coord_factory, freezer) -> None:
+    """Evaluations that change nothing a restart needs share one delayed write; control changes write at once."""
+    from datetime import timedelta
+
+    from homeassistant.util import dt as dt_util
+    from pytest_homeassistant_custom_component.common import async_fire_time_changed
+
+    from custom_components.home_rules.const import DEFAULT_SAVE_DELAY, ControlMode
+
+    coordinator = await coord_factory(generation="0")
+    for humidity in ("40", "41", "42"):  # a change each time, so no evaluation is a repeat
+        hass.states.async_set("sensor.humidity", humidity, {"unit_of_measurement": "%"})
+        await coordinator.async_run_evaluation("manual")
+    (day,) = coordinator.persistence["days"]
+    assert (day["store_writes"], day["journal_writes"], coordinator.persistence["pending"]) == (0, 3, True)
+
+    freezer.tick(DEFAULT_SAVE_DELAY)
+    async_fire_time_changed(hass, dt_util.utcnow() + timedelta(seconds=1))
+    await hass.async_block_till_done()
+    (day,) = coordinator.persistence["days"]
+    assert (day["store_writes"], coordinator.persistence["pending"]) == (1, False)
+    assert day["store_bytes"] > 0
+
+    await coordinator.async_set_mode(ControlMode.SOLAR_COOLING)
+    assert coordinator.persistence["days"][0]["store_writes"] == 2
+    assert coordinator.persistence["pending"] is True  # the evaluation after the control change
+
+    await coordinator.async_shutdown()
+    assert coordinator.persistence["days"][0]["store_writes"] == 3
+    assert coordinator.persistence["pending"] is False
+
+
+async def test_journal_compactions_do_not_overlap(hass, coord_factory) -> None:
+    """Appends while a compaction runs do not start another one."""
+    import asyncio
+    from unittest.mock import PropertyMock, patch
+
+    from custom_components.home_rules.journal import Journal
+
+    coordinator = await coord_factory(generation="0")
+    release, started = asyncio.Event(), []
+
+    async def compact() -> None:
+        started.append(True)
+        await release.wait()
+
+    with (
+        patch.object(Journal, "needs_compaction", new_callable=PropertyMock, return_value=True),
+        patch.object(coordinator, "_async_compact_journal", compact),
+    ):
+        for humidity in ("40", "41", "42"):
+            hass.states.async_set("sensor.humidity", humidity, {"unit_of_measurement": "%"})
+            await coordinator.async_run_evaluation("manual")
+        assert len(started) == 1
+
+        release.set()
+        await hass.async_block_till_done(wait_background_tasks=True)
+        hass.states.async_set("sensor.humidity", "43", {"unit_of_measurement": "%"})
+        await coordinator.async_run_evaluation("manual")
+        assert len(started) == 2
+    release.set()
+    await coordinator.async_shutdown()
+
+
+async def test_store_payloads_are_sized_when_reported(hass, coord_factory) -> None:
+    """Saves do not serialize their payload a second time; diagnostics size the last one for the writes before it."""
+    from unittest.mock import patch
+
+    from homeassistant.helpers.json import prepare_save_json
+
+    from custom_components.home_rules.const import ControlMode
+
+    coordinator = await coord_factory(generation="0")
+    with patch("custom_components.home_rules.coordinator.prepare_save_json", wraps=prepare_save_json) as sized:
+        await coordinator.async_set_mode(ControlMode.SOLAR_COOLING)
+        await coordinator.async_set_mode(ControlMode.MONITOR)
+        assert sized.call_count == 0
+        (day,) = coordinator.persistence["days"]
+        assert sized.call_count == 1
+    assert day["store_writes"] == 2
+    assert day["store_bytes"] == 2 * len(prepare_save_json(coordinator._stored)[1])
+    await coordinator.async_shutdown()
+
+
+async def test_history_is_journaled_outside_the_store(hass, coord_factory, hass_storage) -> None:
+    """Evaluations append to the journal; the Store document no longer carries the history."""
+    from custom_components.home_rules.const import DOMAIN, MAX_RECENT_EVALUATIONS
+    from custom_components.home_rules.coordinator import HomeRulesCoordinator
+
+    coordinator = await coord_factory(generation="0")
+    for i in range(2 * MAX_RECENT_EVALUATIONS + 3):
+        hass.states.async_set("sensor.humidity", str(30 + i % 50), {"unit_of_measurement": "%"})
+        await coordinator.async_run_evaluation("manual")
+        if i == 2 * MAX_RECENT_EVALUATIONS - 1:
+            await hass.async_block_till_done(wait_background_tasks=True)  # compaction
+    await coordinator.async_shutdown()
+
+    assert coordinator.persistence["journal"] == {
+        "segment": "00000002.seg",
+        "records": MAX_RECENT_EVALUATIONS + 3,
+        "keep": MAX_RECENT_EVALUATIONS,
+    }
+    assert "recent_evaluations" not in hass_storage[f"{DOMAIN}_{coordinator.config_entry.entry_id}"]["data"]
+
+    reloaded = HomeRulesCoordinator(hass, coordinator.config_entry)
+    await reloaded.async_initialize()
+    assert list(reloaded._recent) == list(coordinator._recent)
+
+
+async def test_identical_evaluations_fold_into_one_record(hass, coord_factory, freezer) -> None:
+    """Same inputs, session, parameters and result: the last record counts the repeat; nothing is stored or fired."""
+    from custom_components.home_rules.const import EVENT_EVALUATION
+    from custom_components.home_rules.coordinator import HomeRulesCoordinator
+
+    events: list[Any] = []
+    hass.bus.async_listen(EVENT_EVALUATION, events.append)
+    coordinator = await coord_factory(generation="0")
+    for _ in range(4):
+        freezer.tick(60)
+        await coordinator.async_run_evaluation("poll")
+    await hass.async_block_till_done()
+
+    (record,) = coordinator._recent
+    assert (record["repeats"], record["repeated_until"]) == (3, coordinator.data.last_evaluated)
+    assert record["time"] != coordinator.data.last_evaluated
+    assert len(events) == 1
+    assert coordinator.persistence["days"][0]["journal_writes"] == 1
+    assert coordinator.repeats == {"total": 3, "newest_record": 3}
+
+    hass.states.async_set("sensor.humidity", "41", {"unit_of_measurement": "%"})
+    await coordinator.async_run_evaluation("poll")
+    assert [r.get("repeats", 0) for r in coordinator._recent] == [0, 3]
+    assert coordinator.repeats == {"total": 3, "newest_record": 0}
+
+    await coordinator.async_shutdown()
+    reloaded = HomeRulesCoordinator(hass, coordinator.config_entry)
+    await reloaded.async_initialize()
+    assert list(reloaded._recent) == list(coordinator._recent)
+
+
+async def test_concurrent_evaluations_are_coalesced(coord_factory) -> None:
+    """A burst of callers runs two evaluations: the one in flight and one that every later caller joins."""
+    import asyncio
+
+    coordinator = await coord_factory()
+    await asyncio.gather(*(coordinator.async_run_evaluation(f"t{i}") for i in range(1, 6)))
+
+    assert [r["trigger"] for r in coordinator._recent] == ["t2", "t1"]
+    assert coordinator._recent[0]["triggers"] == ["t2", "t3", "t4", "t5"]
+    assert "triggers" not in coordinator._recent[1]
+    assert coordinator.evaluations == {"running": False, "queued": None, "coalesced": 3}
+    assert coordinator.data.last_evaluated == coordinator._recent[0]["time"]
+
+
+async def test_callers_joining_an_evaluation_share_its_error(hass, coord_factory) -> None:
+    """Every caller of a failed evaluation sees the failure."""
+    import asyncio
+
+    coordinator = await coord_factory()
+    await coordinator.async_run_evaluation("first")
+    hass.states.async_remove("sensor.humidity")
+    results = await asyncio.gather(*(coordinator.async_run_evaluation(t) for t in "abc"), return_exceptions=True)
+    assert [type(r) for r in results] == [ValueError] * 3
+    assert coordinator.evaluations["queued"] is None
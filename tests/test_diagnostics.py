@@ -13,8 +13,24 @@ async def test_diagnostics_contains_expected_sections(hass, loaded_entry) -> Non
 
     diagnostics = await async_get_config_entry_diagnostics(hass, loaded_entry)
 
-    assert set(diagnostics) == {"config", "options", "controls", "policy", "session", "recent_evaluations"}
+    assert set(diagnostics) == {
+        "config",
+        "options",
+        "controls",
+        "policy",
+        "session",
+        "recent_evaluations",
+        "engine_stats",
+        "oscillation",
+        "event_driven",
+        "smoothing",
+        "persistence",
+        "repeats",
+        "actuation",
+        "evaluations",
+    }
     assert diagnostics["controls"]["mode"] == "monitor"
     assert diagnostics["controls"]["dry_mode_enabled"] is True
     assert diagnostics["policy"]["dry_mode_humidity_cutoff"] == 65.0
     assert isinstance(diagnostics["recent_evaluations"], list)
+    assert diagnostics["engine_stats"] is None
@@ -18,6 +18,7 @@ async def test_entities_register_on_setup(hass, loaded_entry) -> None:
         "sensor.home_rules_timer_countdown",
         "binary_sensor.home_rules_solar_available",
         "binary_sensor.home_rules_auto_mode",
+        "binary_sensor.home_rules_oscillating",
         "select.home_rules_control_mode",
         "switch.home_rules_cooling_enabled",
         "switch.home_rules_dry_mode_enabled",
@@ -41,3 +42,19 @@ async def test_all_entities_use_translation_key_not_name(hass, loaded_entry) ->
         assert desc.translation_key, f"{desc.key} missing translation_key"
         assert not isinstance(desc.name, str), f"{desc.key} should not set name (use translation_key)"
         assert desc.icon is None, f"{desc.key} should not set icon (use icons.json)"
+
+
+async def test_oscillating_sensor_reports_flapping(hass, loaded_entry) -> None:
+    """Mode changes inside the oscillation window turn the diagnostic sensor on."""
+    coordinator = loaded_entry.runtime_data
+    for climate, generation in (("cool", "0"), ("off", "6000"), ("cool", "0"), ("off", "6000"), ("cool", "0")):
+        hass.states.async_set("climate.test", climate)
+        hass.states.async_set("sensor.generation", generation, {"unit_of_measurement": "W"})
+        hass.states.async_set("sensor.grid", "3000" if generation == "0" else "0", {"unit_of_measurement": "W"})
+        await coordinator.async_run_evaluation("manual")
+    await hass.async_block_till_done()
+
+    state = hass.states.get("binary_sensor.home_rules_oscillating")
+    assert coordinator.oscillation.changes >= 4
+    assert state.state == "on"
+    assert state.attributes["episodes"] == 1
@@ -0,0 +1,170 @@
+"""Event-driven evaluation tests for Home Rules."""
+
+from __future__ import annotations
+
+from datetime import timedelta
+from typing import Any
+
+import pytest
+
+pytest.importorskip("pytest_homeassistant_custom_component")
+
+
+def _triggers(entry) -> list[str]:
+    return [r["trigger"] for r in entry.runtime_data._recent]
+
+
+async def _set_generation(hass, coordinator, *values: str) -> None:
+    from homeassistant.util import dt as dt_util
+    from pytest_homeassistant_custom_component.common import async_fire_time_changed
+
+    for value in values:
+        hass.states.async_set("sensor.generation", value, {"unit_of_measurement": "W"})
+        await hass.async_block_till_done()
+        async_fire_time_changed(
+            hass, dt_util.utcnow() + timedelta(seconds=coordinator.event_driven["debounce_seconds"] + 1)
+        )
+        await hass.async_block_till_done()
+
+
+DEBOUNCE = 15
+
+
+async def _setup(hass: Any, entry: Any, **options: Any) -> Any:
+    from custom_components.home_rules.const import CONF_EVENT_DEBOUNCE
+
+    hass.config_entries.async_update_entry(entry, options={CONF_EVENT_DEBOUNCE: DEBOUNCE, **options})
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+    return entry
+
+
+@pytest.fixture
+async def event_entry(hass, mock_entry):
+    return await _setup(hass, mock_entry)
+
+
+@pytest.fixture
+async def edge_entry(hass, mock_entry):
+    from custom_components.home_rules.const import CONF_EDGE_TRIGGERED
+
+    return await _setup(hass, mock_entry, **{CONF_EDGE_TRIGGERED: True})
+
+
+async def test_input_change_burst_is_coalesced(hass, event_entry) -> None:
+    """A burst of input changes yields one evaluation after the debounce, not one per change."""
+    from homeassistant.util import dt as dt_util
+    from pytest_homeassistant_custom_component.common import async_fire_time_changed
+
+    coordinator = event_entry.runtime_data
+    before = len(coordinator._recent)
+    for value in ("800", "900", "1000"):
+        hass.states.async_set("sensor.grid", value, {"unit_of_measurement": "W"})
+    await hass.async_block_till_done()
+    assert len(coordinator._recent) == before
+
+    async_fire_time_changed(
+        hass, dt_util.utcnow() + timedelta(seconds=coordinator.event_driven["debounce_seconds"] + 1)
+    )
+    await hass.async_block_till_done()
+
+    assert coordinator.input_changes == 3
+    assert _triggers(event_entry).count("input_change") == 1
+    assert coordinator._recent[0]["grid_usage"] == 1000.0
+
+
+async def test_attribute_only_updates_are_ignored(hass, event_entry) -> None:
+    coordinator = event_entry.runtime_data
+    hass.states.async_set("sensor.grid", "0", {"unit_of_measurement": "W", "friendly_name": "Grid"})
+    await hass.async_block_till_done()
+    assert coordinator.input_changes == 0
+
+
+async def test_event_driven_polls_as_safety_net(hass, event_entry) -> None:
+    from custom_components.home_rules.const import SAFETY_NET_INTERVAL
+
+    coordinator = event_entry.runtime_data
+    assert coordinator.event_driven == {
+        "debounce_seconds": DEBOUNCE,
+        "poll_seconds": SAFETY_NET_INTERVAL,
+        "input_changes": 0,
+        "edge_triggered": False,
+        "edge_skips": 0,
+    }
+
+
+async def test_event_driven_is_opt_in(hass, coord_factory) -> None:
+    from custom_components.home_rules.const import DEFAULT_EVAL_INTERVAL
+
+    coordinator = await coord_factory()
+    assert coordinator.update_interval == timedelta(seconds=DEFAULT_EVAL_INTERVAL)
+    assert coordinator.event_driven is None
+    unsubscribe = coordinator.async_track_inputs()  # poll-only still watches for solar during long intervals
+    assert coordinator._solar_entities == {"sensor.generation"}
+    unsubscribe()
+
+
+async def test_edge_triggered_skips_changes_within_a_class(hass, edge_entry) -> None:
+    """Generation moving around above the cool threshold never wakes the coordinator."""
+    coordinator = edge_entry.runtime_data
+    await _set_generation(hass, coordinator, "6100")  # the startup evaluation switched auto mode on
+    assert _triggers(edge_entry).count("input_change") == 1
+
+    await _set_generation(hass, coordinator, "6400", "5900", "7000", "6600", "6100")
+    assert coordinator.edge_skips == 5
+    assert _triggers(edge_entry).count("input_change") == 1
+
+    await _set_generation(hass, coordinator, "0")  # smoothed generation drops below the cool threshold
+    assert _triggers(edge_entry)[0] == "input_change"
+    assert coordinator.edge_skips == 5
+
+
+async def test_edges_follow_parameter_changes(hass, edge_entry) -> None:
+    from custom_components.home_rules.const import CONF_GENERATION_COOL_THRESHOLD
+
+    coordinator = edge_entry.runtime_data
+    await _set_generation(hass, coordinator, "6100", "6200")
+    assert coordinator.edge_skips == 1
+
+    await coordinator.async_set_parameter(CONF_GENERATION_COOL_THRESHOLD, 6500.0)
+    await _set_generation(hass, coordinator, "9000")  # crosses the new threshold only
+    assert _triggers(edge_entry)[0] == "input_change"
+
+
+async def test_edge_check_has_no_side_effects(hass, edge_entry) -> None:
+    """Classifying a change raises no repairs issue; the evaluation it wakes does."""
+    from homeassistant.helpers import issue_registry as ir
+    from homeassistant.util import dt as dt_util
+    from pytest_homeassistant_custom_component.common import async_fire_time_changed
+
+    from custom_components.home_rules.const import DOMAIN, ISSUE_INVALID_UNIT
+
+    coordinator = edge_entry.runtime_data
+    await _set_generation(hass, coordinator, "6100")
+    issue_id = f"{edge_entry.entry_id}_{ISSUE_INVALID_UNIT}"
+    hass.states.async_set("sensor.generation", "6200", {"unit_of_measurement": "parsecs"})
+    await hass.async_block_till_done()
+    assert ir.async_get(hass).async_get_issue(DOMAIN, issue_id) is None
+    assert coordinator.edge_skips == 0
+
+    async_fire_time_changed(hass, dt_util.utcnow() + timedelta(seconds=DEBOUNCE + 1))
+    await hass.async_block_till_done()
+    assert ir.async_get(hass).async_get_issue(DOMAIN, issue_id) is not None
+
+
+async def test_edges_follow_the_time_weighted_inputs(hass, mock_entry, freezer) -> None:
+    """A brief dip does not wake the coordinator when the interval mean stays above the threshold."""
+    from custom_components.home_rules.const import CONF_EDGE_TRIGGERED, CONF_SMOOTHING_WINDOW, CONF_TIME_WEIGHTED
+
+    options = {CONF_EDGE_TRIGGERED: True, CONF_TIME_WEIGHTED: True, CONF_SMOOTHING_WINDOW: 1}
+    entry = await _setup(hass, mock_entry, **options)
+    coordinator = entry.runtime_data
+    await _set_generation(hass, coordinator, "6100")
+    evaluations = _triggers(entry).count("input_change")
+
+    freezer.tick(30)
+    await _set_generation(hass, coordinator, "6200")
+    freezer.tick(1)
+    await _set_generation(hass, coordinator, "0")  # the raw reading crosses every generation threshold
+    assert coordinator.edge_skips == 2
+    assert _triggers(entry).count("input_change") == evaluations
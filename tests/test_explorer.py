@@ -0,0 +1,55 @@
+"""Closed-loop state explorer tests (no Home Assistant needed)."""
+
+from __future__ import annotations
+
+from dataclasses import replace
+
+import pytest
+
+from custom_components.home_rules.explorer import MIN_DWELL, Cycle, Environment, environments, explore, main
+from custom_components.home_rules.replay import DEFAULT_PARAMETERS
+from custom_components.home_rules.rules import AirconMode
+
+OFF, COOL = AirconMode.OFF, AirconMode.COOL
+ENV = Environment(0.0, 25.0, 50.0, True, True, False, True, True)
+
+
+def test_defaults_flap_but_never_short_cycle() -> None:
+    report = explore(DEFAULT_PARAMETERS)
+    assert report.flapping
+    assert not report.short_cycles
+    assert all(cycle.min_dwell >= MIN_DWELL for cycle in report.flapping)
+    assert report.nodes >= len(report.states) > 1
+
+
+@pytest.mark.parametrize("interval", [30.0, 180.0, 600.0])
+def test_deadlines_set_the_dwell_at_any_interval(interval: float) -> None:
+    report = explore(DEFAULT_PARAMETERS, interval)
+    assert {cycle.min_dwell for cycle in report.flapping} == {60.0 * DEFAULT_PARAMETERS.grid_usage_delay}
+
+
+@pytest.mark.parametrize(
+    "change", [{"grid_usage_delay": 1}, {"reactivate_delay": 0}, {"grid_usage_delay": 2, "reactivate_delay": 2}]
+)
+def test_short_delays_short_cycle(change: dict[str, int]) -> None:
+    assert explore(replace(DEFAULT_PARAMETERS, **change)).short_cycles
+
+
+def test_environments_cover_every_threshold_side() -> None:
+    envs = list(environments(DEFAULT_PARAMETERS))
+    generations = {e.generation for e in envs}
+    assert {DEFAULT_PARAMETERS.generation_cool_threshold, DEFAULT_PARAMETERS.generation_dry_threshold} <= generations
+    assert min(generations) < DEFAULT_PARAMETERS.generation_boost_threshold
+    assert len(envs) == len(set(envs))
+
+
+def test_min_dwell_is_shortest_run_around_the_cycle() -> None:
+    assert Cycle(ENV, (OFF, COOL), (60.0, 60.0)).min_dwell == 60.0
+    assert Cycle(ENV, (COOL, OFF, OFF, COOL), (60.0, 120.0, 60.0, 180.0)).min_dwell == 180.0
+    assert Cycle(ENV, (OFF, OFF, COOL, COOL, COOL), (60.0, 60.0, 300.0, 60.0, 60.0)).min_dwell == 120.0
+
+
+def test_main_exit_code(capsys: pytest.CaptureFixture[str]) -> None:
+    assert main([]) == 0
+    assert main(["--reactivate-delay", "0"]) == 1
+    assert "SHORT-CYCLING" in capsys.readouterr().out
@@ -70,7 +70,53 @@ async def test_migrate_entry_removes_legacy_timer_entity_id(hass) -> None:
     assert await async_migrate_entry(hass, entry)
     assert LEGACY_CONF_TIMER_ENTITY_ID not in entry.data
     assert LEGACY_CONF_TIMER_ENTITY_ID not in entry.options
-    assert entry.minor_version == 2
+    assert entry.minor_version == 3
+
+
+async def test_migrate_entry_converts_delays_to_minutes(hass) -> None:
+    """Delays counted in evaluations keep their duration at the configured interval, within the form's range."""
+    from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+    from custom_components.home_rules import async_migrate_entry
+    from custom_components.home_rules.const import (
+        CONF_EVAL_INTERVAL,
+        CONF_GRID_USAGE_DELAY,
+        CONF_REACTIVATE_DELAY,
+        DOMAIN,
+    )
+
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        data={},
+        options={CONF_EVAL_INTERVAL: 300, CONF_GRID_USAGE_DELAY: 2, CONF_REACTIVATE_DELAY: 3},
+        version=1,
+        minor_version=2,
+    )
+    entry.add_to_hass(hass)
+
+    assert await async_migrate_entry(hass, entry)
+    assert entry.options[CONF_GRID_USAGE_DELAY] == 5
+    assert entry.options[CONF_REACTIVATE_DELAY] == 20
+    assert entry.minor_version == 3
+
+    assert await async_migrate_entry(hass, entry)
+    assert entry.options[CONF_GRID_USAGE_DELAY] == 5
+
+
+@pytest.mark.parametrize(("counts", "minutes"), [((1, 0), (0, 0)), ((2, 2), (3, 9)), ((30, 30), (60, 60))])
+async def test_migrated_delays_keep_their_timing(hass, counts: tuple[int, int], minutes: tuple[int, int]) -> None:
+    """One tolerated reading shuts off at once, a zero delay stays off, and long delays clamp to 60 minutes."""
+    from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+    from custom_components.home_rules import async_migrate_entry
+    from custom_components.home_rules.const import CONF_GRID_USAGE_DELAY, CONF_REACTIVATE_DELAY, DOMAIN
+
+    options = dict(zip((CONF_GRID_USAGE_DELAY, CONF_REACTIVATE_DELAY), counts, strict=True))
+    entry = MockConfigEntry(domain=DOMAIN, data={}, options=options, version=1, minor_version=2)
+    entry.add_to_hass(hass)
+
+    assert await async_migrate_entry(hass, entry)
+    assert (entry.options[CONF_GRID_USAGE_DELAY], entry.options[CONF_REACTIVATE_DELAY]) == minutes
 
 
 async def test_options_update_triggers_reload(hass, loaded_entry) -> None:
@@ -95,3 +141,53 @@ async def test_setup_retry_for_unavailable_required_entity_does_not_create_runti
 
     registry = ir.async_get(hass)
     assert registry.async_get_issue(DOMAIN, f"{mock_entry.entry_id}_{ISSUE_RUNTIME}") is None
+
+
+async def test_get_engine_stats_service(hass, mock_entry) -> None:
+    """get_engine_stats returns counters once the engine_stats option is enabled."""
+    from custom_components.home_rules.const import CONF_ENGINE_STATS, DOMAIN, SERVICE_GET_ENGINE_STATS
+
+    hass.config_entries.async_update_entry(mock_entry, options={CONF_ENGINE_STATS: True})
+    assert await hass.config_entries.async_setup(mock_entry.entry_id)
+    await hass.async_block_till_done()
+    await mock_entry.runtime_data.async_run_evaluation("manual")
+
+    stats = await hass.services.async_call(DOMAIN, SERVICE_GET_ENGINE_STATS, blocking=True, return_response=True)
+
+    assert stats["enabled"] is True
+    assert stats["evaluations"] == 2
+    assert sum(stats["branches"].values()) == sum(stats["reasons"].values()) == 2
+    assert sum(stats["target_reasons"].values()) == 2
+    assert stats["evaluate_seconds"] >= stats["adjust_seconds"] > 0
+
+
+async def test_get_engine_stats_service_disabled_by_default(hass, loaded_entry) -> None:
+    """Without the option the service reports that instrumentation is off."""
+    from custom_components.home_rules.const import DOMAIN, SERVICE_GET_ENGINE_STATS
+
+    stats = await hass.services.async_call(DOMAIN, SERVICE_GET_ENGINE_STATS, blocking=True, return_response=True)
+
+    assert stats == {"enabled": False}
+
+
+async def test_get_engine_stats_service_picks_the_entry(hass, mock_entry) -> None:
+    """With several entries loaded the service needs config_entry_id and reports that entry only."""
+    from homeassistant.exceptions import ServiceValidationError
+    from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+    from custom_components.home_rules.const import CONF_ENGINE_STATS, DOMAIN, SERVICE_GET_ENGINE_STATS
+
+    hass.config_entries.async_update_entry(mock_entry, options={CONF_ENGINE_STATS: True})
+    other = MockConfigEntry(domain=DOMAIN, data=dict(mock_entry.data), minor_version=mock_entry.minor_version)
+    other.add_to_hass(hass)
+    assert await hass.config_entries.async_setup(mock_entry.entry_id)  # sets up every entry of the domain
+    await hass.async_block_till_done()
+    assert len(hass.config_entries.async_loaded_entries(DOMAIN)) == 2
+
+    with pytest.raises(ServiceValidationError):
+        await hass.services.async_call(DOMAIN, SERVICE_GET_ENGINE_STATS, blocking=True, return_response=True)
+    for entry, enabled in ((mock_entry, True), (other, False)):
+        stats = await hass.services.async_call(
+            DOMAIN, SERVICE_GET_ENGINE_STATS, {"config_entry_id": entry.entry_id}, blocking=True, return_response=True
+        )
+        assert stats["enabled"] is enabled
@@ -0,0 +1,55 @@
+"""Evaluation journal tests (no Home Assistant needed)."""
+
+from __future__ import annotations
+
+from pathlib import Path
+
+from custom_components.home_rules.journal import Journal
+
+
+def test_append_costs_one_record_and_tail_returns_the_newest(tmp_path: Path) -> None:
+    journal = Journal(tmp_path / "j", keep=3)
+    assert journal.tail() == []
+    sizes = [journal.append({"n": n}) for n in range(5)]
+    assert len(set(sizes)) == 1
+    assert (tmp_path / "j" / "00000001.seg").stat().st_size == sum(sizes)
+    assert Journal(tmp_path / "j", keep=3).tail() == [{"n": 2}, {"n": 3}, {"n": 4}]
+
+
+def test_compaction_carries_the_tail_into_a_new_segment(tmp_path: Path) -> None:
+    journal = Journal(tmp_path, keep=2)
+    for n in range(3):
+        journal.append({"n": n})
+    assert journal.as_dict()["records"] == 3
+    assert journal.compact() == 0
+    journal.append({"n": 3})
+    assert journal.needs_compaction
+    assert journal.compact() > 0
+    journal.append({"n": 4})
+    assert [p.name for p in tmp_path.iterdir()] == ["00000002.seg"]
+    assert journal.as_dict() == {"segment": "00000002.seg", "records": 3, "keep": 2}
+    assert Journal(tmp_path, keep=2).tail() == [{"n": 3}, {"n": 4}]
+
+
+def test_torn_final_frame_is_truncated(tmp_path: Path) -> None:
+    journal = Journal(tmp_path, keep=5)
+    journal.append({"n": 0})
+    good = (tmp_path / "00000001.seg").stat().st_size
+    journal.append({"n": 1})
+    segment = tmp_path / "00000001.seg"
+    segment.write_bytes(segment.read_bytes()[:-3])
+
+    reopened = Journal(tmp_path, keep=5)
+    assert reopened.tail() == [{"n": 0}]
+    assert segment.stat().st_size == good
+    reopened.append({"n": 2})
+    assert Journal(tmp_path, keep=5).tail() == [{"n": 0}, {"n": 2}]
+
+
+def test_replace_and_remove(tmp_path: Path) -> None:
+    journal = Journal(tmp_path / "j", keep=5)
+    journal.append({"n": 0})
+    journal.replace([{"n": 1}, {"n": 2}])
+    assert Journal(tmp_path / "j", keep=5).tail() == [{"n": 1}, {"n": 2}]
+    journal.remove()
+    assert not (tmp_path / "j").exists()
@@ -28,3 +28,48 @@ async def test_notifications_fire_on_mode_change(hass, coord_factory) -> None:
         await coordinator.async_run_evaluation("poll")
 
     assert len(calls) == 1
+
+
+async def test_switch_is_notified_once_the_climate_confirms_it(hass, coord_factory) -> None:
+    from pytest_homeassistant_custom_component.common import async_mock_service
+
+    from custom_components.home_rules.const import CONF_NOTIFICATION_SERVICE, ControlMode
+
+    async def climate_service(call) -> None:
+        state = hass.states.get("climate.test")
+        if call.service == "set_hvac_mode":
+            hass.states.async_set("climate.test", call.data["hvac_mode"], state.attributes)
+        else:
+            hass.states.async_set("climate.test", state.state, {**state.attributes, **call.data})
+
+    hass.services.async_register("climate", "set_hvac_mode", climate_service)
+    hass.services.async_register("climate", "set_temperature", climate_service)
+    calls = async_mock_service(hass, "notify", "mobile_app_test")
+    coordinator = await coord_factory(options={CONF_NOTIFICATION_SERVICE: "notify.mobile_app_test"})
+    await coordinator.async_set_mode(ControlMode.SOLAR_COOLING)
+    await hass.async_block_till_done()
+
+    assert coordinator.actuation["confirmed"] == 1
+    assert [c.data["message"] for c in calls] == ["Switched from Off to Cool"]
+
+
+async def test_failed_switch_is_notified_as_a_failure(hass, coord_factory) -> None:
+    from homeassistant.exceptions import HomeAssistantError
+    from pytest_homeassistant_custom_component.common import async_mock_service
+
+    from custom_components.home_rules.const import CONF_NOTIFICATION_SERVICE, ControlMode
+
+    async def failing_service(call) -> None:
+        raise HomeAssistantError("cloud unreachable")
+
+    hass.services.async_register("climate", "set_hvac_mode", failing_service)
+    calls = async_mock_service(hass, "notify", "mobile_app_test")
+    coordinator = await coord_factory(options={CONF_NOTIFICATION_SERVICE: "notify.mobile_app_test"})
+    coordinator._actuation.backoff = 0
+    await coordinator.async_set_mode(ControlMode.SOLAR_COOLING)
+    await hass.async_block_till_done()
+
+    assert coordinator._session.failed_to_change == 1
+    assert [(c.data["title"], c.data["message"]) for c in calls] == [
+        ("⚠️ Aircon → Cool failed", "Could not switch from Off to Cool: failed to apply Cool: cloud unreachable")
+    ]
@@ -100,3 +100,18 @@ async def test_options_flow_drops_legacy_timer_entity_id(hass, mock_entry) -> No
 
     assert result["type"] is FlowResultType.CREATE_ENTRY
     assert LEGACY_CONF_TIMER_ENTITY_ID not in result["data"]
+
+
+@pytest.mark.parametrize("delays", [(6, 0), (2, 2)])
+async def test_options_flow_rejects_short_cycling_delays(hass, mock_entry, delays: tuple[int, int]) -> None:
+    """Delays under 3 minutes let the aircon switch modes that soon after the last switch."""
+    from custom_components.home_rules.const import CONF_GRID_USAGE_DELAY, CONF_REACTIVATE_DELAY
+
+    hass.states.async_set("sensor.inverter", "online")
+    result = await hass.config_entries.options.async_init(mock_entry.entry_id)
+    user_input = _valid_options_input()
+    user_input[CONF_GRID_USAGE_DELAY], user_input[CONF_REACTIVATE_DELAY] = delays
+    result = await hass.config_entries.options.async_configure(result["flow_id"], user_input)
+
+    assert result["type"] is FlowResultType.FORM
+    assert result["errors"] == {"base": "short_cycling"}
@@ -0,0 +1,38 @@
+"""Oscillation detector tests (no Home Assistant needed)."""
+
+from __future__ import annotations
+
+from custom_components.home_rules.oscillation import OscillationDetector
+from custom_components.home_rules.rules import HomeOutput
+
+COOL, DRY, OFF = HomeOutput.COOL.code, HomeOutput.DRY.code, HomeOutput.OFF.code
+
+
+def feed(detector: OscillationDetector, modes: list[int], step: float = 60.0) -> list[bool]:
+    return [detector.observe(i * step, mode) for i, mode in enumerate(modes)]
+
+
+def test_steady_stream_never_oscillates() -> None:
+    detector = OscillationDetector(window=1800)
+    assert not any(feed(detector, [OFF] * 10 + [COOL] * 50 + [OFF] * 10))
+    assert (detector.changes, detector.reversals, detector.episodes) == (2, 1, 0)
+
+
+def test_flapping_within_window_is_flagged_once() -> None:
+    detector = OscillationDetector(window=1800, transitions=4)
+    flags = feed(detector, [OFF, COOL, OFF, COOL, OFF, COOL, COOL])
+    assert flags == [False, False, False, False, True, True, True]
+    assert detector.episodes == 1
+    assert detector.reversals == 4
+
+
+def test_changes_spread_beyond_window_do_not_count() -> None:
+    detector = OscillationDetector(window=1800, transitions=4)
+    assert not any(feed(detector, [OFF, COOL, DRY, OFF, COOL], step=900))
+
+
+def test_flag_clears_once_window_passes() -> None:
+    detector = OscillationDetector(window=600, transitions=3)
+    assert feed(detector, [OFF, COOL, OFF, COOL])[-1] is True
+    assert detector.observe(10_000, COOL) is False
+    assert detector.as_dict()["episodes"] == 1
@@ -0,0 +1,63 @@
+"""Evaluation record tests (no Home Assistant needed)."""
+
+from __future__ import annotations
+
+import json
+from typing import Any
+
+from custom_components.home_rules import records
+from custom_components.home_rules.records import FIELDS, INTERN_LIMIT, EvaluationRecord, intern_items
+
+
+def _fields(**overrides: Any) -> dict[str, Any]:
+    record: dict[str, Any] = dict.fromkeys(FIELDS, 1.0)
+    record |= {
+        "blocked_reasons": [3],
+        "fallback_inputs": {"generation": "0"},
+        "controls_snapshot": {"control_mode": "monitor", "cooling_enabled": True, "dry_mode_enabled": True},
+        "policy_snapshot": {"dry_mode_humidity_cutoff": 65.0},
+    }
+    return record | overrides
+
+
+def test_reads_like_the_dict_it_replaces() -> None:
+    fields = _fields(legacy_key="kept")
+    record = EvaluationRecord(fields)
+    assert record == fields
+    assert record.as_dict() == fields
+    assert json.loads(json.dumps(record.as_dict())) == fields
+    assert record["blocked_reasons"] == [3]
+    assert record.get("missing", "default") == "default"
+    assert not hasattr(record, "__dict__")
+
+
+def test_missing_fields_are_absent_keys() -> None:
+    record = EvaluationRecord({"time": "t", "adjustment": 2})
+    assert dict(record) == {"time": "t", "adjustment": 2}
+    assert "reason" not in record
+    assert len(record) == 2
+
+
+def test_snapshots_are_shared_between_records() -> None:
+    first, second = EvaluationRecord(_fields(time="a")), EvaluationRecord(_fields(time="b"))
+    assert first.controls_snapshot is second.controls_snapshot  # type: ignore[attr-defined]
+    assert first.policy_snapshot is second.policy_snapshot  # type: ignore[attr-defined]
+    changed = EvaluationRecord(_fields(controls_snapshot={"control_mode": "disabled"}))
+    assert changed["controls_snapshot"] == {"control_mode": "disabled"}
+    assert first["controls_snapshot"]["control_mode"] == "monitor"
+
+
+def test_intern_table_keeps_only_recent_snapshots() -> None:
+    kept = intern_items({"control_mode": "kept"})
+    for n in range(3 * INTERN_LIMIT):
+        intern_items({"control_mode": n})
+        assert intern_items({"control_mode": "kept"}) is kept  # in use, so never evicted
+    assert len(records._interned) == INTERN_LIMIT
+    assert (("control_mode", 0),) not in records._interned
+
+
+def test_count_repeat_accumulates() -> None:
+    record = EvaluationRecord({"time": "a", "adjustment": 2})
+    record.count_repeat("b")
+    record.count_repeat("c", 2)
+    assert (record["repeats"], record["repeated_until"]) == (3, "c")
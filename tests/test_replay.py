@@ -0,0 +1,115 @@
+"""Replay CLI tests (no Home Assistant needed)."""
+
+from __future__ import annotations
+
+import csv
+import json
+from itertools import count, islice
+
+from custom_components.home_rules.replay import DEFAULT_PARAMETERS, main, parse_row, read_rows, replay
+from custom_components.home_rules.rules import AirconMode, HomeOutput, Reason
+
+ROWS = [
+    {"time": "t0", "aircon_mode": "off", "generation": 6000, "grid_usage": 0, "temperature": 26, "humidity": 40},
+    {"time": "t1", "aircon_mode": "cool", "generation": 6000, "grid_usage": 0, "temperature": 26, "humidity": 40},
+    {"time": "t2", "aircon_mode": "cool", "generation": 0, "grid_usage": 900, "temperature": 26, "humidity": 40},
+    {"time": "t3", "aircon_mode": "cool", "generation": 0, "grid_usage": 900, "temperature": 26, "humidity": 40},
+]
+
+
+def test_auto_mode_follows_replayed_adjustments() -> None:
+    steps = list(replay(ROWS, smoothing_window=1, step_seconds=360))
+    assert [s.result.output for s in steps] == [
+        HomeOutput.COOL,
+        HomeOutput.NO_CHANGE,
+        HomeOutput.NO_CHANGE,
+        HomeOutput.OFF,
+    ]
+    assert steps[1].home.auto is True
+    assert steps[3].result.reason is Reason.GRID_TOO_HIGH
+
+
+def test_delays_run_on_the_row_times() -> None:
+    """Grid usage from 12:02 is tolerated for the default 6 minutes, however many rows fall in between."""
+    times = ["12:00:00", "12:01:00", "12:02:00", "12:07:59"]
+    rows = [{**row, "time": f"2026-07-01T{t}+00:00"} for row, t in zip(ROWS, times, strict=True)]
+    assert [s.result.output for s in replay(rows, smoothing_window=1)][2:] == [HomeOutput.NO_CHANGE] * 2
+    rows[3]["time"] = "2026-07-01T12:08:00+00:00"
+    assert [s.result.output for s in replay(rows, smoothing_window=1)][2:] == [HomeOutput.NO_CHANGE, HomeOutput.OFF]
+
+
+def test_generation_is_smoothed_over_previous_rows() -> None:
+    steps = list(replay(ROWS, smoothing_window=3))
+    assert [s.generation for s in steps] == [6000.0, 6000.0, 4000.0, 2000.0]
+    assert steps[2].home.generation == 0.0
+
+
+def test_power_is_normalized_before_smoothing_as_live() -> None:
+    """Negative readings count as 0, and a row without solar has no generation or grid usage."""
+    base = {"aircon_mode": "off", "grid_usage": 0, "temperature": 26, "humidity": 40}
+    rows = [
+        {**base, "generation": 6000, "grid_usage": 900, "have_solar": False},
+        {**base, "generation": -6000, "grid_usage": -2500},
+        {**base, "generation": 6000},
+        {**base, "generation": 6000},
+    ]
+    steps = list(replay(rows, smoothing_window=2))
+    assert [(s.home.generation, s.home.grid_usage) for s in steps] == [(0.0, 0.0), (0.0, 0.0), (6000.0, 0.0)] + [
+        (6000.0, 0.0)
+    ]
+    assert [s.generation for s in steps] == [0.0, 0.0, 3000.0, 6000.0]
+    assert [s.result.output for s in steps][2:] == [HomeOutput.NO_CHANGE, HomeOutput.COOL]
+
+
+def test_replay_is_lazy() -> None:
+    endless = ({**ROWS[0], "time": str(i)} for i in count())
+    assert [s.time for s in islice(replay(endless), 3)] == ["0", "1", "2"]
+
+
+def test_parse_row_defaults_and_csv_strings() -> None:
+    _, home = parse_row(
+        {
+            "aircon_mode": "sideways",
+            "generation": "1",
+            "grid_usage": "0",
+            "temperature": "20",
+            "humidity": "50",
+            "timer": "true",
+            "auto": "",
+        },
+        auto=True,
+    )
+    assert home.aircon_mode is AirconMode.UNKNOWN
+    assert (home.timer, home.auto, home.have_solar, home.enabled) == (True, True, True, True)
+
+
+def test_csv_and_jsonl_give_the_same_decisions(tmp_path) -> None:
+    jsonl, table = tmp_path / "in.jsonl", tmp_path / "in.csv"
+    jsonl.write_text("".join(json.dumps(r) + "\n" for r in ROWS))
+    with table.open("w", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=list(ROWS[0]))
+        writer.writeheader()
+        writer.writerows(ROWS)
+    from_jsonl = [s.result for s in replay(read_rows(jsonl))]
+    assert from_jsonl == [s.result for s in replay(read_rows(table))]
+
+
+def test_main_writes_one_decision_per_line(tmp_path, capsys) -> None:
+    path = tmp_path / "in.jsonl"
+    path.write_text("".join(json.dumps(r) + "\n" for r in ROWS))
+    assert main([str(path), "--smoothing-window", "1", "--grid-usage-delay", "0"]) == 0
+    lines = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+    assert [line["adjustment"] for line in lines] == ["Cool", "No Change", "Off", "No Change"]
+
+
+def test_default_parameters_match_integration_defaults() -> None:
+    from custom_components.home_rules import const as c
+
+    assert DEFAULT_PARAMETERS.generation_cool_threshold == c.DEFAULT_GENERATION_COOL_THRESHOLD
+    assert DEFAULT_PARAMETERS.generation_dry_threshold == c.DEFAULT_GENERATION_DRY_THRESHOLD
+    assert DEFAULT_PARAMETERS.generation_boost_threshold == c.DEFAULT_GENERATION_BOOST_THRESHOLD
+    assert DEFAULT_PARAMETERS.temperature_threshold == c.DEFAULT_TEMPERATURE_THRESHOLD
+    assert DEFAULT_PARAMETERS.dry_mode_humidity_cutoff == c.DRY_MODE_HUMIDITY_CUTOFF
+    assert DEFAULT_PARAMETERS.grid_usage_delay == c.DEFAULT_GRID_USAGE_DELAY
+    assert DEFAULT_PARAMETERS.reactivate_delay == c.DEFAULT_REACTIVATE_DELAY
+    assert DEFAULT_PARAMETERS.temperature_cool == c.DEFAULT_TEMPERATURE_COOL
@@ -0,0 +1,92 @@
+"""Rolling window tests (no Home Assistant needed)."""
+
+from __future__ import annotations
+
+import random
+
+import pytest
+
+from custom_components.home_rules.rolling import RollingWindow, TimeWeightedAverage
+
+
+@pytest.mark.parametrize("size", [1, 2, 5, 10])
+def test_matches_naive_window(size: int) -> None:
+    rng = random.Random(size)  # noqa: S311
+    window, samples = RollingWindow(size), list[float]()
+    for _ in range(3000):
+        value = rng.choice([0.0, 500.0, rng.uniform(0, 8000)])
+        pending = [*samples[max(0, len(samples) - size + 1) :], value] if size > 1 else [value]
+        assert window.mean_with(value) == pytest.approx(sum(pending) / len(pending), abs=1e-3)
+        window.push(value)
+        samples.append(value)
+        recent = samples[-size:]
+        assert list(window) == recent
+        assert window.mean == pytest.approx(sum(recent) / len(recent), abs=1e-3)
+        assert (window.min, window.max) == (min(recent), max(recent))
+
+
+def test_empty_window() -> None:
+    window = RollingWindow(3)
+    assert (window.mean, window.min, window.max, len(window)) == (None, None, None, 0)
+    assert window.mean_with(42.0) == 42.0
+
+
+def test_resize_keeps_the_newest_samples() -> None:
+    window = RollingWindow(5, [5.0, 1.0, 4.0, 2.0, 3.0])
+    window.resize(2)
+    assert list(window) == [2.0, 3.0]
+    assert (window.mean, window.min, window.max) == (2.5, 2.0, 3.0)
+    window.resize(4)
+    window.push(9.0)
+    window.push(0.0)
+    assert list(window) == [2.0, 3.0, 9.0, 0.0]
+    assert (window.min, window.max) == (0.0, 9.0)
+
+
+def test_running_sum_does_not_drift() -> None:
+    window = RollingWindow(3)
+    for i in range(100_000):
+        window.push(0.1 * (i % 7919))
+    for value in (5500.0, 5500.0, 5500.0):
+        window.push(value)
+    assert window.mean == window.mean_with(5500.0) == 5500.0
+    for value in (0.0, 0.0, 0.0):
+        window.push(value)
+    assert window.mean == 0.0
+
+
+def test_non_finite_sample_poisons_the_mean_until_evicted() -> None:
+    window = RollingWindow(2, [1.0, float("nan")])
+    assert window.mean != window.mean
+    window.push(3.0)
+    assert window.mean != window.mean
+    window.push(5.0)
+    assert window.mean == 4.0
+
+
+def test_time_weighted_average_is_trapezoidal() -> None:
+    average = TimeWeightedAverage()
+    assert (average.mean, average.seconds) == (None, 0.0)
+    for when, value in ((0.0, 0.0), (10.0, 100.0), (20.0, 100.0), (5.0, 1e9), (30.0, 0.0)):
+        average.add(when, value)
+    assert average.as_dict() == {"samples": 4, "seconds": 30.0, "mean": 200 / 3, "min": 0.0, "max": 100.0}
+
+
+def test_time_weighted_close_starts_the_next_interval() -> None:
+    average = TimeWeightedAverage()
+    assert average.close(0.0, 40.0) == 40.0
+    average.add(30.0, 40.0)
+    assert average.close(60.0, 100.0) == 55.0
+    assert (average.samples, average.mean) == (1, 100.0)
+    assert average.close(60.0, 20.0) == 20.0
+
+
+def test_time_weighted_mean_with_does_not_close() -> None:
+    average = TimeWeightedAverage()
+    assert average.mean_with(0.0, 40.0) == 40.0
+    average.add(0.0, 40.0)
+    average.add(30.0, 40.0)
+    assert average.mean_with(60.0, 100.0) == 55.0
+    assert average.mean_with(10.0, 1e9) == 40.0
+    assert average.as_dict() == {"samples": 2, "seconds": 30.0, "mean": 40.0, "min": 40.0, "max": 40.0}
+    assert average.close(60.0, 100.0) == 55.0
@@ -6,8 +6,13 @@ current_state, _idle_reason, adjust, and apply_adjustment is covered.
 
 from __future__ import annotations
 
+from dataclasses import replace
+
 from custom_components.home_rules.rules import (
     ALLOWED_FAILURES,
+    DEADLINE_GRID_USAGE_DELAY,
+    DEADLINE_REACTIVATE_DELAY,
+    OUTPUT_CODES,
     R_ALREADY_COOLING,
     R_ALREADY_DRYING,
     R_AUTO_IDLE,
@@ -31,18 +36,25 @@ from custom_components.home_rules.rules import (
     R_SOLAR_DRY,
     R_TIMER_EXPIRED,
     R_UNKNOWN_MODE,
+    REASON_CODES,
     AdjustResult,
     AirconMode,
     CachedState,
+    Deadlines,
     HomeInput,
     HomeOutput,
+    Reason,
     RuleParameters,
+    SessionState,
     TargetResult,
     _evaluate_target_mode,
     _idle_reason,
     adjust,
     apply_adjustment,
+    branch,
     current_state,
+    track_adjustment,
+    transition,
 )
 
 OUT = HomeOutput
@@ -133,7 +145,7 @@ class TestEvaluateTargetMode:
 
     def test_d3_solar_dry_disabled(self):
         r = _evaluate_target_mode(
-            RuleParameters(**{**TEST_PARAMS.__dict__, "dry_mode_enabled": False}),
+            replace(TEST_PARAMS, dry_mode_enabled=False),
             home(generation=3500, humidity=66, aircon_mode=AirconMode.OFF),
         )
         assert r == TargetResult(None, R_DRY_DISABLED, True)
@@ -411,7 +423,7 @@ class TestAdjustOffSolar:
 
     def test_dry_disabled_leaves_auto_idle(self):
         state = CachedState()
-        params = RuleParameters(**{**TEST_PARAMS.__dict__, "dry_mode_enabled": False})
+        params = replace(TEST_PARAMS, dry_mode_enabled=False)
         r = adjust(params, home(generation=3500, humidity=66, temperature=24, auto=True), state)
         assert r == AdjustResult(OUT.OFF, R_DRY_DISABLED)
 
@@ -1422,3 +1434,104 @@ class TestReasonConstants:
             CachedState(),
         )
         assert r.reason == R_BELOW_THRESHOLD
+
+
+class TestCodeTables:
+    def test_codes_are_stable(self):
+        """Codes are persisted — existing members must keep their index."""
+        assert [o.code for o in (OUT.NO_CHANGE, OUT.OFF, OUT.COOL, OUT.DRY)] == [0, 1, 2, 3]
+        assert (R_NO_SOLAR.code, R_NO_CHANGE.code, R_BELOW_THRESHOLD.code) == (0, 19, 22)
+
+    def test_codes_round_trip(self):
+        assert all(OUTPUT_CODES[o.code] is o for o in HomeOutput)
+        assert all(REASON_CODES[r.code] is r for r in Reason)
+
+    def test_reasons_compare_equal_to_display_strings(self):
+        assert R_NO_SOLAR == "No solar available"
+        assert adjust(TEST_PARAMS, home(enabled=False), CachedState()).reason.code == R_DISABLED.code
+
+
+class TestPureTransition:
+    def test_input_state_is_not_mutated(self):
+        state = SessionState(last=OUT.COOL)
+        result, after = transition(TEST_PARAMS, home(aircon_mode=AirconMode.COOL, grid_usage=100, auto=True), state)
+        assert result == AdjustResult(OUT.NO_CHANGE, R_GRID_TOLERATED)
+        assert state == SessionState(last=OUT.COOL)
+        assert after == SessionState(tolerated=1, last=OUT.COOL)
+
+    def test_unchanged_state_is_returned_as_is(self):
+        state = SessionState(last=OUT.COOL)
+        assert transition(TEST_PARAMS, home(aircon_mode=AirconMode.UNKNOWN), state).state is state
+
+    def test_types_are_hashable(self):
+        h = home()
+        assert len({(TEST_PARAMS, h, SessionState()), (TEST_PARAMS, h, SessionState())}) == 1
+
+    def test_matches_mutating_adjust(self):
+        cached, state = CachedState(), SessionState()
+        inputs = [home(aircon_mode=AirconMode.COOL, grid_usage=100, auto=True)] * 4 + [home(aircon_mode=AirconMode.OFF)]
+        for h in inputs:
+            result, state = transition(TEST_PARAMS, h, state)
+            assert adjust(TEST_PARAMS, h, cached) == result
+            assert cached.snapshot() == state
+
+    def test_track_adjustment_is_pure(self):
+        state = SessionState(last=OUT.COOL, failed_to_change=ALLOWED_FAILURES)
+        assert track_adjustment(state, OUT.OFF, OUT.COOL) == (
+            False,
+            SessionState(last=OUT.COOL, failed_to_change=ALLOWED_FAILURES + 1),
+        )
+        assert state.failed_to_change == ALLOWED_FAILURES
+
+
+class TestBranch:
+    def test_names_follow_the_decision_tree(self):
+        cool = AirconMode.COOL
+        assert branch(home(enabled=False), SessionState(reactivate_delay=1)) == "disabled"
+        assert branch(home(aircon_mode=AirconMode.UNKNOWN), SessionState()) == "unknown_mode"
+        assert branch(home(), SessionState(reactivate_delay=1)) == "reactivate_wait"
+        assert branch(home(), CachedState()) == "off"
+        assert branch(home(aircon_mode=cool, grid_usage=1, auto=True), SessionState()) == "on_grid_auto"
+        assert branch(home(aircon_mode=cool, have_solar=False), SessionState()) == "on_grid_manual"
+        assert branch(home(aircon_mode=cool, auto=True), SessionState()) == "on_solar_auto"
+        assert branch(home(aircon_mode=cool), SessionState()) == "on_solar_manual"
+
+
+class TestDeadlines:
+    PARAMS = replace(
+        TEST_PARAMS, grid_usage_delay=DEADLINE_GRID_USAGE_DELAY, reactivate_delay=DEADLINE_REACTIVATE_DELAY
+    )
+
+    def step(self, deadlines, h, now, state=None):
+        reactivate_delay, tolerated = deadlines.counters(now)
+        result, state = transition(
+            self.PARAMS, h, replace(state or SessionState(), reactivate_delay=reactivate_delay, tolerated=tolerated)
+        )
+        return result.reason, deadlines.advance(state, now, grid_usage_delay=300, reactivate_delay=600)
+
+    def test_grid_tolerated_until_deadline_then_reactivation_waits(self):
+        on_grid = home(aircon_mode=AirconMode.COOL, grid_usage=100, auto=True)
+        reason, d = self.step(Deadlines(), on_grid, 1000)
+        assert (reason, d) == (R_GRID_TOLERATED, Deadlines(tolerate_until=1300))
+        for now in (1010, 1299):  # any number of evaluations before the deadline
+            reason, d = self.step(d, on_grid, now)
+            assert (reason, d) == (R_GRID_TOLERATED, Deadlines(tolerate_until=1300))
+        reason, d = self.step(d, on_grid, 1300)
+        assert (reason, d) == (R_GRID_TOO_HIGH, Deadlines(reactivate_at=1900))
+        assert d.next == 1900
+        reason, d = self.step(d, home(), 1899)
+        assert reason == R_REACTIVATE_WAIT
+        reason, d = self.step(d, home(), 1900)
+        assert reason != R_REACTIVATE_WAIT
+        assert d == Deadlines()
+        assert d.next is None
+
+    def test_grid_clearing_drops_the_tolerance_deadline(self):
+        reason, d = self.step(Deadlines(), home(aircon_mode=AirconMode.COOL, grid_usage=100, auto=True), 0)
+        assert d.tolerate_until == 300
+        _, d = self.step(d, home(aircon_mode=AirconMode.COOL, auto=True), 10)
+        assert d == Deadlines()
+
+    def test_unchanged_deadlines_are_returned_as_is(self):
+        d = Deadlines(reactivate_at=50.0)
+        assert d.advance(SessionState(), 10, 300, 600) is d
@@ -0,0 +1,61 @@
+"""Offline tool script tests: each runs in a subprocess that cannot import Home Assistant."""
+
+from __future__ import annotations
+
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parent.parent
+ROWS = [
+    {"time": f"2026-07-01T12:{minute:02d}:00+00:00", "aircon_mode": "off", "generation": generation, "grid_usage": 0}
+    | {"temperature": 26, "humidity": 40}
+    for minute, generation in enumerate((6000, 6000, 0, 0))
+]
+
+
+def _run(tmp_path: Path, *argv: str) -> subprocess.CompletedProcess[str]:
+    blocked = tmp_path / "blocked" / "homeassistant"
+    blocked.mkdir(parents=True, exist_ok=True)
+    (blocked / "__init__.py").write_text('raise ImportError("homeassistant is blocked")\n')
+    env = {**os.environ, "PYTHONPATH": str(blocked.parent)}
+    return subprocess.run(  # noqa: S603
+        [sys.executable, *argv], cwd=tmp_path, env=env, capture_output=True, text=True, check=False, timeout=120
+    )
+
+
+@pytest.fixture
+def history(tmp_path: Path) -> Path:
+    path = tmp_path / "history.jsonl"
+    path.write_text("".join(json.dumps(row) + "\n" for row in ROWS))
+    return path
+
+
+def test_package_import_needs_home_assistant(tmp_path: Path) -> None:
+    """The module form imports the integration's __init__, which the scripts avoid."""
+    result = _run(tmp_path, "-c", f"import sys; sys.path.insert(0, {str(ROOT)!r}); import custom_components.home_rules")
+    assert "homeassistant is blocked" in result.stderr
+
+
+def test_replay_script(tmp_path: Path, history: Path) -> None:
+    result = _run(tmp_path, str(ROOT / "scripts" / "replay.py"), str(history), "--smoothing-window", "1")
+    assert result.returncode == 0, result.stderr
+    assert len(result.stdout.splitlines()) == len(ROWS)
+
+
+def test_explorer_script(tmp_path: Path) -> None:
+    result = _run(tmp_path, str(ROOT / "scripts" / "explorer.py"))
+    assert result.returncode == 0, result.stderr
+    assert result.stdout
+
+
+def test_sweep_script_with_spawned_workers(tmp_path: Path, history: Path) -> None:
+    pytest.importorskip("numpy")
+    argv = [str(history), "--generation-cool-threshold", "5000", "5500", "--workers", "2"]
+    result = _run(tmp_path, str(ROOT / "scripts" / "sweep.py"), *argv)
+    assert result.returncode == 0, result.stderr
+    assert len(result.stdout.splitlines()) == 3  # header and one row per combination
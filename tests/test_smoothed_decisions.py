@@ -58,6 +58,7 @@ async def test_sustained_generation_activates_normally(hass, coord_factory) -> N
 async def test_oscillation_dampened_at_cool_threshold(hass, coord_factory) -> None:
     """COOL→DRY→COOL oscillation when solar fluctuates around cool threshold."""
     from custom_components.home_rules.const import CONF_SMOOTHING_WINDOW
+    from custom_components.home_rules.rules import HomeOutput
 
     coordinator = await coord_factory(
         generation="6000",
@@ -68,7 +69,7 @@ async def test_oscillation_dampened_at_cool_threshold(hass, coord_factory) -> No
 
     # Establish COOL mode with consistent high solar
     await coordinator.async_run_evaluation("poll")
-    assert coordinator._last_record["adjustment"] == "Cool"
+    assert coordinator._last_record["adjustment"] == HomeOutput.COOL.code
     hass.states.async_set("climate.test", "cool")
     hass.states.async_set("sensor.generation", "6000", {"unit_of_measurement": "W"})
     await coordinator.async_run_evaluation("poll")
@@ -79,13 +80,14 @@ async def test_oscillation_dampened_at_cool_threshold(hass, coord_factory) -> No
     await coordinator.async_run_evaluation("poll")
 
     # Should stay in COOL (smoothed is above threshold), no downgrade to DRY
-    assert coordinator._last_record["adjustment"] == "No Change"
+    assert coordinator._last_record["adjustment"] == HomeOutput.NO_CHANGE.code
     assert coordinator._last_record["smoothed_generation"] > 5500
 
 
 async def test_shadow_shows_raw_alternative(hass, coord_factory) -> None:
     """Shadow run uses raw values and decision_differs shows when smoothing matters."""
     from custom_components.home_rules.const import CONF_SMOOTHING_WINDOW
+    from custom_components.home_rules.rules import HomeOutput
 
     coordinator = await coord_factory(
         generation="1000",
@@ -103,6 +105,6 @@ async def test_shadow_shows_raw_alternative(hass, coord_factory) -> None:
     await coordinator.async_run_evaluation("poll")
 
     record = coordinator._last_record
-    assert record["adjustment"] == "No Change"  # actual (smoothed) decision
-    assert record["smoothed_adjustment"] == "Dry"  # raw alternative
+    assert record["adjustment"] == HomeOutput.NO_CHANGE.code  # actual (smoothed) decision
+    assert record["smoothed_adjustment"] == HomeOutput.DRY.code  # raw alternative
     assert record["decision_differs"] is True
@@ -42,6 +42,7 @@ async def test_window_1_gives_identical_results(coord_factory) -> None:
 async def test_smoothing_dampens_transient_spike(hass, coord_factory) -> None:
     """A single bad reading in a window of good ones should be smoothed out."""
     from custom_components.home_rules.const import CONF_SMOOTHING_WINDOW
+    from custom_components.home_rules.rules import HomeOutput
 
     coordinator = await coord_factory(
         generation="6000",
@@ -51,7 +52,7 @@ async def test_smoothing_dampens_transient_spike(hass, coord_factory) -> None:
 
     # First eval: generation=6000, grid=0 → COOL
     await coordinator.async_run_evaluation("poll")
-    assert coordinator._last_record["adjustment"] == "Cool"
+    assert coordinator._last_record["adjustment"] == HomeOutput.COOL.code
 
     # Second eval: generation=6000, grid=0 → no change (already COOL)
     hass.states.async_set("sensor.generation", "6000", {"unit_of_measurement": "W"})
@@ -88,3 +89,101 @@ async def test_default_smoothing_window_is_five() -> None:
     from custom_components.home_rules.const import DEFAULT_SMOOTHING_WINDOW
 
     assert DEFAULT_SMOOTHING_WINDOW == 5
+
+
+async def test_replay_matches_live_smoothed_decisions(hass, coord_factory, freezer) -> None:
+    """Replaying the recorded inputs reproduces the coordinator's decisions.
+
+    Replay runs the same minute delays on the recorded times, one row every 3 minutes.
+    """
+    from custom_components.home_rules.const import CONF_GRID_USAGE_DELAY, CONF_REACTIVATE_DELAY, CONF_SMOOTHING_WINDOW
+    from custom_components.home_rules.replay import replay
+
+    options = {CONF_SMOOTHING_WINDOW: 3, CONF_GRID_USAGE_DELAY: 3, CONF_REACTIVATE_DELAY: 9}
+    coordinator = await coord_factory(options=options)
+    readings = (
+        ("off", 6000, 0),
+        ("cool", 6000, 0),
+        ("cool", 0, 800),
+        ("cool", 0, 800),
+        ("cool", 4000, 0),
+        ("off", 2000, 0),
+        ("off", 7000, 0),
+    )
+    rows = []
+    for i, (climate, generation, grid) in enumerate(readings):
+        hass.states.async_set("climate.test", climate)
+        hass.states.async_set("sensor.generation", str(generation), {"unit_of_measurement": "W"})
+        hass.states.async_set("sensor.grid", str(grid), {"unit_of_measurement": "W"})
+        await coordinator.async_run_evaluation("poll")
+        freezer.tick(180)
+        rows.append(
+            {
+                "time": 180 * i,
+                "aircon_mode": climate,
+                "generation": generation,
+                "grid_usage": grid,
+                "temperature": 25,
+                "humidity": 40,
+            }
+        )
+
+    live = [(r["adjustment"], r["reason"]) for r in reversed(coordinator._recent)]
+    replayed = [
+        (s.result.output.code, s.result.reason.code) for s in replay(rows, coordinator.parameters, smoothing_window=3)
+    ]
+    assert len(set(live)) > 3
+    assert replayed == live
+
+
+async def test_smoothing_windows_survive_a_reload(hass, coord_factory) -> None:
+    """The rolling windows are stored with the session and restored on startup."""
+    from custom_components.home_rules.const import CONF_SMOOTHING_WINDOW
+    from custom_components.home_rules.coordinator import HomeRulesCoordinator
+
+    coordinator = await coord_factory(options={CONF_SMOOTHING_WINDOW: 2})
+    for generation in ("6000", "3000", "1000"):
+        hass.states.async_set("sensor.generation", generation, {"unit_of_measurement": "W"})
+        await coordinator.async_run_evaluation("poll")
+    assert coordinator.smoothing["generation"] | {"mean": None} == {
+        "size": 2,
+        "samples": 2,
+        "mean": None,
+        "min": 1000.0,
+        "max": 3000.0,
+    }
+
+    await coordinator.async_shutdown()
+    restored = HomeRulesCoordinator(hass, coordinator.config_entry)
+    await restored.async_initialize()
+    assert restored.smoothing == coordinator.smoothing
+
+
+async def test_time_weighted_interval_mean_feeds_the_decision(hass, mock_entry, freezer) -> None:
+    """With time weighting, an evaluation sees the mean power since the previous one, not the latest reading."""
+    from custom_components.home_rules.const import CONF_EVENT_DEBOUNCE, CONF_SMOOTHING_WINDOW, CONF_TIME_WEIGHTED
+
+    options = {CONF_TIME_WEIGHTED: True, CONF_EVENT_DEBOUNCE: 0, CONF_SMOOTHING_WINDOW: 1}
+    hass.config_entries.async_update_entry(mock_entry, options=options)
+    assert await hass.config_entries.async_setup(mock_entry.entry_id)
+    await hass.async_block_till_done()
+    coordinator = mock_entry.runtime_data
+    assert coordinator._recent[0]["generation"] == 6000.0
+
+    freezer.tick(60)
+    hass.states.async_set("sensor.generation", "0", {"unit_of_measurement": "W"})
+    hass.states.async_set("sensor.grid", "0.5", {"unit_of_measurement": "kW"})
+    await hass.async_block_till_done()
+    assert coordinator.smoothing["interval"]["generation"]["samples"] == 2
+    freezer.tick(60)
+    await coordinator.async_run_evaluation("manual")
+
+    record = coordinator._recent[0]
+    assert (record["generation"], record["grid_usage"]) == (1500.0, 375.0)
+    assert coordinator.smoothing["interval"]["generation"] | {"mean": 0.0} == {
+        "samples": 1,
+        "seconds": 0.0,
+        "mean": 0.0,
+        "min": 0.0,
+        "max": 0.0,
+    }
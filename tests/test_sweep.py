@@ -0,0 +1,132 @@
+"""Parameter sweep tests.
+
+simulate() must reach the same decisions as replay() over the same rows, so
+the sweep metrics are checked against a replay that feeds each decision back
+into the next row, the way the sweep's simulated aircon does.
+"""
+
+from __future__ import annotations
+
+import json
+import math
+import random
+from collections.abc import Iterator
+from dataclasses import replace
+
+import pytest
+
+from custom_components.home_rules import sweep as sweep_module
+from custom_components.home_rules.replay import DEFAULT_PARAMETERS, plant_mode, replay
+from custom_components.home_rules.rules import AirconMode
+from custom_components.home_rules.sweep import (
+    DEFAULT_AIRCON_POWER,
+    main,
+    parameter_grid,
+    simulate,
+    sweep,
+    write_history,
+)
+
+pytest.importorskip("numpy")
+
+ON = (AirconMode.COOL, AirconMode.DRY)
+
+
+def history(days: int = 2, seed: int = 3) -> list[dict]:
+    rng = random.Random(seed)  # noqa: S311
+    rows = []
+    for minute in range(days * 1440):
+        sun = max(0.0, math.sin(((minute % 1440) / 1440 - 0.25) * 2 * math.pi))
+        generation = max(0.0, 7000 * sun * (0.3 if rng.random() < 0.05 else 1.0))
+        mode = "cool" if sun > 0.6 else "dry" if sun > 0.45 else "off"
+        rows.append(
+            {
+                "time": minute * 60,
+                "aircon_mode": mode,
+                "generation": generation,
+                "grid_usage": max(0.0, (2500 if mode != "off" else 0) + 400 - generation),
+                "temperature": 20 + 10 * sun,
+                "humidity": 55 + rng.uniform(-15, 15),
+                "have_solar": sun > 0,
+            }
+        )
+    return rows
+
+
+def expected(rows: list[dict], config) -> tuple[int, float, float]:
+    plant = AirconMode(rows[0]["aircon_mode"])
+
+    def shifted(row: dict, mode: AirconMode) -> float:
+        return row["grid_usage"] + ((mode in ON) - (row["aircon_mode"] in ON)) * DEFAULT_AIRCON_POWER
+
+    def closed_loop() -> Iterator[dict]:
+        for row in rows:
+            yield {**row, "aircon_mode": plant.value, "grid_usage": shifted(row, plant)}
+
+    cycles, grid_min, solar_min, running = 0, 0.0, 0.0, False
+    for row, step in zip(rows, replay(closed_loop(), config), strict=True):
+        plant = plant_mode(step.result.output, plant)
+        was_running, running = running, plant in ON
+        if running:
+            cycles += not was_running
+            if shifted(row, plant) > 0:
+                grid_min += 1
+            elif row["have_solar"]:
+                solar_min += 1
+    return cycles, grid_min, solar_min
+
+
+def test_simulate_matches_replay(tmp_path) -> None:
+    rows = history()
+    assert write_history(rows, tmp_path) == len(rows)
+    sweep_module._open_history(str(tmp_path))
+    for config in (DEFAULT_PARAMETERS, replace(DEFAULT_PARAMETERS, generation_cool_threshold=4000, grid_usage_delay=0)):
+        result = simulate(config)
+        assert (result.compressor_cycles, result.grid_import_minutes, result.solar_cooled_minutes) == pytest.approx(
+            expected(rows, config)
+        )
+
+
+def test_delays_change_the_outcome_when_the_recorded_aircon_was_off(tmp_path) -> None:
+    """Tolerance and reactivation run on the simulated aircon, not on the recording."""
+    rows = [{**row, "aircon_mode": "off", "grid_usage": 400 - row["generation"]} for row in history(days=1, seed=5)]
+    write_history(rows, tmp_path)
+    sweep_module._open_history(str(tmp_path))
+    grid = parameter_grid({"grid_usage_delay": [0, 3, 30], "reactivate_delay": [0, 30]})
+    results = [simulate(config) for config in grid]
+    for delay in (0, 30):
+        outcomes = {(r.compressor_cycles, r.grid_import_minutes) for r in results if r.config.reactivate_delay == delay}
+        assert len(outcomes) > 1
+    for r in results:
+        assert (r.compressor_cycles, r.grid_import_minutes, r.solar_cooled_minutes) == pytest.approx(
+            expected(rows, r.config)
+        )
+
+
+def test_parameter_grid_is_the_cartesian_product() -> None:
+    grid = parameter_grid({"grid_usage_delay": [1, 2, 3], "generation_cool_threshold": [5000.0, 6000.0]})
+    assert len(grid) == 6
+    assert {(p.grid_usage_delay, p.generation_cool_threshold) for p in grid} == {
+        (d, t) for d in (1, 2, 3) for t in (5000.0, 6000.0)
+    }
+    assert all(p.reactivate_delay == DEFAULT_PARAMETERS.reactivate_delay for p in grid)
+
+
+def test_sweep_runs_every_combination_in_a_process_pool() -> None:
+    rows = history(days=1)
+    grid = parameter_grid({"grid_usage_delay": [0, 2], "reactivate_delay": [0, 3]})
+    results = list(sweep(rows, grid, workers=2))
+    assert [r.config for r in results] == grid
+    for r in results:
+        assert (r.compressor_cycles, r.grid_import_minutes, r.solar_cooled_minutes) == pytest.approx(
+            expected(rows, r.config)
+        )
+
+
+def test_main_writes_csv(tmp_path, capsys) -> None:
+    path = tmp_path / "history.jsonl"
+    path.write_text("".join(json.dumps(r) + "\n" for r in history(days=1)))
+    assert main([str(path), "--grid-usage-delay", "1", "2", "--workers", "1"]) == 0
+    lines = capsys.readouterr().out.splitlines()
+    assert lines[0] == "grid_usage_delay,compressor_cycles,grid_import_minutes,solar_cooled_minutes"
+    assert [line.split(",")[0] for line in lines[1:]] == ["1", "2"]